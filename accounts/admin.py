@@ -5,6 +5,7 @@ from django.http import HttpRequest
 from django.utils.html import format_html
 
 from accounts.models import Follow, Profile, User
+from common.renditions import rendition_urls
 
 admin.site.site_header = "Friendora Admin"
 admin.site.site_title = "Friendora Admin"
@@ -41,7 +42,7 @@ class ProfileAdmin(admin.ModelAdmin):
         if obj.avatar:
             return format_html(
                 '<img src="{}" style="width:48px;height:48px;object-fit:cover;border-radius:4px;" alt="avatar"/>',
-                obj.avatar.url,
+                rendition_urls(obj.avatar.name)["thumb"],  # type: ignore
             )
         return "(no avatar)"
 
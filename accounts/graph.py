@@ -0,0 +1,193 @@
+"""
+In-memory follow graph for two-hop queries such as "who do the people I
+follow follow?".
+
+The graph is a CSR (compressed sparse row) snapshot of `accounts.Follow`:
+`nodes` holds the sorted ids of users following anyone, and the accounts
+followed by `nodes[i]` are `targets[indptr[i]:indptr[i + 1]]`. Gathering the
+rows of a thousand followed accounts is a handful of vectorized NumPy
+operations instead of a self-join on `accounts_follow`.
+
+Follows and unfollows made in this process are applied on top of the
+snapshot as small per-user deltas. Every process rebuilds its snapshot
+once it is older than `FOLLOW_GRAPH_REBUILD_INTERVAL`, which also picks up
+changes made by other processes.
+"""
+
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+from django.conf import settings
+
+from accounts.models import Follow
+
+EMPTY = np.empty(0, dtype=np.int64)
+
+
+class FollowGraph:
+    def __init__(self, followers: np.ndarray, targets: np.ndarray) -> None:
+        """
+        `followers` and `targets` are the two columns of the Follow table,
+        sorted by follower.
+        """
+        self.nodes, starts = np.unique(followers, return_index=True)
+        self.indptr = np.append(starts, len(targets)).astype(np.int64)
+        self.targets = targets
+        self.added: defaultdict[int, set[int]] = defaultdict(set)
+        self.removed: defaultdict[int, set[int]] = defaultdict(set)
+        self.built_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_db(cls) -> "FollowGraph":
+        edges = Follow.objects.order_by("follower_id", "following_id").values_list(
+            "follower_id", "following_id"
+        )
+        pairs = np.fromiter(
+            (pair for pair in edges.iterator(chunk_size=10000)),
+            dtype=np.dtype((np.int64, 2)),
+        )
+        return cls(pairs[:, 0].copy(), pairs[:, 1].copy())
+
+    def _rows(self, user_ids: np.ndarray) -> np.ndarray:
+        """
+        Row index of each user id, -1 for users following nobody.
+        """
+        rows = np.searchsorted(self.nodes, user_ids)
+        rows[rows == len(self.nodes)] = 0
+        found = len(self.nodes) > 0 and self.nodes[rows] == user_ids
+        return np.where(found, rows, -1)
+
+    def _gather(self, user_ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Concatenate the snapshot rows of `user_ids`. Returns the followed
+        ids and, for each of them, the id of the user following it.
+        """
+        rows = self._rows(user_ids)
+        owners, rows = user_ids[rows >= 0], rows[rows >= 0]
+        starts, ends = self.indptr[rows], self.indptr[rows + 1]
+        lengths = ends - starts
+        total = int(lengths.sum())
+        if not total:
+            return EMPTY, EMPTY
+        # Index of every element of every row, without a Python loop.
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return self.targets[offsets + np.arange(total)], np.repeat(owners, lengths)
+
+    def following(self, user_id: int) -> np.ndarray:
+        targets, _ = self._gather(np.array([user_id], dtype=np.int64))
+        with self._lock:
+            added, removed = self.added.get(user_id), self.removed.get(user_id)
+            if removed:
+                targets = targets[~np.isin(targets, list(removed))]
+            if added:
+                targets = np.union1d(targets, list(added))
+        return targets
+
+    def suggestions(self, user_id: int, limit: int) -> list[tuple[int, int]]:
+        """
+        Accounts followed by the accounts `user_id` follows, as
+        `(user id, mutual count)` pairs, most mutual connections first.
+        """
+        following = self.following(user_id)
+        targets, owners = self._gather(following)
+        with self._lock:
+            removed = [
+                (owner << 32) | target
+                for owner in following.tolist()
+                for target in self.removed.get(owner, ())
+            ]
+            added = [
+                target
+                for owner in following.tolist()
+                for target in self.added.get(owner, ())
+            ]
+        if removed:
+            targets = targets[~np.isin((owners << 32) | targets, removed)]
+        if added:
+            targets = np.concatenate([targets, np.array(added, dtype=np.int64)])
+
+        candidates, counts = np.unique(targets, return_counts=True)
+        keep = ~np.isin(candidates, following) & (candidates != user_id)
+        candidates, counts = candidates[keep], counts[keep]
+        # Most mutuals first, then lowest id, as a stable tiebreak.
+        order = np.lexsort((candidates, -counts))[:limit]
+        return list(zip(candidates[order].tolist(), counts[order].tolist()))
+
+    def _in_snapshot(self, follower_id: int, following_id: int) -> bool:
+        targets, _ = self._gather(np.array([follower_id], dtype=np.int64))
+        return bool(np.isin(following_id, targets))
+
+    def apply(self, follower_id: int, following_id: int, followed: bool) -> None:
+        in_snapshot = self._in_snapshot(follower_id, following_id)
+        with self._lock:
+            if followed:
+                self.removed[follower_id].discard(following_id)
+                if not in_snapshot:
+                    self.added[follower_id].add(following_id)
+            else:
+                self.added[follower_id].discard(following_id)
+                self.removed[follower_id].add(following_id)
+
+
+_graph: FollowGraph | None = None
+# Held by the one thread rebuilding the graph.
+_rebuild_lock = threading.Lock()
+# Guards `_replay` and swapping in a rebuilt graph, so an event recorded
+# during a rebuild reaches the new graph.
+_swap_lock = threading.Lock()
+# Events seen while a rebuild is reading the table, replayed on the result.
+_replay: list[tuple[int, int, bool]] | None = None
+
+
+def get_follow_graph() -> FollowGraph:
+    """
+    This process's graph. Once it is stale, one thread rebuilds it while
+    the others keep serving the stale one.
+    """
+    global _graph, _replay
+    graph = _graph
+    interval = settings.FOLLOW_GRAPH_REBUILD_INTERVAL
+    if graph is not None and time.monotonic() - graph.built_at < interval:
+        return graph
+    # Only wait for the rebuild when there is nothing to serve yet.
+    if not _rebuild_lock.acquire(blocking=graph is None):
+        return graph  # type: ignore
+    try:
+        if _graph is not graph:
+            # Another thread rebuilt it while we waited.
+            return _graph  # type: ignore
+        with _swap_lock:
+            _replay = []
+        try:
+            graph = FollowGraph.from_db()
+        except BaseException:
+            with _swap_lock:
+                _replay = None
+            raise
+        with _swap_lock:
+            for event in _replay:
+                graph.apply(*event)
+            _graph, _replay = graph, None
+        return graph
+    finally:
+        _rebuild_lock.release()
+
+
+def record_follow(follower_id: int, following_id: int, followed: bool) -> None:
+    """
+    Apply a committed follow or unfollow to this process's graph, if built.
+    """
+    with _swap_lock:
+        if _replay is not None:
+            _replay.append((follower_id, following_id, followed))
+        graph = _graph
+    if graph is not None:
+        graph.apply(follower_id, following_id, followed)
+
+
+def reset_follow_graph() -> None:
+    global _graph
+    _graph = None
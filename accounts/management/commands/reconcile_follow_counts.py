@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from accounts.models import Profile
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Profile.followers_count and following_count from the Follow "
+        "table for drifted profiles."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "user_ids",
+            nargs="*",
+            type=int,
+            help="Only reconcile the profiles of these users (default: all).",
+        )
+
+    def handle(self, *args, **options):
+        user_ids = options["user_ids"] or None
+        fixed = Profile.objects.sync_follow_counts(user_ids)
+        self.stdout.write(
+            self.style.SUCCESS(f"Reconciled follow counts on {fixed} profile(s).")
+        )
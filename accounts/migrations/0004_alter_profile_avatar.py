@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-18 07:17
+
+import common.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_follow'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='profile',
+            name='avatar',
+            field=models.ImageField(
+                blank=True,
+                default='avatars/default-avatar.png',
+                storage=common.storage.blob_storage,
+                upload_to='avatars/',
+            ),
+        ),
+    ]
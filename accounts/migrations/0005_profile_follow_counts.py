@@ -0,0 +1,61 @@
+# Generated by Django 5.2.8 on 2026-10-18 07:35
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_follow_counts(apps, schema_editor):
+    Profile = apps.get_model('accounts', 'Profile')
+    Follow = apps.get_model('accounts', 'Follow')
+
+    def count(field):
+        return Coalesce(
+            Subquery(
+                Follow.objects.filter(**{field: OuterRef('user_id')})
+                .order_by()
+                .values(field)
+                .annotate(total=Count('id'))
+                .values('total')
+            ),
+            0,
+        )
+
+    Profile.objects.update(
+        followers_count=count('following'), following_count=count('follower')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_alter_profile_avatar'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='follow',
+            index=models.Index(
+                fields=['following', 'created_at', 'id'],
+                name='follow_following_created_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='follow',
+            index=models.Index(
+                fields=['follower', 'created_at', 'id'],
+                name='follow_follower_created_idx',
+            ),
+        ),
+        migrations.RunPython(backfill_follow_counts, migrations.RunPython.noop),
+    ]
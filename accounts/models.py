@@ -1,6 +1,13 @@
+from typing import Iterable
+
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from common.storage import blob_storage
 
 
 class User(AbstractUser):
@@ -13,6 +20,76 @@ class User(AbstractUser):
     def __str__(self) -> str:
         return self.username or self.email
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super().from_db(db, field_names, values)
+        user._loaded_username = user.__dict__.get("username")
+        return user
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_username = self.username
+
+    def username_changed(self, update_fields=None) -> bool:
+        """
+        Whether the save being signalled wrote a new username. Only
+        meaningful in `post_save` receivers; a user that wasn't loaded from
+        the database counts as changed.
+        """
+        if update_fields is not None and "username" not in update_fields:
+            return False
+        return self.username != getattr(self, "_loaded_username", None)
+
+
+class ProfileManager(models.Manager):
+    def adjust_follow_counts(self, follower_id: int, following_id: int, delta: int):
+        """
+        Apply one follow (`delta=1`) or unfollow (`delta=-1`) to the
+        denormalized counters of both users.
+        """
+        # The counters are part of the profile, so they move updated_at too.
+        now = timezone.now()
+        follower = self.filter(user_id=follower_id)
+        following = self.filter(user_id=following_id)
+        if delta < 0:
+            follower = follower.filter(following_count__gt=0)
+            following = following.filter(followers_count__gt=0)
+        follower.update(following_count=F("following_count") + delta, updated_at=now)
+        following.update(followers_count=F("followers_count") + delta, updated_at=now)
+
+    def sync_follow_counts(self, user_ids: Iterable[int] | None = None) -> int:
+        """
+        Rewrite drifted follow counters from the `Follow` table. Returns the
+        number of fixed profiles.
+        """
+
+        def count(field: str):
+            return Coalesce(
+                Subquery(
+                    Follow.objects.filter(**{field: OuterRef("user_id")})
+                    .order_by()
+                    .values(field)
+                    .annotate(total=Count("id"))
+                    .values("total")
+                ),
+                0,
+            )
+
+        qs = self.annotate(
+            actual_followers=count("following"), actual_following=count("follower")
+        )
+        if user_ids is not None:
+            qs = qs.filter(user_id__in=user_ids)
+        drifted = qs.exclude(
+            followers_count=F("actual_followers"),
+            following_count=F("actual_following"),
+        ).values("pk")
+        return self.filter(pk__in=Subquery(drifted)).update(
+            followers_count=count("following"),
+            following_count=count("follower"),
+            updated_at=timezone.now(),
+        )
+
 
 class Profile(models.Model):
     id: int
@@ -20,12 +97,19 @@ class Profile(models.Model):
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="profile"
     )
     avatar = models.ImageField(
-        upload_to="avatars/", default="avatars/default-avatar.png", blank=True
+        upload_to="avatars/",
+        storage=blob_storage,
+        default="avatars/default-avatar.png",
+        blank=True,
     )
     bio = models.TextField(max_length=500, blank=True, null=True)
+    followers_count = models.PositiveIntegerField(default=0)
+    following_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProfileManager()
+
     def __str__(self) -> str:
         return f"Profile of {self.user.username}"
 
@@ -38,7 +122,27 @@ class FollowQuerySet(models.QuerySet):
         return self.select_related("following")
 
     def with_both(self):
-        return self.select_related(["follower", "following"])
+        return self.select_related("follower", "following")
+
+    def relationships(
+        self, user_id: int, user_ids: Iterable[int]
+    ) -> dict[int, dict[str, bool]]:
+        """
+        `{"following", "followed_by"}` flags between `user_id` and each of
+        `user_ids`, in one query over the (follower, following) indexes.
+        """
+        user_ids = list(user_ids)
+        flags = {pk: {"following": False, "followed_by": False} for pk in user_ids}
+        edges = self.filter(
+            Q(follower_id=user_id, following_id__in=user_ids)
+            | Q(following_id=user_id, follower_id__in=user_ids)
+        ).values_list("follower_id", "following_id")
+        for follower_id, following_id in edges:
+            if follower_id == user_id:
+                flags[following_id]["following"] = True
+            if following_id == user_id:
+                flags[follower_id]["followed_by"] = True
+        return flags
 
 
 class Follow(models.Model):
@@ -64,6 +168,17 @@ class Follow(models.Model):
     objects = FollowQuerySet.as_manager()
 
     class Meta:
+        indexes = [
+            # Keyset pages of a user's followers / followings.
+            models.Index(
+                fields=["following", "created_at", "id"],
+                name="follow_following_created_idx",
+            ),
+            models.Index(
+                fields=["follower", "created_at", "id"],
+                name="follow_follower_created_idx",
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=["follower", "following"], name="unique_follower_following"
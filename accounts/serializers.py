@@ -5,6 +5,11 @@ from django.core.files.uploadedfile import UploadedFile
 from rest_framework import serializers
 
 from accounts.models import Follow, Profile, User
+from common.renditions import rendition_urls
+from common.serializers import SparseFieldsetsMixin
+
+MAX_AVATAR_SIZE = 2 * 1024 * 1024  # 2 MB
+MAX_RELATIONSHIP_IDS = 300
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -25,7 +30,7 @@ class RegisterSerializer(serializers.ModelSerializer):
         return user
 
 
-class FollowSerializer(serializers.ModelSerializer):
+class FollowSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     follower_username = serializers.CharField(
         source="follower.username", read_only=True
     )
@@ -53,17 +58,91 @@ class FollowSerializer(serializers.ModelSerializer):
         )
 
 
+class SuggestionSerializer(serializers.ModelSerializer):
+    mutual_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = User
+        fields = ("id", "username", "display_name", "mutual_count")
+        read_only_fields = fields
+
+
+class RelationshipListSerializer(serializers.ListSerializer):
+    """
+    Looks up the flags of every row in one query instead of one per row.
+    """
+
+    def to_representation(self, data):
+        user_ids = [getattr(item, "pk", item) for item in data]
+        user = self.context["request"].user
+        flags = Follow.objects.relationships(user.id, user_ids)
+        return [
+            self.child.to_representation({"id": pk, **flags[pk]})  # type: ignore
+            for pk in user_ids
+        ]
+
+
+class RelationshipSerializer(serializers.Serializer):
+    """
+    How the requesting user and another user follow each other. Render a
+    list of users or user ids with `many=True`.
+    """
+
+    id = serializers.IntegerField(read_only=True)
+    following = serializers.BooleanField(read_only=True)
+    followed_by = serializers.BooleanField(read_only=True)
+
+    class Meta:
+        fields = ("id", "following", "followed_by")
+        list_serializer_class = RelationshipListSerializer
+
+
+class RelationshipQuerySerializer(serializers.Serializer):
+    ids = serializers.CharField()
+
+    def validate_ids(self, value: str) -> list[int]:
+        try:
+            ids = [int(pk) for pk in value.split(",") if pk.strip()]
+        except ValueError:
+            raise serializers.ValidationError(
+                detail="Must be a comma-separated list of user ids."
+            )
+        # Keep the requested order, without duplicates.
+        ids = list(dict.fromkeys(ids))
+        if len(ids) > MAX_RELATIONSHIP_IDS:
+            raise serializers.ValidationError(
+                detail=f"At most {MAX_RELATIONSHIP_IDS} user ids are allowed."
+            )
+        return ids
+
+
 class ProfileSerializer(serializers.ModelSerializer):
     avatar = serializers.ImageField(required=False)
+    avatar_renditions = serializers.SerializerMethodField()
 
     class Meta:
         model = Profile
-        fields = ("avatar", "bio", "created_at", "updated_at")
-        read_only_fields = ("created_at", "updated_at")
+        fields = (
+            "avatar",
+            "avatar_renditions",
+            "bio",
+            "followers_count",
+            "following_count",
+            "created_at",
+            "updated_at",
+        )
+        read_only_fields = (
+            "followers_count",
+            "following_count",
+            "created_at",
+            "updated_at",
+        )
+
+    def get_avatar_renditions(self, obj: Profile) -> dict[str, str] | None:
+        return rendition_urls(obj.avatar.name, self.context.get("request"))
 
     def validate_avatar(self, value: UploadedFile) -> UploadedFile:
-        max_size = 2 * 1024 * 1024
-        if value.size > max_size:
+        if value.size > MAX_AVATAR_SIZE:
             raise serializers.ValidationError(detail="Avatar size must be under 2MB")
         valid_types = ["image/jpeg", "image/png", "image/webp"]
         if value.content_type not in valid_types:
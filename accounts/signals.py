@@ -1,10 +1,44 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from accounts.models import Profile, User
+from accounts.graph import record_follow
+from accounts.models import Follow, Profile, User
+from common.authentication import invalidate_cached_user
+from common.renditions import schedule_renditions
 
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
     if created:
         Profile.objects.create(user=instance)
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_cache(sender, instance: User, **kwargs):
+    invalidate_cached_user(instance.id, revoked=not instance.is_active)
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user(sender, instance: User, **kwargs):
+    invalidate_cached_user(instance.id, revoked=True)
+
+
+@receiver(post_save, sender=Profile)
+def render_avatar(sender, instance: Profile, **kwargs):
+    schedule_renditions(instance.avatar.name)
+
+
+@receiver(post_save, sender=Follow)
+def add_follow_edge(sender, instance: Follow, created, **kwargs):
+    if created:
+        transaction.on_commit(
+            lambda: record_follow(instance.follower_id, instance.following_id, True)
+        )
+
+
+@receiver(post_delete, sender=Follow)
+def remove_follow_edge(sender, instance: Follow, **kwargs):
+    transaction.on_commit(
+        lambda: record_follow(instance.follower_id, instance.following_id, False)
+    )
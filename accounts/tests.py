@@ -1,12 +1,20 @@
 from io import BytesIO
+from unittest import mock
 
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from PIL import Image
 from rest_framework import status
 from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
 
-from accounts.models import User
+from accounts import graph as follow_graph
+from accounts.graph import get_follow_graph, record_follow, reset_follow_graph
+from accounts.models import Follow, User
 
 
 class AuthTests(APITestCase):
@@ -64,3 +72,235 @@ class ProfileUploadTests(APITestCase):
             data={"bio": "test", "avatar": create_temporary_image()},
         )
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_upload_oversized_avatar(self):
+        avatar = SimpleUploadedFile(
+            "avatar.png", b"\x89PNG\r\n\x1a\n" + bytes(3 * 1024 * 1024), "image/png"
+        )
+        res = self.client.patch(reverse("my-profile"), data={"avatar": avatar})
+        self.assertEqual(res.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    def test_upload_bogus_avatar(self):
+        avatar = SimpleUploadedFile("avatar.png", b"GIF89a" + bytes(64), "image/png")
+        res = self.client.patch(reverse("my-profile"), data={"avatar": avatar})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="user1", email="u1@test.com", password="pass12345"
+        )
+        self.other_user = User.objects.create_user(
+            username="user2", email="u2@test.com", password="pass12345"
+        )
+        self.client.force_authenticate(self.user)  # type: ignore
+        return super().setUp()
+
+    def test_profile_honours_if_modified_since(self):
+        url = reverse("my-profile")
+        last_modified = self.client.get(url)["Last-Modified"]
+        res = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_profile_etag_changes_after_update(self):
+        url = reverse("my-profile")
+        etag = self.client.get(url)["ETag"]
+        self.client.patch(url, {"bio": "changed"})
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_followers_etag_changes_after_follow(self):
+        url = reverse("users-followers", args=[self.other_user.id])
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+        Follow.objects.create(follower=self.user, following=self.other_user)
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_profile_etag_changes_after_follow(self):
+        url = reverse("my-profile")
+        etag = self.client.get(url)["ETag"]
+        self.client.post(reverse("users-follow", args=[self.other_user.id]))
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()["following_count"], 1)
+
+
+class SuggestionTests(APITestCase):
+    def setUp(self) -> None:
+        reset_follow_graph()
+        self.users = [
+            User.objects.create_user(
+                username=f"user{i}", email=f"user{i}@test.com", password="password123"
+            )
+            for i in range(6)
+        ]
+        self.me = self.users[0]
+        self.client.force_authenticate(user=self.me)  # type: ignore
+        self.url = reverse("users-suggestions")
+        return super().setUp()
+
+    def follow(self, follower: int, *following: int) -> None:
+        for i in following:
+            Follow.objects.create(
+                follower=self.users[follower], following=self.users[i]
+            )
+
+    def ranked(self) -> list[tuple[str, int]]:
+        res = self.client.get(self.url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [(u["username"], u["mutual_count"]) for u in res.json()]
+
+    def test_ranks_by_mutual_connections(self):
+        self.follow(0, 1, 2, 3)
+        self.follow(1, 0, 2, 4, 5)
+        self.follow(2, 4)
+        self.follow(3, 5, 4)
+        self.assertEqual(self.ranked(), [("user4", 3), ("user5", 2)])
+
+    def test_limit(self):
+        self.follow(0, 1)
+        self.follow(1, 2, 3, 4)
+        res = self.client.get(self.url, {"limit": 2})
+        self.assertEqual([u["username"] for u in res.json()], ["user2", "user3"])
+
+    def test_follows_update_the_built_graph(self):
+        self.follow(0, 1)
+        self.follow(1, 2)
+        self.assertEqual(self.ranked(), [("user2", 1)])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("users-follow", args=[self.users[3].id]))
+            self.follow(3, 2, 4)
+            Follow.objects.filter(follower=self.users[1]).delete()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.ranked(), [("user2", 1), ("user4", 1)])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("users-unfollow", args=[self.users[3].id]))
+        self.assertEqual(self.ranked(), [])
+
+    def test_rebuild_matches_incremental_updates(self):
+        self.follow(0, 1, 2)
+        graph = get_follow_graph()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.follow(1, 3, 4)
+            self.follow(2, 4)
+            Follow.objects.filter(
+                follower=self.users[0], following=self.users[2]
+            ).delete()
+        incremental = graph.suggestions(self.me.id, 10)
+        reset_follow_graph()
+        self.assertEqual(get_follow_graph().suggestions(self.me.id, 10), incremental)
+        self.assertEqual(incremental, [(self.users[3].id, 1), (self.users[4].id, 1)])
+
+    @override_settings(FOLLOW_GRAPH_REBUILD_INTERVAL=0)
+    def test_stale_graph_is_served_during_a_rebuild(self):
+        graph = get_follow_graph()
+        with follow_graph._rebuild_lock:
+            # Another thread is rebuilding.
+            self.assertIs(get_follow_graph(), graph)
+        self.assertIsNot(get_follow_graph(), graph)
+
+    def test_events_during_a_rebuild_reach_the_new_graph(self):
+        self.follow(0, 1)
+        from_db = follow_graph.FollowGraph.from_db
+
+        def read_then_follow():
+            graph = from_db()
+            record_follow(self.users[1].id, self.users[2].id, True)
+            return graph
+
+        with mock.patch.object(follow_graph.FollowGraph, "from_db", read_then_follow):
+            graph = get_follow_graph()
+        self.assertEqual(graph.suggestions(self.me.id, 10), [(self.users[2].id, 1)])
+
+
+class RelationshipTests(APITestCase):
+    def setUp(self) -> None:
+        self.users = [
+            User.objects.create_user(
+                username=f"user{i}", email=f"user{i}@test.com", password="password123"
+            )
+            for i in range(4)
+        ]
+        self.me = self.users[0]
+        self.client.force_authenticate(user=self.me)  # type: ignore
+        self.url = reverse("users-relationships")
+        return super().setUp()
+
+    def test_flags_in_one_query(self):
+        me, friend, fan, idol = self.users
+        Follow.objects.create(follower=me, following=friend)
+        Follow.objects.create(follower=friend, following=me)
+        Follow.objects.create(follower=fan, following=me)
+        Follow.objects.create(follower=me, following=idol)
+        Follow.objects.create(follower=fan, following=idol)
+        ids = f"{idol.id},{friend.id},{fan.id},{idol.id},999"
+        with self.assertNumQueries(1):
+            res = self.client.get(self.url, {"ids": ids})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.json(),
+            [
+                {"id": idol.id, "following": True, "followed_by": False},
+                {"id": friend.id, "following": True, "followed_by": True},
+                {"id": fan.id, "following": False, "followed_by": True},
+                {"id": 999, "following": False, "followed_by": False},
+            ],
+        )
+
+    def test_rejects_bad_ids(self):
+        res = self.client.get(self.url, {"ids": "1,abc"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        res = self.client.get(self.url, {"ids": ",".join(map(str, range(1, 302)))})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CachedAuthenticationTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="user1", email="user1@test.com", password="password123"
+        )
+        token = AccessToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return super().setUp()
+
+    def user_queries(self, url: str) -> tuple[int, int]:
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(url)
+        queries = [q["sql"] for q in ctx.captured_queries]
+        return res.status_code, sum('FROM "accounts_user"' in q for q in queries)
+
+    def test_user_is_cached_between_requests(self):
+        url = reverse("my-profile")
+        self.assertEqual(self.user_queries(url), (status.HTTP_200_OK, 1))
+        self.assertEqual(self.user_queries(url), (status.HTTP_200_OK, 0))
+        self.user.display_name = "changed"
+        self.user.save()
+        self.assertEqual(self.user_queries(url), (status.HTTP_200_OK, 1))
+
+    def test_deactivation_rejects_cached_user(self):
+        url = reverse("my-profile")
+        self.client.get(url)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_read_only_views_trust_token_claims(self):
+        url = reverse("post-list")
+        self.assertEqual(self.user_queries(url), (status.HTTP_200_OK, 0))
+        self.assertEqual(
+            self.user_queries(reverse("post-timeline")), (status.HTTP_200_OK, 0)
+        )
+        # Writes still load the user.
+        res = self.client.post(url, {"content": "hello"})
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_deleted_user_tokens_are_revoked(self):
+        url = reverse("post-list")
+        self.user.delete()
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
@@ -2,7 +2,7 @@ from django.urls import URLPattern, path
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-from . import views
+from . import views, views_async
 
 router = DefaultRouter()
 router.register("users", views.FollowViewSet, basename="users")
@@ -11,5 +11,15 @@ urlpatterns: list[URLPattern] = [
     path("login/", TokenObtainPairView.as_view(), name="login"),
     path("refresh/", TokenRefreshView.as_view(), name="refresh"),
     path("profile/me", views.MeProfileView.as_view(), name="my-profile"),
+    path(
+        "async/users/<int:pk>/followers/",
+        views_async.AsyncFollowersView.as_view(),
+        name="async-users-followers",
+    ),
+    path(
+        "async/users/<int:pk>/following/",
+        views_async.AsyncFollowingView.as_view(),
+        name="async-users-following",
+    ),
 ]
 urlpatterns += router.urls
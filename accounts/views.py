@@ -1,3 +1,5 @@
+from django.db import transaction
+from django.db.models import QuerySet
 from django.shortcuts import render
 from rest_framework import status
 from rest_framework.decorators import action
@@ -7,9 +9,21 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
-from accounts.models import Follow, User
-from accounts.serializers import FollowSerializer, ProfileSerializer, RegisterSerializer
+from accounts.graph import get_follow_graph
+from accounts.models import Follow, Profile, User
+from accounts.serializers import (
+    MAX_AVATAR_SIZE,
+    FollowSerializer,
+    ProfileSerializer,
+    RegisterSerializer,
+    RelationshipQuerySerializer,
+    RelationshipSerializer,
+    SuggestionSerializer,
+)
+from common.conditional import ConditionalGetMixin
+from common.serializers import SparseFieldsetsViewMixin
 from common.throttle import FollowThrottle
+from common.uploadhandlers import UploadLimitsMixin
 
 
 class RegisterView(CreateAPIView):
@@ -17,7 +31,7 @@ class RegisterView(CreateAPIView):
     serializer_class = RegisterSerializer
 
 
-class FollowViewSet(GenericViewSet):
+class FollowViewSet(SparseFieldsetsViewMixin, ConditionalGetMixin, GenericViewSet):
     queryset = User.objects.all()
     permission_classes = [IsAuthenticated]
 
@@ -31,9 +45,12 @@ class FollowViewSet(GenericViewSet):
                 {"detail": "Cannot follow yourself"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        _, created = Follow.objects.get_or_create(
-            follower=follower, following=following
-        )
+        with transaction.atomic():
+            _, created = Follow.objects.get_or_create(
+                follower=follower, following=following
+            )
+            if created:
+                Profile.objects.adjust_follow_counts(follower.id, following.id, 1)
 
         if not created:
             return Response(
@@ -53,9 +70,12 @@ class FollowViewSet(GenericViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        deleted, _ = Follow.objects.filter(
-            follower=follower, following=following
-        ).delete()
+        with transaction.atomic():
+            deleted, _ = Follow.objects.filter(
+                follower=follower, following=following
+            ).delete()
+            if deleted:
+                Profile.objects.adjust_follow_counts(follower.id, following.id, -1)
 
         if deleted == 0:
             return Response(
@@ -64,24 +84,108 @@ class FollowViewSet(GenericViewSet):
 
         return Response({"detail": "Unfollowed"}, status=status.HTTP_200_OK)
 
-    @action(detail=True, methods=["GET"])
+    @action(detail=True, methods=["GET"], serializer_class=FollowSerializer)
     def followers(self, request: Request, pk=None):
         # Who follows THIS user
         user: User = self.get_object()
-        qs = user.followers_set.select_related("follower")
-        return Response(FollowSerializer(qs, many=True).data)
+        return self.paginated_follows(
+            request, self.apply_sparse_fieldsets(user.followers_set.with_both())
+        )
 
-    @action(detail=True, methods=["GET"])
+    @action(detail=True, methods=["GET"], serializer_class=FollowSerializer)
     def following(self, request: Request, pk=None):
         # Who THIS user follows
         user: User = self.get_object()
-        qs = user.following_set.select_related("following")
-        return Response(FollowSerializer(qs, many=True).data)
+        return self.paginated_follows(
+            request, self.apply_sparse_fieldsets(user.following_set.with_both())
+        )
+
+    @action(detail=False, methods=["GET"], serializer_class=SuggestionSerializer)
+    def suggestions(self, request: Request):
+        """
+        Accounts followed by the accounts the user follows, ranked by how
+        many of them follow each one.
+        """
+        try:
+            limit = min(int(request.query_params.get("limit", 20)), 100)
+        except ValueError:
+            limit = 20
+        ranked = get_follow_graph().suggestions(request.user.id, max(limit, 1))
+        users = User.objects.in_bulk([user_id for user_id, _ in ranked])
+        suggestions = []
+        for user_id, mutual_count in ranked:
+            # Skip accounts deleted since the graph was built.
+            if user_id in users:
+                users[user_id].mutual_count = mutual_count
+                suggestions.append(users[user_id])
+        return Response(self.get_serializer(suggestions, many=True).data)
+
+    @action(detail=False, methods=["GET"], serializer_class=RelationshipSerializer)
+    def relationships(self, request: Request):
+        """
+        Follow flags between the user and each of `?ids=1,2,3`.
+        """
+        query = RelationshipQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        ids = query.validated_data["ids"]  # type: ignore
+        return Response(self.get_serializer(ids, many=True).data)
+
+    def paginated_follows(self, request: Request, qs: QuerySet[Follow]):
+        """
+        One keyset page of follows, newest first.
+        """
+        page = self.paginate_queryset(qs)
+        signature = follow_page_signature(
+            page, self.paginator, self.get_sparse_fields()  # type: ignore
+        )
+        return self.conditional_get(
+            request,
+            lambda: self.get_paginated_response(
+                self.get_serializer(page, many=True).data
+            ),
+            signature=signature,
+        )
 
 
-class MeProfileView(RetrieveUpdateAPIView):
+def follow_page_signature(page: list[Follow], paginator, fields: list[str] | None):
+    """
+    ETag signature of a page of follows: the follows themselves, so any
+    follow or unfollow within the page changes it, and the usernames the
+    payload embeds, so a rename does too.
+    """
+    names = [
+        side
+        for side in ("follower", "following")
+        if fields is None or f"{side}_username" in fields
+    ]
+    return (
+        [
+            (follow.pk, *(getattr(follow, side).username for side in names))
+            for follow in page
+        ],
+        paginator.has_next,
+        paginator.has_previous,
+    )
+
+
+class MeProfileView(UploadLimitsMixin, ConditionalGetMixin, RetrieveUpdateAPIView):
     serializer_class = ProfileSerializer
     permission_classes = [IsAuthenticated]
+    upload_limits = {"avatar": MAX_AVATAR_SIZE}
 
     def get_object(self):
-        return self.request.user.profile  # type: ignore
+        # Not `request.user.profile`: a cached user would carry stale counters.
+        return Profile.objects.get(user_id=self.request.user.id)
+
+    def get(self, request: Request, *args, **kwargs):
+        signature = (
+            Profile.objects.filter(user_id=request.user.id)
+            .values_list("updated_at", "followers_count", "following_count")
+            .first()
+        )
+        return self.conditional_get(
+            request,
+            lambda: super(MeProfileView, self).get(request, *args, **kwargs),
+            signature=signature,
+            last_modified=signature[0] if signature else None,
+        )
@@ -0,0 +1,58 @@
+"""
+Async variants of the follower/following lists, mounted under `async/`.
+See `posts.views_async`.
+"""
+
+from django.db.models import QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+
+from accounts.models import Follow, User
+from accounts.serializers import FollowSerializer
+from accounts.views import follow_page_signature
+from common.async_views import AsyncAPIView
+from common.conditional import ConditionalGetMixin
+from common.pagination import KeysetPagination
+from common.serializers import SparseFieldsetsViewMixin
+
+
+class AsyncFollowListView(SparseFieldsetsViewMixin, ConditionalGetMixin, AsyncAPIView):
+    serializer_class = FollowSerializer
+    pagination_class = KeysetPagination
+    permission_classes = [IsAuthenticated]
+
+    def get_follows(self, pk: int) -> QuerySet[Follow]:
+        """
+        Follows to list, with both users joined: the serializer reads both
+        usernames and a lazy load can't run on the event loop.
+        """
+        raise NotImplementedError
+
+    async def get(self, request: Request, pk: int):
+        if not await User.objects.filter(pk=pk).aexists():
+            raise NotFound()
+        queryset = self.apply_sparse_fieldsets(self.get_follows(pk))
+        page = await self.paginator.apaginate_queryset(queryset, request, self)  # type: ignore
+        signature = follow_page_signature(
+            page, self.paginator, self.get_sparse_fields()  # type: ignore
+        )
+
+        async def build_response():
+            return self.get_paginated_response(
+                self.get_serializer(page, many=True).data
+            )
+
+        return await self.aconditional_get(request, build_response, signature=signature)
+
+
+class AsyncFollowersView(AsyncFollowListView):
+    # Who follows THIS user
+    def get_follows(self, pk: int) -> QuerySet[Follow]:
+        return Follow.objects.filter(following_id=pk).with_both()  # type: ignore
+
+
+class AsyncFollowingView(AsyncFollowListView):
+    # Who THIS user follows
+    def get_follows(self, pk: int) -> QuerySet[Follow]:
+        return Follow.objects.filter(follower_id=pk).with_both()  # type: ignore
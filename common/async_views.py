@@ -0,0 +1,140 @@
+"""
+A minimal async counterpart of DRF's `GenericAPIView` for hot read paths.
+
+DRF views are sync, so under ASGI every request to them holds a thread for
+its whole duration. `AsyncAPIView` handlers are coroutines running on the
+event loop: they read through the async ORM and cache APIs and only leave
+the loop where Django itself still does (the database call).
+
+Authentication, permissions, throttling, serializers, pagination,
+exception handling and rendering are DRF's own, so responses match the
+sync views.
+"""
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpRequest
+from django.views import View
+from rest_framework.exceptions import (
+    AuthenticationFailed,
+    MethodNotAllowed,
+    NotAuthenticated,
+    PermissionDenied,
+    Throttled,
+)
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+
+from common.authentication import CachedJWTAuthentication
+
+
+class AsyncAPIView(View):
+    """
+    Subclasses implement `async def get(self, request, ...)` and return a
+    DRF `Response`. Read-only: there is no parser.
+    """
+
+    http_method_names = ["get", "head", "options"]
+    permission_classes: list = []
+    throttle_classes = api_settings.DEFAULT_THROTTLE_CLASSES
+    serializer_class = None
+    pagination_class = None
+    filter_backends: list = []
+    # See `CachedJWTAuthentication`; override to load the full user.
+    stateless_authentication = True
+    authenticator = CachedJWTAuthentication()
+    renderer = JSONRenderer()
+
+    async def dispatch(self, request: HttpRequest, *args, **kwargs):
+        drf_request = Request(
+            request, parser_context={"view": self, "args": args, "kwargs": kwargs}
+        )
+        self.request = drf_request
+        try:
+            handler = getattr(self, request.method.lower(), None)  # type: ignore
+            if request.method.lower() not in self.http_method_names or handler is None:  # type: ignore
+                raise MethodNotAllowed(request.method)
+            result = await self.authenticator.aauthenticate(drf_request)
+            drf_request.user, drf_request.auth = result or (AnonymousUser(), None)
+            self.check_permissions(drf_request)
+            # DRF's throttles read and write the cache synchronously.
+            await sync_to_async(self.check_throttles)(drf_request)
+            response = await handler(drf_request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        return self.finalize_response(drf_request, response, *args, **kwargs)
+
+    async def options(self, request: Request, *args, **kwargs):
+        return Response(headers={"Allow": ", ".join(self._allowed_methods())})
+
+    def check_permissions(self, request: Request) -> None:
+        for permission in [cls() for cls in self.permission_classes]:
+            if not permission.has_permission(request, self):
+                if not request.user.is_authenticated:
+                    raise NotAuthenticated()
+                raise PermissionDenied(getattr(permission, "message", None))
+
+    def check_throttles(self, request: Request) -> None:
+        durations = [
+            throttle.wait()
+            for throttle in [cls() for cls in self.throttle_classes]
+            if not throttle.allow_request(request, self)
+        ]
+        if durations:
+            durations = [duration for duration in durations if duration is not None]
+            raise Throttled(max(durations, default=None))
+
+    def handle_exception(self, exc: Exception) -> Response:
+        if isinstance(exc, (NotAuthenticated, AuthenticationFailed)):
+            exc.auth_header = self.authenticator.authenticate_header(self.request)  # type: ignore
+        response = exception_handler(exc, {"view": self, "request": self.request})
+        if response is None:
+            raise exc
+        response.exception = True
+        return response
+
+    def finalize_response(self, request: Request, response, *args, **kwargs):
+        if isinstance(response, Response):
+            response.accepted_renderer = self.renderer
+            response.accepted_media_type = self.renderer.media_type
+            response.renderer_context = {
+                "view": self,
+                "request": request,
+                "response": response,
+                "args": args,
+                "kwargs": kwargs,
+            }
+            # Rendered here rather than by Django, which would do it in a
+            # thread.
+            response.render()
+        return response
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def filter_queryset(self, queryset):
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(self.request, queryset, self)
+        return queryset
+
+    def get_serializer_class(self):
+        return self.serializer_class
+
+    def get_serializer_context(self):
+        return {"request": self.request, "view": self}
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault("context", self.get_serializer_context())
+        return self.get_serializer_class()(*args, **kwargs)  # type: ignore
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            self._paginator = self.pagination_class() if self.pagination_class else None
+        return self._paginator
+
+    def get_paginated_response(self, data) -> Response:
+        return self.paginator.get_paginated_response(data)  # type: ignore
@@ -0,0 +1,118 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+from common.cache import aresolve_key, invalidate_tags, resolve_key
+from common.cache_keys import CacheKeys
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that loads the user from the cache instead of
+    querying `accounts_user` on every request.
+
+    Entries are keyed on the user's version, which `User` saves and deletes
+    bump, and expire after `AUTH_USER_CACHE_TIMEOUT` seconds regardless.
+
+    Safe requests to views with `stateless_authentication = True` skip the
+    user lookup altogether and get a `TokenUser` built from the token
+    claims, unless the user was deactivated or deleted since the token was
+    issued. Those views must only rely on `request.user.id`.
+    """
+
+    def authenticate(self, request: Request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        if self.is_stateless(request) and not self.is_revoked(validated_token):
+            user = api_settings.TOKEN_USER_CLASS(validated_token)
+        else:
+            user = self.get_cached_user(validated_token)
+        return user, validated_token
+
+    async def aauthenticate(self, request: Request):
+        """
+        `authenticate` for async views: cache reads are awaited and only a
+        cache miss touches the database.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        if self.is_stateless(request) and not await self.ais_revoked(validated_token):
+            user = api_settings.TOKEN_USER_CLASS(validated_token)
+        else:
+            user = await self.aget_cached_user(validated_token)
+        return user, validated_token
+
+    def is_stateless(self, request: Request) -> bool:
+        view = (request.parser_context or {}).get("view")
+        return request.method in SAFE_METHODS and getattr(
+            view, "stateless_authentication", False
+        )
+
+    def is_revoked(self, validated_token: Token) -> bool:
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        return user_id is None or cache.get(CacheKeys.auth_revoked(user_id)) is not None
+
+    async def ais_revoked(self, validated_token: Token) -> bool:
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return True
+        return await cache.aget(CacheKeys.auth_revoked(user_id)) is not None
+
+    def get_cached_user(self, validated_token: Token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return self.get_user(validated_token)
+        key = resolve_key(CacheKeys.auth_user(user_id))
+        user = cache.get(key)
+        if user is None:
+            # Raises for unknown or inactive users, which are never cached.
+            user = self.get_user(validated_token)
+            cache.set(key, user, timeout=settings.AUTH_USER_CACHE_TIMEOUT)
+        return user
+
+    async def aget_cached_user(self, validated_token: Token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return await sync_to_async(self.get_user)(validated_token)
+        key = await aresolve_key(CacheKeys.auth_user(user_id))
+        user = await cache.aget(key)
+        if user is None:
+            user = await sync_to_async(self.get_user)(validated_token)
+            await cache.aset(key, user, timeout=settings.AUTH_USER_CACHE_TIMEOUT)
+        return user
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    target_class = "common.authentication.CachedJWTAuthentication"
+
+
+def invalidate_cached_user(user_id: int, revoked: bool = False) -> None:
+    """
+    Drop the cached user. `revoked` also stops stateless requests from
+    trusting tokens already issued to them, until those tokens expire.
+    """
+    invalidate_tags(CacheKeys.user_tag(user_id))
+    if revoked:
+        cache.set(
+            CacheKeys.auth_revoked(user_id),
+            True,
+            timeout=int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()),
+        )
+    else:
+        cache.delete(CacheKeys.auth_revoked(user_id))
@@ -0,0 +1,12 @@
+from typing import Any
+
+from django.utils.module_loading import import_string
+
+
+def load_backend(config: dict[str, Any]) -> Any:
+    """
+    Instantiate a pluggable backend from a `{"BACKEND": ..., "OPTIONS": ...}`
+    settings dict, the same shape Django uses for CACHES and STORAGES.
+    """
+    backend_class = import_string(config["BACKEND"])
+    return backend_class(**config.get("OPTIONS", {}))
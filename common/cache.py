@@ -0,0 +1,439 @@
+import asyncio
+import inspect
+import math
+import pickle
+import random
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Iterable, NamedTuple
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from common.cache_keys import CacheKeys, TaggedKey
+
+# Versions may expire: a re-initialised counter starts above every value the
+# old one could have reached, so expiry only costs a round of cache misses.
+VERSION_TIMEOUT = 60 * 60 * 24 * 7
+# How long a single-flight recomputation may hold its lock, and how often
+# the callers waiting on it poll for the result.
+SINGLE_FLIGHT_TIMEOUT = 10
+SINGLE_FLIGHT_POLL = 0.05
+
+MISSING = object()
+
+
+def get_version(key: str) -> int:
+    """
+    Read the version counter stored under `key`, initialising it if needed.
+
+    New counters start at the current time in nanoseconds rather than 1, so
+    a counter that was evicted or expired never comes back at a value that
+    older cache entries were keyed on.
+    """
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(key, version, timeout=VERSION_TIMEOUT):
+            version = cache.get(key, version)
+    return version
+
+
+async def aget_version(key: str) -> int:
+    version = await cache.aget(key)
+    if version is None:
+        version = time.time_ns()
+        if not await cache.aadd(key, version, timeout=VERSION_TIMEOUT):
+            version = await cache.aget(key, version)
+    return version
+
+
+def bump_version(key: str) -> int:
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = time.time_ns()
+        cache.set(key, version, timeout=VERSION_TIMEOUT)
+        return version
+
+
+def get_tag_versions(tags: Iterable[str]) -> tuple[int, ...]:
+    """
+    Current version of each tag, read in one round trip.
+    """
+    keys = [CacheKeys.tag_version(tag) for tag in tags]
+    found = cache.get_many(keys)
+    return tuple(found[key] if key in found else get_version(key) for key in keys)
+
+
+async def aget_tag_versions(tags: Iterable[str]) -> tuple[int, ...]:
+    keys = [CacheKeys.tag_version(tag) for tag in tags]
+    found = await cache.aget_many(keys)
+    return tuple(
+        [found[key] if key in found else await aget_version(key) for key in keys]
+    )
+
+
+def resolve_key(tagged: TaggedKey, versions: tuple[int, ...] | None = None) -> str:
+    """
+    The key to read and write `tagged` under right now. Invalidating any of
+    its tags changes the key, so stale entries are never found again and
+    simply expire.
+    """
+    if versions is None:
+        versions = get_tag_versions(tagged.tags)
+    return ":".join([tagged.key, *(f"v{version}" for version in versions)])
+
+
+async def aresolve_key(
+    tagged: TaggedKey, versions: tuple[int, ...] | None = None
+) -> str:
+    if versions is None:
+        versions = await aget_tag_versions(tagged.tags)
+    return resolve_key(tagged, versions)
+
+
+def invalidate_tags(*tags: str) -> None:
+    """
+    Invalidate every cached entry depending on any of `tags`.
+
+    The bump is repeated once the surrounding transaction commits: a reader
+    that ran between the first bump and the commit may have cached the old
+    rows under the new version.
+    """
+    keys = [CacheKeys.tag_version(tag) for tag in tags]
+    for key in keys:
+        bump_version(key)
+    transaction.on_commit(lambda: [bump_version(key) for key in keys])
+
+
+class CacheEntry(NamedTuple):
+    """
+    A value stored by `TwoTierCache.get_or_set`, with what XFetch needs:
+    how long it took to compute and when it expires.
+    """
+
+    value: Any
+    delta: float
+    expires_at: float | None
+
+
+class TwoTierCache(BaseCache):
+    """
+    A bounded in-process LRU (L1) in front of a shared cache (L2).
+
+    Options:
+        L2: alias of the shared cache in CACHES.
+        MAX_ENTRIES: size of the L1.
+        L1_TIMEOUT: seconds an entry lives in the L1. A write in another
+            process goes unseen in this process's L1 for up to that long.
+        L1_BYPASS_PREFIXES: keys always read from the L2. Defaults to
+            version counters, which must be seen by every process at once.
+
+    `get_or_set` lets a single caller recompute a missing key while others
+    wait for its result, and recomputes ahead of expiry with a probability
+    that grows as the expiry nears (XFetch), so hot keys rarely expire at
+    all. `get_stats` reports per-process hit and miss counters.
+
+    `aget`, `aget_many`, `aset` and `aget_or_set` are native: an L1 hit
+    never leaves the event loop.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._l2_alias = options["L2"]
+        self.l1_timeout = options.get("L1_TIMEOUT", 5)
+        self.bypass_prefixes = tuple(options.get("L1_BYPASS_PREFIXES", ("version:",)))
+        self._l1: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Counter[str] = Counter()
+
+    @property
+    def l2(self) -> BaseCache:
+        return caches[self._l2_alias]
+
+    async def _al2(self, method: str, *args, **kwargs) -> Any:
+        """
+        Call `method` of the L2 for an async caller. Django's cache backends
+        only offer async methods that run the sync ones in a thread; for an
+        in-process L2 that hop costs more than the call itself.
+        """
+        if isinstance(self.l2, LocMemCache):
+            return getattr(self.l2, method)(*args, **kwargs)
+        return await getattr(self.l2, f"a{method}")(*args, **kwargs)
+
+    def get_stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                name: self._stats[name]
+                for name in ("l1_hits", "l2_hits", "misses", "recomputes")
+            }
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _l1_key(self, key, version) -> str | None:
+        if str(key).startswith(self.bypass_prefixes):
+            return None
+        return self.make_and_validate_key(key, version=version)
+
+    def _l1_get(self, l1_key: str) -> Any:
+        with self._lock:
+            item = self._l1.get(l1_key)
+            if item is None:
+                return MISSING
+            if item[1] <= time.monotonic():
+                del self._l1[l1_key]
+                return MISSING
+            self._l1.move_to_end(l1_key)
+        # Unpickled per read, so callers can't mutate each other's values.
+        return pickle.loads(item[0])
+
+    def _l1_set(self, l1_key: str, value: Any, timeout: float | None) -> None:
+        lifetime = self.l1_timeout if timeout is None else min(timeout, self.l1_timeout)
+        if lifetime <= 0:
+            self._l1_delete(l1_key)
+            return
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._l1[l1_key] = (pickled, time.monotonic() + lifetime)
+            self._l1.move_to_end(l1_key)
+            while len(self._l1) > self._max_entries:
+                self._l1.popitem(last=False)
+
+    def _l1_delete(self, l1_key: str | None) -> None:
+        if l1_key is not None:
+            with self._lock:
+                self._l1.pop(l1_key, None)
+
+    def _timeout(self, timeout) -> float | None:
+        return self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+    def _l1_lookup(self, key, version) -> tuple[str | None, Any]:
+        l1_key = self._l1_key(key, version)
+        if l1_key is None:
+            return None, MISSING
+        value = self._l1_get(l1_key)
+        if value is not MISSING:
+            self._count("l1_hits")
+        return l1_key, value
+
+    def _fill(self, l1_key: str | None, value: Any) -> Any:
+        """
+        Account for a value read from the L2 and copy it into the L1.
+        """
+        if value is MISSING:
+            self._count("misses")
+            return MISSING
+        self._count("l2_hits")
+        if l1_key is not None:
+            self._l1_set(l1_key, value, None)
+        return value
+
+    def _get_raw(self, key, version) -> Any:
+        l1_key, value = self._l1_lookup(key, version)
+        if value is MISSING:
+            value = self._fill(l1_key, self.l2.get(key, MISSING, version=version))
+        return value
+
+    async def _aget_raw(self, key, version) -> Any:
+        l1_key, value = self._l1_lookup(key, version)
+        if value is MISSING:
+            value = await self._al2("get", key, MISSING, version=version)
+            value = self._fill(l1_key, value)
+        return value
+
+    def get(self, key, default=None, version=None):
+        return _unwrap(self._get_raw(key, version), default)
+
+    async def aget(self, key, default=None, version=None):
+        # L1 hits are answered without leaving the event loop.
+        return _unwrap(await self._aget_raw(key, version), default)
+
+    def _l1_lookup_many(self, keys, version) -> tuple[dict[str, Any], list[str]]:
+        found, remote = {}, []
+        for key in keys:
+            _, value = self._l1_lookup(key, version)
+            if value is MISSING:
+                remote.append(key)
+            else:
+                found[key] = value
+        return found, remote
+
+    def _fill_many(self, found, remote, fetched, version) -> dict[str, Any]:
+        for key in remote:
+            value = self._fill(self._l1_key(key, version), fetched.get(key, MISSING))
+            if value is not MISSING:
+                found[key] = value
+        return {key: _unwrap(value) for key, value in found.items()}
+
+    def get_many(self, keys, version=None):
+        found, remote = self._l1_lookup_many(keys, version)
+        fetched = self.l2.get_many(remote, version=version) if remote else {}
+        return self._fill_many(found, remote, fetched, version)
+
+    async def aget_many(self, keys, version=None):
+        found, remote = self._l1_lookup_many(keys, version)
+        fetched = await self._al2("get_many", remote, version=version) if remote else {}
+        return self._fill_many(found, remote, fetched, version)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        timeout = self._timeout(timeout)
+        self.l2.set(key, value, timeout=timeout, version=version)
+        if (l1_key := self._l1_key(key, version)) is not None:
+            self._l1_set(l1_key, value, timeout)
+
+    async def aset(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        timeout = self._timeout(timeout)
+        await self._al2("set", key, value, timeout=timeout, version=version)
+        if (l1_key := self._l1_key(key, version)) is not None:
+            self._l1_set(l1_key, value, timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.l2.add(key, value, timeout=self._timeout(timeout), version=version)
+        if added:
+            self._l1_delete(self._l1_key(key, version))
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.l2.touch(key, timeout=self._timeout(timeout), version=version)
+
+    def delete(self, key, version=None):
+        self._l1_delete(self._l1_key(key, version))
+        return self.l2.delete(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self._l1_delete(self._l1_key(key, version))
+        return self.l2.incr(key, delta, version=version)
+
+    def decr(self, key, delta=1, version=None):
+        self._l1_delete(self._l1_key(key, version))
+        return self.l2.decr(key, delta, version=version)
+
+    def has_key(self, key, version=None):
+        return self._get_raw(key, version) is not MISSING
+
+    def clear(self):
+        with self._lock:
+            self._l1.clear()
+        return self.l2.clear()
+
+    def _fresh(self, current: Any) -> Any:
+        """
+        The value to serve from what the cache holds, or MISSING when it
+        should be recomputed.
+        """
+        if isinstance(current, CacheEntry):
+            return MISSING if should_recompute(current) else current.value
+        return current
+
+    def get_or_set(self, key, default, timeout=DEFAULT_TIMEOUT, version=None):
+        """
+        Like `BaseCache.get_or_set`, but a missing or early-expired key is
+        recomputed by one caller at a time. A `default` returning None is
+        not cached.
+        """
+        timeout = self._timeout(timeout)
+        current = self._get_raw(key, version)
+        if (value := self._fresh(current)) is not MISSING:
+            return value
+
+        lock = CacheKeys.single_flight(key)
+        deadline = time.monotonic() + SINGLE_FLIGHT_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.l2.add(lock, True, timeout=SINGLE_FLIGHT_TIMEOUT, version=version):
+                try:
+                    return self._recompute(key, default, timeout, version)
+                finally:
+                    self.l2.delete(lock, version=version)
+            if current is not MISSING:
+                # Early recomputation is under way elsewhere, keep serving.
+                return current.value
+            # Wait for the value, or for the lock to be released without
+            # one (`default` returned None or raised) to take over at once.
+            while time.monotonic() < deadline:
+                time.sleep(SINGLE_FLIGHT_POLL)
+                found = self.l2.get_many([key, lock], version=version)
+                if key in found:
+                    return _unwrap(found[key])
+                if lock not in found:
+                    break
+        # The other caller died or is too slow: compute without the lock.
+        return self._recompute(key, default, timeout, version)
+
+    async def aget_or_set(self, key, default, timeout=DEFAULT_TIMEOUT, version=None):
+        """
+        `get_or_set` for async callers. `default` may be a coroutine
+        function, and waiting on another caller doesn't block the loop.
+        """
+        timeout = self._timeout(timeout)
+        current = await self._aget_raw(key, version)
+        if (value := self._fresh(current)) is not MISSING:
+            return value
+
+        lock = CacheKeys.single_flight(key)
+        deadline = time.monotonic() + SINGLE_FLIGHT_TIMEOUT
+        while time.monotonic() < deadline:
+            if await self._al2(
+                "add", lock, True, timeout=SINGLE_FLIGHT_TIMEOUT, version=version
+            ):
+                try:
+                    return await self._arecompute(key, default, timeout, version)
+                finally:
+                    await self._al2("delete", lock, version=version)
+            if current is not MISSING:
+                return current.value
+            while time.monotonic() < deadline:
+                await asyncio.sleep(SINGLE_FLIGHT_POLL)
+                found = await self._al2("get_many", [key, lock], version=version)
+                if key in found:
+                    return _unwrap(found[key])
+                if lock not in found:
+                    break
+        return await self._arecompute(key, default, timeout, version)
+
+    def _entry(self, value: Any, started: float, timeout) -> CacheEntry:
+        delta = time.monotonic() - started
+        expires_at = None if timeout is None else time.time() + timeout
+        return CacheEntry(value, delta, expires_at)
+
+    def _recompute(self, key, default, timeout, version) -> Any:
+        self._count("recomputes")
+        started = time.monotonic()
+        value = default() if callable(default) else default
+        if value is not None:
+            self.set(key, self._entry(value, started, timeout), timeout, version)
+        return value
+
+    async def _arecompute(self, key, default, timeout, version) -> Any:
+        self._count("recomputes")
+        started = time.monotonic()
+        value = default() if callable(default) else default
+        if inspect.isawaitable(value):
+            value = await value
+        if value is not None:
+            entry = self._entry(value, started, timeout)
+            await self.aset(key, entry, timeout, version)
+        return value
+
+
+def _unwrap(value: Any, default: Any = None) -> Any:
+    if value is MISSING:
+        return default
+    return value.value if isinstance(value, CacheEntry) else value
+
+
+def should_recompute(entry: CacheEntry, beta: float = 1.0) -> bool:
+    """
+    XFetch: recompute early with a probability rising towards the expiry,
+    faster for values that are slow to compute.
+    """
+    if entry.expires_at is None:
+        return False
+    gap = -entry.delta * beta * math.log(1 - random.random())
+    return time.time() + gap >= entry.expires_at
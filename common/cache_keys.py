@@ -1,4 +1,90 @@
+from typing import NamedTuple
+
+
+class TaggedKey(NamedTuple):
+    """
+    A cache key whose entry depends on `tags`. The key actually used
+    embeds the current version of each tag.
+    """
+
+    key: str
+    tags: tuple[str, ...]
+
+
 class CacheKeys:
     @classmethod
-    def pending_report_summary(cls, post_id: int):
-        return f"pending-report-summary:post:{post_id}"
+    def single_flight(cls, key: str):
+        return f"single-flight:{key}"
+
+    @classmethod
+    def timeline(cls, user_id: int):
+        return f"timeline:user:{user_id}"
+
+    # Dependency tags. Invalidating a tag (common.cache.invalidate_tags)
+    # invalidates every tagged key declaring it.
+
+    @classmethod
+    def post_tag(cls, post_id: int):
+        return f"post:{post_id}"
+
+    @classmethod
+    def user_tag(cls, user_id: int):
+        return f"user:{user_id}"
+
+    @classmethod
+    def reports_tag(cls, post_id: int):
+        return f"reports:post:{post_id}"
+
+    @classmethod
+    def tag_version(cls, tag: str):
+        return f"version:{tag}"
+
+    # Tagged keys, resolved with common.cache.resolve_key.
+
+    @classmethod
+    def post_detail(cls, post_id: int):
+        return TaggedKey(f"post-detail:post:{post_id}", (cls.post_tag(post_id),))
+
+    @classmethod
+    def report_summary(cls, post_id: int):
+        # The post tag also covers the post content and author name it embeds.
+        return TaggedKey(
+            f"report-summary:post:{post_id}",
+            (cls.post_tag(post_id), cls.reports_tag(post_id)),
+        )
+
+    @classmethod
+    def auth_user(cls, user_id: int):
+        return TaggedKey(f"auth-user:user:{user_id}", (cls.user_tag(user_id),))
+
+    @classmethod
+    def auth_revoked(cls, user_id: int):
+        return f"auth-revoked:user:{user_id}"
+
+    @classmethod
+    def throttle(cls, scope: str, ident: str):
+        return f"throttle:{scope}:{ident}"
+
+    @classmethod
+    def rendition(cls, name: str):
+        return f"rendition:{name}"
+
+    @classmethod
+    def like_buffer(cls, user_id: int, post_id: int):
+        return f"like-buffer:user:{user_id}:post:{post_id}"
+
+    @classmethod
+    def like_buffer_pending(cls):
+        return "like-buffer:pending"
+
+    @classmethod
+    def trending_state(cls):
+        return "trending:state"
+
+    @classmethod
+    def trending_ranking(cls):
+        return "trending:ranking"
+
+    @classmethod
+    def trending_refresh_lock(cls):
+        return "trending:refresh-lock"
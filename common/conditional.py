@@ -0,0 +1,77 @@
+import hashlib
+from datetime import datetime
+from typing import Any, Awaitable, Callable
+
+from django.http import HttpResponseBase
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.request import Request
+
+
+def make_etag(request: Request, signature: Any) -> str:
+    """
+    Strong ETag for what `request` gets back, given a cheap `signature` of
+    the data behind it (versions, aggregates, ...). The URL and user are
+    part of the tag, so paged, filtered and per-user responses differ.
+    """
+    user_id = request.user.pk if request.user.is_authenticated else None
+    payload = repr((request.get_full_path(), user_id, signature)).encode()
+    return quote_etag(hashlib.md5(payload, usedforsecurity=False).hexdigest())
+
+
+class ConditionalGetMixin:
+    """
+    Answer `If-None-Match` / `If-Modified-Since` with a 304 before the body
+    is built. Views compute a signature from something cheaper than the
+    response itself and pass a callable that builds the full response.
+    """
+
+    def conditional_get(
+        self,
+        request: Request,
+        build_response: Callable[[], HttpResponseBase],
+        *,
+        signature: Any,
+        last_modified: datetime | None = None,
+    ) -> HttpResponseBase:
+        etag, timestamp, response = self.precondition(request, signature, last_modified)
+        if response is None:
+            response = build_response()
+        return self.finish_conditional(response, etag, timestamp)
+
+    async def aconditional_get(
+        self,
+        request: Request,
+        build_response: Callable[[], Awaitable[HttpResponseBase]],
+        *,
+        signature: Any,
+        last_modified: datetime | None = None,
+    ) -> HttpResponseBase:
+        etag, timestamp, response = self.precondition(request, signature, last_modified)
+        if response is None:
+            response = await build_response()
+        return self.finish_conditional(response, etag, timestamp)
+
+    def precondition(
+        self, request: Request, signature: Any, last_modified: datetime | None
+    ) -> tuple[str, int | None, HttpResponseBase | None]:
+        """
+        The ETag and timestamp for the response, and the 304 (or 412) to
+        send instead of building it, if any.
+        """
+        etag = make_etag(request, signature)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(
+            request._request, etag=etag, last_modified=timestamp
+        )
+        return etag, timestamp, response
+
+    def finish_conditional(
+        self, response: HttpResponseBase, etag: str, timestamp: int | None
+    ) -> HttpResponseBase:
+        if response.status_code in (200, 304):
+            response.headers["ETag"] = etag
+            if timestamp is not None:
+                response.headers["Last-Modified"] = http_date(timestamp)
+        patch_vary_headers(response, ("Authorization",))
+        return response
@@ -0,0 +1,142 @@
+import json
+from typing import Any
+
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination keyed on `(<ordering field>, <tiebreak field>)`.
+
+    The cursor carries the last seen value of both columns, so every page is
+    a `WHERE (field, id) < (value, id) ORDER BY field, id LIMIT n` range read:
+    no COUNT(*) and no OFFSET, whatever the depth. The ordering is taken from
+    the (already filtered) queryset, so `OrderingFilter` keeps working.
+    """
+
+    ordering = "-created_at"
+    tiebreak_field = "id"
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset: QuerySet, view):
+        order_by = list(queryset.query.order_by) or list(
+            queryset.query.get_meta().ordering
+        )
+        field = order_by[0] if order_by else self.ordering
+        if not isinstance(field, str) or "__" in field or "?" in field:
+            field = self.ordering
+        descending = field.startswith("-")
+        tiebreak = f"-{self.tiebreak_field}" if descending else self.tiebreak_field
+        if field.lstrip("-") == self.tiebreak_field:
+            return (field, field)
+        return (field, tiebreak)
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset[: self.page_size + 1]))
+
+    async def apaginate_queryset(self, queryset: QuerySet, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(
+            [row async for row in queryset[: self.page_size + 1].aiterator()]
+        )
+
+    def get_page_queryset(self, queryset: QuerySet, request, view) -> QuerySet | None:
+        """
+        Order and filter `queryset` so its first `page_size + 1` rows are
+        the requested page plus one to tell whether there is more.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor.reverse if self.cursor else False
+
+        ordering = _flip(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*dict.fromkeys(ordering))
+        if self.cursor is not None and self.cursor.position is not None:
+            queryset = queryset.filter(self._after(ordering, self.cursor.position))
+        return queryset
+
+    def set_page(self, results: list) -> list:
+        reverse = self.cursor.reverse if self.cursor else False
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if reverse:
+            self.page.reverse()
+
+        if reverse:
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        position = self._position(self.page[-1])
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        position = self._position(self.page[0])
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def decode_cursor(self, request):
+        cursor = super().decode_cursor(request)
+        if cursor is None or cursor.position is None:
+            return cursor
+        try:
+            value, tiebreak = json.loads(cursor.position)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(offset=0, reverse=cursor.reverse, position=(value, tiebreak))
+
+    def _position(self, instance) -> str:
+        values = [_read(instance, name.lstrip("-")) for name in self.ordering]
+        return json.dumps([_dump(value) for value in values])
+
+    def _after(self, ordering: tuple[str, str], position: tuple[Any, Any]) -> Q:
+        """
+        Build `(field, tiebreak) > position` in the direction of `ordering`.
+        """
+        field, tiebreak = ordering
+        value, tiebreak_value = position
+        field_op = "lt" if field.startswith("-") else "gt"
+        tiebreak_op = "lt" if tiebreak.startswith("-") else "gt"
+        field, tiebreak = field.lstrip("-"), tiebreak.lstrip("-")
+        if field == tiebreak:
+            return Q(**{f"{field}__{field_op}": value})
+        return Q(**{f"{field}__{field_op}": value}) | Q(
+            **{field: value, f"{tiebreak}__{tiebreak_op}": tiebreak_value}
+        )
+
+
+def _flip(ordering: tuple[str, str]) -> tuple[str, str]:
+    return tuple(  # type: ignore[return-value]
+        name[1:] if name.startswith("-") else f"-{name}" for name in ordering
+    )
+
+
+def _read(instance, name: str) -> Any:
+    if isinstance(instance, dict):
+        return instance[name]
+    return getattr(instance, name)
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, (int, float, str)) or value is None:
+        return value
+    return str(value)
@@ -0,0 +1,166 @@
+"""
+Resized / re-encoded variants ("renditions") of uploaded images.
+
+Renditions are rendered with Pillow in a process pool once the upload is
+committed, so request threads never pay for decoding and resampling. Their
+URLs point at `rendition_redirect`, which renders a missing rendition on
+first access and then redirects to the stored file.
+"""
+
+import logging
+import multiprocessing
+import posixpath
+from concurrent.futures import Future, ProcessPoolExecutor
+from io import BytesIO
+from typing import Any
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage, default_storage
+from django.db import transaction
+from django.urls import reverse
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+RENDITIONS_DIR = "renditions"
+# Only uploads under these directories can be rendered.
+SOURCE_DIRS = ("posts/", "avatars/")
+EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "WEBP": "webp"}
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def get_specs() -> dict[str, dict[str, Any]]:
+    return settings.IMAGE_RENDITIONS
+
+
+def rendition_name(source_name: str, spec_name: str) -> str:
+    spec = get_specs()[spec_name]
+    base, _ = posixpath.splitext(source_name)
+    return f"{RENDITIONS_DIR}/{spec_name}/{base}.{EXTENSIONS[spec['format']]}"
+
+
+def rendition_urls(source_name: str | None, request=None) -> dict[str, str] | None:
+    if not source_name:
+        return None
+    urls = {
+        spec_name: reverse("image-rendition", args=[spec_name, source_name])
+        for spec_name in get_specs()
+    }
+    if request is None:
+        return urls
+    return {name: request.build_absolute_uri(url) for name, url in urls.items()}
+
+
+def render(data: bytes, specs: dict[str, dict[str, Any]]) -> dict[str, bytes]:
+    """
+    Render every spec from the encoded source image. Pure CPU work with no
+    Django access, so it can run in a worker process.
+    """
+    with Image.open(BytesIO(data)) as source:
+        source = ImageOps.exif_transpose(source)
+        rendered = {}
+        for spec_name, spec in specs.items():
+            size = tuple(spec["size"])
+            if spec.get("crop"):
+                image = ImageOps.fit(source, size, Image.Resampling.LANCZOS)
+            else:
+                image = source.copy()
+                image.thumbnail(size, Image.Resampling.LANCZOS)
+            if spec["format"] == "JPEG" and image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            buffer = BytesIO()
+            image.save(buffer, format=spec["format"], quality=spec.get("quality", 82))
+            rendered[spec_name] = buffer.getvalue()
+    return rendered
+
+
+def missing_specs(source_name: str, storage: Storage = default_storage) -> list[str]:
+    return [
+        spec_name
+        for spec_name in get_specs()
+        if not storage.exists(rendition_name(source_name, spec_name))
+    ]
+
+
+def save_renditions(
+    source_name: str, rendered: dict[str, bytes], storage: Storage = default_storage
+) -> None:
+    for spec_name, data in rendered.items():
+        name = rendition_name(source_name, spec_name)
+        if not storage.exists(name):
+            saved = storage.save(name, ContentFile(data))
+            if saved != name:
+                # Another render stored it first and the storage picked a
+                # new name for ours: drop the duplicate.
+                storage.delete(saved)
+
+
+def generate_renditions(
+    source_name: str,
+    spec_names: list[str] | None = None,
+    storage: Storage = default_storage,
+) -> None:
+    """
+    Render and store renditions synchronously, in the calling process.
+    """
+    specs = get_specs()
+    spec_names = spec_names or missing_specs(source_name, storage)
+    if not spec_names:
+        return
+    with storage.open(source_name, "rb") as source:
+        data = source.read()
+    rendered = render(data, {name: specs[name] for name in spec_names})
+    save_renditions(source_name, rendered, storage)
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_RENDITION_WORKERS,
+            # Don't fork a process that may hold DB connections and threads.
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def submit_renditions(source_name: str, storage: Storage = default_storage) -> None:
+    if not storage.exists(source_name):
+        return
+    spec_names = missing_specs(source_name, storage)
+    if not spec_names:
+        return
+    specs = get_specs()
+    with storage.open(source_name, "rb") as source:
+        data = source.read()
+    future = get_executor().submit(
+        render, data, {name: specs[name] for name in spec_names}
+    )
+
+    def on_done(done: Future) -> None:
+        try:
+            save_renditions(source_name, done.result(), storage)
+        except Exception:
+            # The lazy path in rendition_redirect will retry on access.
+            logger.exception("Rendering renditions of %s failed", source_name)
+
+    future.add_done_callback(on_done)
+
+
+def schedule_renditions(source_name: str | None) -> None:
+    """
+    Render the renditions of `source_name` off-request once the current
+    transaction commits.
+    """
+    if not source_name:
+        return
+
+    def submit():
+        try:
+            submit_renditions(source_name)
+        except Exception:
+            logger.exception("Scheduling renditions of %s failed", source_name)
+
+    transaction.on_commit(submit)
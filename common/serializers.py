@@ -0,0 +1,103 @@
+from typing import Iterable
+
+from django.db.models import QuerySet
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+
+FIELDS_PARAM = "fields"
+OMIT_PARAM = "omit"
+
+
+def requested_fields(request: Request, available: Iterable[str]) -> list[str] | None:
+    """
+    Resolve `?fields=a,b` and `?omit=c` against the `available` field names.
+    Returns None when the client asked for the full representation.
+    """
+    fields = request.query_params.get(FIELDS_PARAM)
+    omit = request.query_params.get(OMIT_PARAM)
+    if not fields and not omit:
+        return None
+    keep = set(fields.split(",")) if fields else None
+    drop = set(omit.split(",")) if omit else set()
+    return [
+        name
+        for name in available
+        if (keep is None or name in keep) and name not in drop
+    ]
+
+
+class SparseFieldsetsMixin:
+    """
+    Serializer mixin dropping every field not listed in
+    `context["sparse_fields"]`.
+
+    `Meta.sparse_sources` maps a field to the model paths it reads, for
+    fields whose `source` alone does not say (e.g. a related object
+    rendered through its `__str__`). Map a field to `()` when it needs no
+    column, e.g. a many-to-many loaded by a prefetch.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = self.context.get("sparse_fields")  # type: ignore
+        if selected is not None:
+            for name in set(self.fields) - set(selected):  # type: ignore
+                self.fields.pop(name)  # type: ignore
+
+    @classmethod
+    def get_query_fields(cls, selected: Iterable[str]) -> list[str]:
+        """
+        Model paths to pass to `only()` to render `selected` fields.
+        """
+        sources = getattr(cls.Meta, "sparse_sources", {})  # type: ignore
+        declared = cls._declared_fields  # type: ignore
+        paths = ["pk"]
+        for name in selected:
+            if name in sources:
+                paths.extend(sources[name])
+            elif name in declared:
+                field = declared[name]
+                if not field.write_only:
+                    paths.append((field.source or name).replace(".", "__"))
+            else:
+                paths.append(name)
+        return list(dict.fromkeys(paths))
+
+
+class SparseFieldsetsViewMixin:
+    """
+    View side of sparse fieldsets: reads `?fields=` / `?omit=` on safe
+    requests, passes the selection to the serializer and narrows querysets
+    to the columns it needs.
+    """
+
+    def get_sparse_fields(self) -> list[str] | None:
+        request: Request = self.request  # type: ignore
+        if request.method not in SAFE_METHODS:
+            return None
+        serializer_class = self.get_serializer_class()  # type: ignore
+        return requested_fields(request, serializer_class.Meta.fields)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()  # type: ignore
+        context["sparse_fields"] = self.get_sparse_fields()
+        return context
+
+    def apply_sparse_fieldsets(self, queryset: QuerySet) -> QuerySet:
+        selected = self.get_sparse_fields()
+        if selected is None:
+            return queryset
+        serializer_class = self.get_serializer_class()  # type: ignore
+        paths = serializer_class.get_query_fields(selected)
+        # The keyset paginator reads the ordering columns of each page's
+        # first and last rows to build its links.
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        paths += [name.lstrip("-") for name in ordering if isinstance(name, str)]
+        paths = list(dict.fromkeys(paths))
+        # A relation can't be both deferred and joined by select_related.
+        relations = [path.split("__")[0] for path in paths if "__" in path]
+        return (
+            queryset.select_related(None)
+            .select_related(*dict.fromkeys(relations))
+            .only(*paths)
+        )
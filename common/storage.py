@@ -0,0 +1,110 @@
+"""
+Content-addressed storage for user uploads.
+
+Every upload is hashed while it is written and stored once, as
+`<upload_to>/<ab>/<digest><ext>`. Re-uploading the same image reuses the
+existing blob, so any number of `Post.image` / `Profile.avatar` rows can
+point at one file. Blobs are never deleted on behalf of a single row;
+`gc_media_blobs` removes the ones no row references anymore.
+"""
+
+import hashlib
+import os
+import posixpath
+import re
+import tempfile
+from typing import Iterator
+
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage, storages
+
+DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    hash_algorithm = "sha256"
+    # Uploads being hashed are written here before being moved into place.
+    staging_prefix = ".upload-"
+
+    def get_available_name(self, name, max_length=None):
+        # The final name comes from the content, see `_save`.
+        return name
+
+    def blob_name(self, name: str, digest: str) -> str:
+        prefix, filename = posixpath.split(name)
+        extension = posixpath.splitext(filename)[1].lower()
+        return posixpath.join(prefix, digest[:2], f"{digest}{extension}")
+
+    def _save(self, name, content):
+        digest = hashlib.new(self.hash_algorithm)
+        if hasattr(content, "temporary_file_path"):
+            # Already on disk: hash it in place and move it if it's new.
+            for chunk in content.chunks():
+                digest.update(chunk)
+            staged, owned = content.temporary_file_path(), False
+        else:
+            staged, owned = self.stage(content, digest), True
+
+        name = self.blob_name(name, digest.hexdigest())
+        full_path = self.path(name)
+        if os.path.exists(full_path):
+            # Refresh the mtime so the gc grace period covers the new row.
+            os.utime(full_path)
+            if owned:
+                os.unlink(staged)
+            return name
+
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        # Same digest means same bytes, so losing a race to another upload
+        # of this file is harmless.
+        file_move_safe(staged, full_path, allow_overwrite=True)
+        if self.file_permissions_mode is not None:
+            os.chmod(full_path, self.file_permissions_mode)
+        return name
+
+    def stage(self, content, digest) -> str:
+        """
+        Stream `content` to a temporary file under the storage root, hashing
+        it on the way, and return the file's path.
+        """
+        os.makedirs(self.location, exist_ok=True)
+        fd, path = tempfile.mkstemp(dir=self.location, prefix=self.staging_prefix)
+        try:
+            with os.fdopen(fd, "wb") as staged:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    staged.write(chunk)
+        except BaseException:
+            os.unlink(path)
+            raise
+        return path
+
+    def iter_blobs(self, prefix: str) -> Iterator[tuple[str, float]]:
+        """
+        Yield the name and mtime of every blob under `prefix`. Files not
+        named after a digest (e.g. the default avatar) are never yielded.
+        """
+        prefix = prefix.strip("/")
+        if not self.exists(prefix):
+            return
+        for shard in self.listdir(prefix)[0]:
+            shard_path = posixpath.join(prefix, shard)
+            for filename in self.listdir(shard_path)[1]:
+                if DIGEST_RE.match(posixpath.splitext(filename)[0]):
+                    name = posixpath.join(shard_path, filename)
+                    yield name, os.path.getmtime(self.path(name))
+
+    def iter_staged(self) -> Iterator[tuple[str, float]]:
+        """
+        Yield the path and mtime of leftover staging files, e.g. from a
+        process killed mid-upload.
+        """
+        if not os.path.isdir(self.location):
+            return
+        for entry in os.scandir(self.location):
+            if entry.is_file() and entry.name.startswith(self.staging_prefix):
+                yield entry.path, entry.stat().st_mtime
+
+
+def blob_storage() -> ContentAddressedStorage:
+    return storages["blobs"]  # type: ignore
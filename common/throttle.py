@@ -1,15 +1,159 @@
-from rest_framework.throttling import SimpleRateThrottle
+"""
+Token-bucket throttles.
 
+A rate of "30/minute" is a bucket of 30 tokens refilled at 30 per minute:
+bursts up to the full quota pass, then requests are spaced by the refill
+rate. Each request is one atomic read-modify-write of a two-field bucket
+in the `RATE_LIMITER` backend, shared by every worker process.
+"""
 
-class LikeThrottle(SimpleRateThrottle):
-    scope = "like"
+import threading
+import time
+from collections import OrderedDict
+from functools import cache
 
-    def get_cache_key(self, request, view):
-        return self.get_ident(request)
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
 
+from common.backends import load_backend
+from common.cache_keys import CacheKeys
 
-class FollowThrottle(SimpleRateThrottle):
-    scope = "follow"
+PERIODS = {"s": 1, "m": 60, "h": 60 * 60, "d": 60 * 60 * 24}
+
+
+class BaseRateLimiter:
+    def consume(self, key: str, capacity: int, refill_rate: float) -> float:
+        """
+        Take one token from the bucket under `key`, which holds up to
+        `capacity` tokens and gains `refill_rate` tokens per second.
+        Returns 0 if a token was taken, else the seconds until one is due.
+        """
+        raise NotImplementedError
+
+
+class LocMemRateLimiter(BaseRateLimiter):
+    """
+    In-process stand-in for tests and local development. Every process
+    keeps its own buckets, at most `max_entries` of them: the least
+    recently used bucket is dropped first.
+    """
+
+    def __init__(self, max_entries: int = 10000) -> None:
+        self.max_entries = max_entries
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, refill_rate):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill_rate)
+            wait = 0 if tokens >= 1 else (1 - tokens) / refill_rate
+            self._buckets[key] = (tokens if wait else tokens - 1, now)
+            if len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class RedisRateLimiter(BaseRateLimiter):
+    """
+    One hash per bucket, updated by a Lua script so concurrent requests
+    can't both take the last token. The script reads the Redis clock,
+    which keeps buckets consistent across hosts with skewed clocks.
+    """
+
+    CONSUME_SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local clock = redis.call('TIME')
+    local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(bucket[1]) or capacity
+    local updated = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+    local wait = 0
+    if tokens < 1 then
+        wait = (1 - tokens) / rate
+    else
+        tokens = tokens - 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+    -- A bucket left alone until full again holds no information.
+    redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+    return tostring(wait)
+    """
+
+    def __init__(self, url: str) -> None:
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self._consume = self.client.register_script(self.CONSUME_SCRIPT)
+
+    def consume(self, key, capacity, refill_rate):
+        return float(self._consume(keys=[key], args=[capacity, refill_rate]))
+
+
+def parse_rate(rate: str) -> tuple[int, float]:
+    """
+    "30/minute" -> (30 tokens, 0.5 tokens per second).
+    """
+    num, period = rate.split("/")
+    return int(num), int(num) / PERIODS[period[0]]
 
-    def get_cache_key(self, request, view):
-        return self.get_ident(request)
+
+@cache
+def get_rate_limiter() -> BaseRateLimiter:
+    return load_backend(settings.RATE_LIMITER)
+
+
+@receiver(setting_changed)
+def _reset_rate_limiter(*, setting, **kwargs):
+    if setting == "RATE_LIMITER":
+        get_rate_limiter.cache_clear()
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttles on the `scope` rate in `DEFAULT_THROTTLE_RATES`, per user id
+    when authenticated and per client IP otherwise. Rejected requests get
+    a `Retry-After` header from `wait()`.
+    """
+
+    scope: str
+
+    def __init__(self) -> None:
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        self.capacity, self.refill_rate = parse_rate(rate) if rate else (0, 0.0)
+        self._wait: float | None = None
+
+    def get_cache_key(self, request, view) -> str:
+        if request.user and request.user.is_authenticated:
+            return CacheKeys.throttle(self.scope, f"user:{request.user.pk}")
+        return CacheKeys.throttle(self.scope, f"ip:{self.get_ident(request)}")
+
+    def allow_request(self, request, view) -> bool:
+        if not self.capacity:
+            return True
+        wait = get_rate_limiter().consume(
+            self.get_cache_key(request, view), self.capacity, self.refill_rate
+        )
+        self._wait = wait or None
+        return not wait
+
+    def wait(self) -> float | None:
+        return self._wait
+
+
+class LikeThrottle(TokenBucketThrottle):
+    scope = "like"
+
+
+class FollowThrottle(TokenBucketThrottle):
+    scope = "follow"
@@ -0,0 +1,101 @@
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler
+from django.http import HttpRequest
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+# Leading bytes of every accepted image format.
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+)
+# Enough of the header to tell the formats apart.
+SNIFF_SIZE = 12
+
+
+class UploadTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "Upload is too large."
+    default_code = "upload_too_large"
+
+
+def sniff_image_type(head: bytes) -> str | None:
+    for signature, content_type in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+class UploadGuardHandler(FileUploadHandler):
+    """
+    Upload handler rejecting bad files while they stream in, before the
+    handlers after it buffer them to memory or disk.
+
+    `limits` maps each file field the endpoint accepts to its maximum size.
+    Uploads to any other field, past the limit or whose first bytes are not
+    a JPEG, PNG or WEBP image abort the request at once. Must come first in
+    `request.upload_handlers`.
+    """
+
+    def __init__(self, request: HttpRequest | None = None, limits=None) -> None:
+        super().__init__(request)
+        self.limits: dict[str, int] = limits or {}
+
+    def handle_raw_input(
+        self, input_data, META, content_length, boundary, encoding=None
+    ):
+        # Room for every accepted file plus the regular form fields.
+        max_length = sum(self.limits.values()) + settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+        if content_length > max_length:
+            raise UploadTooLarge()
+        return None
+
+    def new_file(self, field_name, *args, **kwargs) -> None:
+        super().new_file(field_name, *args, **kwargs)
+        if field_name not in self.limits:
+            raise ValidationError({field_name: ["File uploads are not accepted here."]})
+        self.limit = self.limits[field_name]
+        self.received = 0
+        self.head = b""
+
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> bytes:
+        self.received += len(raw_data)
+        if self.received > self.limit:
+            raise UploadTooLarge(
+                f"{self.field_name} must be under {self.limit // (1024 * 1024)} MB."
+            )
+        if len(self.head) < SNIFF_SIZE:
+            self.head += raw_data[: SNIFF_SIZE - len(self.head)]
+            if len(self.head) == SNIFF_SIZE:
+                self.check_format()
+        return raw_data
+
+    def file_complete(self, file_size: int) -> None:
+        if len(self.head) < SNIFF_SIZE:
+            self.check_format()
+        return None
+
+    def check_format(self) -> None:
+        if sniff_image_type(self.head) is None:
+            raise ValidationError(
+                {self.field_name: ["Only JPEG, PNG, or WEBP images are allowed."]}
+            )
+
+
+class UploadLimitsMixin:
+    """
+    Puts an `UploadGuardHandler` enforcing `upload_limits` in front of the
+    request's upload handlers.
+    """
+
+    upload_limits: dict[str, int] = {}
+
+    def initial(self, request, *args, **kwargs):
+        django_request = request._request
+        django_request.upload_handlers = [
+            UploadGuardHandler(django_request, self.upload_limits),
+            *django_request.upload_handlers,
+        ]
+        super().initial(request, *args, **kwargs)  # type: ignore
@@ -0,0 +1,47 @@
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.http import Http404, HttpRequest, HttpResponseRedirect
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_safe
+from PIL import UnidentifiedImageError
+
+from common.cache_keys import CacheKeys
+from common.renditions import (
+    SOURCE_DIRS,
+    generate_renditions,
+    get_specs,
+    rendition_name,
+)
+
+RENDITION_REDIRECT_MAX_AGE = 60 * 60 * 24
+
+
+@require_safe
+def rendition_redirect(request: HttpRequest, spec: str, name: str):
+    """
+    Redirect to a stored rendition, rendering it first if it is missing.
+
+    Public like the images themselves; only renditions of a stored upload
+    under `SOURCE_DIRS` with a configured spec can be rendered.
+    """
+    if spec not in get_specs() or not name.startswith(SOURCE_DIRS):
+        raise Http404("Unknown rendition")
+    target = rendition_name(name, spec)
+    if not default_storage.exists(target):
+        if not default_storage.exists(name):
+            raise Http404("Unknown image")
+
+        def render() -> None:
+            # Callers that waited on the first render find it stored.
+            if not default_storage.exists(target):
+                generate_renditions(name, [spec])
+
+        try:
+            # Only for its single-flight lock: concurrent first requests
+            # render once. Nothing is cached.
+            cache.get_or_set(CacheKeys.rendition(target), render)
+        except UnidentifiedImageError:
+            raise Http404("Not an image")
+    response = HttpResponseRedirect(default_storage.url(target))
+    patch_cache_control(response, public=True, max_age=RENDITION_REDIRECT_MAX_AGE)
+    return response
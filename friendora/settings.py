@@ -144,10 +144,25 @@ MEDIA_URL = "media/"
 
 MEDIA_ROOT = BASE_DIR / "media"
 
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    # Post images and avatars, deduplicated by content.
+    "blobs": {"BACKEND": "common.storage.ContentAddressedStorage"},
+}
+
+IMAGE_RENDITIONS = {
+    "thumb": {"size": (160, 160), "crop": True, "format": "JPEG"},
+    "thumb_webp": {"size": (160, 160), "crop": True, "format": "WEBP"},
+    "medium": {"size": (720, 720), "format": "JPEG"},
+    "medium_webp": {"size": (720, 720), "format": "WEBP"},
+}
+IMAGE_RENDITION_WORKERS = 2
+
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "common.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_FILTER_BACKENDS": [
@@ -155,7 +170,7 @@ REST_FRAMEWORK = {
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "common.pagination.KeysetPagination",
     "PAGE_SIZE": 5,
     "DEFAULT_THROTTLE_CLASSES": [
         "rest_framework.throttling.AnonRateThrottle",
@@ -174,6 +189,8 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
+# Seconds an authenticated user is served from the cache.
+AUTH_USER_CACHE_TIMEOUT = 60
 APPEND_SLASH = False
 
 SPECTACULAR_SETTINGS = {
@@ -185,14 +202,60 @@ SPECTACULAR_SETTINGS = {
     "COMPONENT_SPLIT_REQUEST": True,
 }
 ASGI_APPLICATION = "friendora.asgi.application"
+REDIS_URL = os.environ.get("REDIS_URL")
 CHANNEL_LAYERS = {
     "default": {
         "BACKEND": "channels_redis.core.RedisChannelLayer",
         "CONFIG": {
             "hosts": [
-                os.environ.get("REDIS_URL"),
+                REDIS_URL,
             ],
             "prefix": "friendora",
         },
     },
 }
+
+# A small per-process LRU in front of the shared cache, see common.cache.
+CACHES = {
+    "default": {
+        "BACKEND": "common.cache.TwoTierCache",
+        "OPTIONS": {"L2": "shared", "MAX_ENTRIES": 1000, "L1_TIMEOUT": 5},
+    },
+    "shared": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
+if REDIS_URL:
+    CACHES["shared"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+    }
+
+TIMELINE_STORE = {
+    "BACKEND": "posts.timeline.LocMemTimelineStore",
+    "OPTIONS": {"max_length": 800},
+}
+if REDIS_URL:
+    TIMELINE_STORE = {
+        "BACKEND": "posts.timeline.RedisTimelineStore",
+        "OPTIONS": {"url": REDIS_URL, "max_length": 800},
+    }
+
+# Buffer likes and write them with `manage.py flush_like_buffer` instead of
+# on every request.
+LIKES_WRITE_BEHIND = False
+LIKE_BUFFER = {"BACKEND": "posts.like_buffer.LocMemLikeBuffer"}
+if REDIS_URL:
+    LIKE_BUFFER = {
+        "BACKEND": "posts.like_buffer.RedisLikeBuffer",
+        "OPTIONS": {"url": REDIS_URL},
+    }
+
+# Seconds before each process rebuilds its follow graph from the database.
+FOLLOW_GRAPH_REBUILD_INTERVAL = 300
+
+# Token buckets of the throttles in common.throttle.
+RATE_LIMITER = {"BACKEND": "common.throttle.LocMemRateLimiter"}
+if REDIS_URL:
+    RATE_LIMITER = {
+        "BACKEND": "common.throttle.RedisRateLimiter",
+        "OPTIONS": {"url": REDIS_URL},
+    }
@@ -25,10 +25,17 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
+from common.views import rendition_redirect
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/accounts/", include("accounts.urls")),
     path("api/posts/", include("posts.urls")),
+    path(
+        "api/renditions/<str:spec>/<path:name>",
+        rendition_redirect,
+        name="image-rendition",
+    ),
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
         "api/schema/swagger/",
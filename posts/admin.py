@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.utils.html import format_html
 
 from accounts.models import Follow
+from common.renditions import rendition_urls
 from posts.models import Like, Post, Report, Tag
 
 
@@ -26,9 +27,11 @@ class PostAdmin(admin.ModelAdmin):
         return obj.content[:70] + "...." if len(obj.content) > 70 else obj.content
 
     def image_preview(self, obj: Post):
+        if not obj.image:
+            return "(no image)"
         return format_html(
             '<img src="{}" style="width:48px;height:48px;object-fit:cover;border-radius:4px;" alt="avatar"/>',
-            obj.image.url,
+            rendition_urls(obj.image.name)["thumb"],  # type: ignore
         )
 
 
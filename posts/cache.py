@@ -0,0 +1,115 @@
+from django.core.cache import cache
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from common.cache import aresolve_key, get_tag_versions, resolve_key
+from common.cache_keys import CacheKeys
+from posts.models import Like
+
+POST_DETAIL_TIMEOUT = 60 * 10
+REPORT_SUMMARY_TIMEOUT = 60 * 10
+
+
+class CachedPostDetailMixin:
+    """
+    Serve post detail GETs from a cache entry keyed on the versions of its
+    tags (see `CacheKeys.post_detail`).
+
+    Writes never have to find and delete entries: they invalidate the
+    post's tag and the next read misses. Only views whose
+    object permissions always allow safe methods may use this, since a hit
+    never loads the object.
+
+    The entry is shared by all users; `liked_by_me` is filled in per
+    request.
+    """
+
+    def get_post_version(self, pk) -> tuple[int, ...] | None:
+        try:
+            return get_tag_versions(CacheKeys.post_detail(int(pk)).tags)
+        except (TypeError, ValueError):
+            return None
+
+    def get_liked_by_me(self, request: Request, pk) -> bool:
+        user = request.user
+        return (
+            user.is_authenticated
+            and Like.objects.filter(post_id=pk, user_id=user.id).exists()
+        )
+
+    async def aget_liked_by_me(self, request: Request, pk) -> bool:
+        user = request.user
+        return (
+            user.is_authenticated
+            and await Like.objects.filter(post_id=pk, user_id=user.id).aexists()
+        )
+
+    def serialize_post(self, post) -> tuple[dict, bool | None]:
+        """
+        The full representation to cache, and `liked_by_me` if annotated.
+        URLs are left relative: the entry is shared by every host and
+        scheme the API is served on.
+        """
+        context = {
+            **self.get_serializer_context(),  # type: ignore
+            "sparse_fields": None,
+            "request": None,
+        }
+        data = self.get_serializer(post, context=context).data  # type: ignore
+        return {**data, "liked_by_me": False}, getattr(post, "liked_by_me", None)
+
+    def present(
+        self, request: Request, data: dict, liked_by_me: bool | None, fields
+    ) -> Response:
+        absolute = request.build_absolute_uri
+        data = {**data}
+        if data.get("image"):
+            data["image"] = absolute(data["image"])
+        if data.get("image_renditions"):
+            data["image_renditions"] = {
+                name: absolute(url) for name, url in data["image_renditions"].items()
+            }
+        if fields is None or "liked_by_me" in fields:
+            data["liked_by_me"] = liked_by_me
+        if fields is not None:
+            data = {name: value for name, value in data.items() if name in fields}
+        return Response(data)
+
+    def cached_retrieve(
+        self,
+        request: Request,
+        pk,
+        version: tuple[int, ...] | None = None,
+        fields: list[str] | None = None,
+    ) -> Response:
+        """
+        The full representation is cached; `fields` only trims the response.
+        """
+        version = version or self.get_post_version(pk)
+        key = resolve_key(CacheKeys.post_detail(int(pk)), version) if version else None
+        data = cache.get(key) if key else None
+        liked_by_me = None
+        if data is None:
+            data, liked_by_me = self.serialize_post(self.get_object())  # type: ignore
+            if key:
+                cache.set(key, data, POST_DETAIL_TIMEOUT)
+        if liked_by_me is None and (fields is None or "liked_by_me" in fields):
+            liked_by_me = self.get_liked_by_me(request, pk)
+        return self.present(request, data, liked_by_me, fields)
+
+    async def acached_retrieve(
+        self,
+        request: Request,
+        pk: int,
+        version: tuple[int, ...],
+        fields: list[str] | None = None,
+    ) -> Response:
+        key = await aresolve_key(CacheKeys.post_detail(pk), version)
+        data = await cache.aget(key)
+        liked_by_me = None
+        if data is None:
+            data, liked_by_me = self.serialize_post(await self.aget_object())  # type: ignore
+            await cache.aset(key, data, POST_DETAIL_TIMEOUT)
+        if liked_by_me is None and (fields is None or "liked_by_me" in fields):
+            liked_by_me = await self.aget_liked_by_me(request, pk)
+        return self.present(request, data, liked_by_me, fields)
@@ -0,0 +1,211 @@
+"""
+Write-behind buffering of likes.
+
+With `LIKES_WRITE_BEHIND` on, `like`/`unlike` only record the wanted state
+of the (user, post) pair in a shared buffer and answer right away. The
+`flush_like_buffer` command later applies the buffered states to the
+`Like` table in bulk and reconciles `likes_count` of the touched posts.
+"""
+
+import threading
+from collections import defaultdict
+from functools import cache
+from typing import Iterable
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+
+from accounts.models import User
+from common.backends import load_backend
+from common.cache import invalidate_tags
+from common.cache_keys import CacheKeys
+from posts.models import Like, Post
+
+# A buffered state: (user id, post id, liked).
+LikeState = tuple[int, int, bool]
+
+FLUSH_BATCH_SIZE = 1000
+
+
+class BaseLikeBuffer:
+    """
+    The latest wanted like state per (user, post) pair. Setting the same
+    state twice is a no-op, so retried requests are harmless.
+    """
+
+    def set(self, user_id: int, post_id: int, liked: bool) -> bool | None:
+        """
+        Buffer `liked` and return the previously buffered state, or None if
+        nothing was buffered for the pair.
+        """
+        raise NotImplementedError
+
+    def pending(self, limit: int) -> list[LikeState]:
+        """
+        Up to `limit` buffered states, left in the buffer until acked.
+        """
+        raise NotImplementedError
+
+    def ack(self, states: Iterable[LikeState]) -> None:
+        """
+        Drop flushed states, unless they changed since `pending` read them.
+        """
+        raise NotImplementedError
+
+
+class LocMemLikeBuffer(BaseLikeBuffer):
+    """
+    In-process stand-in for tests and local development. Only the process
+    that buffered the likes can flush them.
+    """
+
+    def __init__(self) -> None:
+        self._states: dict[tuple[int, int], bool] = {}
+        self._lock = threading.Lock()
+
+    def set(self, user_id, post_id, liked):
+        with self._lock:
+            previous = self._states.get((user_id, post_id))
+            self._states[(user_id, post_id)] = liked
+        return previous
+
+    def pending(self, limit):
+        with self._lock:
+            items = list(self._states.items())[:limit]
+        return [(user_id, post_id, liked) for (user_id, post_id), liked in items]
+
+    def ack(self, states):
+        with self._lock:
+            for user_id, post_id, liked in states:
+                if self._states.get((user_id, post_id)) == liked:
+                    del self._states[(user_id, post_id)]
+
+
+class RedisLikeBuffer(BaseLikeBuffer):
+    """
+    One string key per pair holding "1" or "0", plus a set of the pairs
+    waiting to be flushed.
+    """
+
+    # Delete each flushed key, and its set member, only if it still holds
+    # the flushed value.
+    ACK_SCRIPT = """
+    local pending = ARGV[1]
+    for i, key in ipairs(KEYS) do
+        if redis.call('GET', key) == ARGV[i * 2] then
+            redis.call('DEL', key)
+            redis.call('SREM', pending, ARGV[i * 2 + 1])
+        end
+    end
+    """
+
+    def __init__(self, url: str) -> None:
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self._ack = self.client.register_script(self.ACK_SCRIPT)
+
+    def set(self, user_id, post_id, liked):
+        pipe = self.client.pipeline(transaction=True)
+        pipe.set(CacheKeys.like_buffer(user_id, post_id), int(liked), get=True)
+        pipe.sadd(CacheKeys.like_buffer_pending(), f"{user_id}:{post_id}")
+        previous, _ = pipe.execute()
+        return None if previous is None else previous == b"1"
+
+    def pending(self, limit):
+        members = self.client.srandmember(CacheKeys.like_buffer_pending(), limit)
+        pairs = [tuple(map(int, member.split(b":"))) for member in members]
+        if not pairs:
+            return []
+        values = self.client.mget(
+            [CacheKeys.like_buffer(user_id, post_id) for user_id, post_id in pairs]
+        )
+        return [
+            (user_id, post_id, value == b"1")
+            for (user_id, post_id), value in zip(pairs, values)
+            if value is not None
+        ]
+
+    def ack(self, states):
+        keys, args = [], [CacheKeys.like_buffer_pending()]
+        for user_id, post_id, liked in states:
+            keys.append(CacheKeys.like_buffer(user_id, post_id))
+            args += [str(int(liked)), f"{user_id}:{post_id}"]
+        if keys:
+            self._ack(keys=keys, args=args)
+
+
+@cache
+def get_like_buffer() -> BaseLikeBuffer:
+    return load_backend(settings.LIKE_BUFFER)
+
+
+@receiver(setting_changed)
+def _reset_like_buffer(*, setting, **kwargs):
+    if setting == "LIKE_BUFFER":
+        get_like_buffer.cache_clear()
+
+
+def buffer_like(user_id: int, post_id: int, liked: bool, persisted: bool) -> bool:
+    """
+    Buffer a like (or unlike) and return whether it changes the state.
+    `persisted` is the state in the `Like` table, used when nothing is
+    buffered for the pair yet.
+    """
+    previous = get_like_buffer().set(user_id, post_id, liked)
+    if previous is None:
+        previous = persisted
+    return previous != liked
+
+
+def apply_like_states(states: list[LikeState]) -> None:
+    """
+    Write buffered states to the `Like` table: one bulk insert for likes
+    and one delete per post for unlikes.
+    """
+    # Skip likes of posts or users deleted since they were buffered.
+    live_posts = set(
+        Post.raw.filter(pk__in={post_id for _, post_id, _ in states}).values_list(
+            "id", flat=True
+        )
+    )
+    live_users = set(
+        User.objects.filter(pk__in={user_id for user_id, _, _ in states}).values_list(
+            "id", flat=True
+        )
+    )
+    Like.objects.bulk_create(
+        [
+            Like(user_id=user_id, post_id=post_id)
+            for user_id, post_id, liked in states
+            if liked and post_id in live_posts and user_id in live_users
+        ],
+        ignore_conflicts=True,
+    )
+    unliked = defaultdict(list)
+    for user_id, post_id, liked in states:
+        if not liked:
+            unliked[post_id].append(user_id)
+    for post_id, user_ids in unliked.items():
+        Like.objects.filter(post_id=post_id, user_id__in=user_ids).delete()
+
+
+def flush_likes(batch_size: int = FLUSH_BATCH_SIZE) -> int:
+    """
+    Apply every buffered state to the database. Returns the number of
+    states flushed.
+    """
+    buffer = get_like_buffer()
+    flushed = 0
+    while states := buffer.pending(batch_size):
+        post_ids = {post_id for _, post_id, _ in states}
+        with transaction.atomic():
+            apply_like_states(states)
+            Post.objects.sync_likes_count(post_ids)
+            for post_id in post_ids:
+                invalidate_tags(CacheKeys.post_tag(post_id))
+        buffer.ack(states)
+        flushed += len(states)
+    return flushed
@@ -0,0 +1,133 @@
+import asyncio
+import math
+import time
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import Follow, User
+from posts.models import Post, Report, Tag
+
+# Requests per reader token and minute, below the "user" throttle rate both
+# variants apply.
+REQUESTS_PER_READER = 100
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the throughput of the sync read views and their async "
+        "variants under concurrent requests, through Django's ASGI handler. "
+        "Fixture rows are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=200)
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=20)
+
+    def handle(self, *args, **options):
+        marker = uuid.uuid4().hex[:8]
+        try:
+            paths, tokens = self.create_fixtures(marker, options)
+            # AsyncClient always sends `Host: testserver`.
+            with override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]
+            ):
+                asyncio.run(self.compare(paths, tokens, options))
+        finally:
+            User.objects.filter(username__startswith=f"bench-{marker}").delete()
+            Tag.objects.filter(name__startswith=f"bench-{marker}").delete()
+
+    def create_fixtures(self, marker: str, options):
+        # Tokens are shared by the ten runs (five paths, sync and async).
+        readers_count = math.ceil(options["requests"] * 10 / REQUESTS_PER_READER)
+        author, *readers = User.objects.bulk_create(
+            User(username=f"bench-{marker}-{i}", email=f"bench-{marker}-{i}@x.com")
+            for i in range(readers_count + 1)
+        )
+        tags = Tag.objects.get_or_create_many(
+            [f"bench-{marker}-{i}" for i in range(10)]
+        )
+        posts = Post.objects.bulk_create(
+            Post(
+                author=author,
+                content=f"benchmark post {i} " * 20,
+                slug=f"bench-{marker}-{i}",
+                likes_count=i,
+            )
+            for i in range(options["posts"])
+        )
+        Post.tags.through.objects.bulk_create(
+            Post.tags.through(post_id=post.id, tag_id=tags[(i + j) % 10].id)
+            for i, post in enumerate(posts)
+            for j in range(3)
+        )
+        Follow.objects.bulk_create(
+            Follow(follower=reader, following=author) for reader in readers
+        )
+        Follow.objects.bulk_create(
+            Follow(follower=readers[0], following=reader) for reader in readers[1:]
+        )
+        Report.objects.bulk_create(
+            Report(reporter=reader, post=posts[0], reason=f"reason {i}")
+            for i, reader in enumerate(readers[:20])
+        )
+        paths = {
+            "post list": (reverse("post-list"), reverse("async-post-list")),
+            "post detail": (
+                reverse("post-detail", args=[posts[0].id]),
+                reverse("async-post-detail", args=[posts[0].id]),
+            ),
+            "followers": (
+                reverse("users-followers", args=[author.id]),
+                reverse("async-users-followers", args=[author.id]),
+            ),
+            "following": (
+                reverse("users-following", args=[readers[0].id]),
+                reverse("async-users-following", args=[readers[0].id]),
+            ),
+            "report summary": (
+                f"/api/posts/admin-reports/posts/{posts[0].id}/summary",
+                reverse("async-report-summary", args=[posts[0].id]),
+            ),
+        }
+        tokens = [f"Bearer {AccessToken.for_user(reader)}" for reader in readers]
+        return paths, tokens
+
+    async def compare(self, paths, tokens: list[str], options):
+        client = AsyncClient()
+        for name, (sync_url, async_url) in paths.items():
+            sync_rate = await self.run(client, sync_url, tokens, options)
+            async_rate = await self.run(client, async_url, tokens, options)
+            self.stdout.write(
+                f"{name:<15} sync={sync_rate:8.1f} req/s "
+                f"async={async_rate:8.1f} req/s "
+                f"speedup={async_rate / sync_rate:5.2f}x"
+            )
+
+    async def run(self, client: AsyncClient, url: str, tokens: list[str], options):
+        """
+        Requests per second for `url`, after one request to warm caches.
+        """
+        total, concurrency = options["requests"], options["concurrency"]
+        statuses = Counter()
+        pending = iter(range(total))
+
+        async def worker():
+            for i in pending:
+                headers = {"Authorization": tokens[i % len(tokens)]}
+                response = await client.get(url, headers=headers)
+                statuses[response.status_code] += 1
+
+        await client.get(url, headers={"Authorization": tokens[0]})
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        if set(statuses) != {200}:
+            self.stderr.write(f"{url}: unexpected statuses {dict(statuses)}")
+        return total / elapsed
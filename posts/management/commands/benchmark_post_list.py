@@ -0,0 +1,89 @@
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from accounts.models import User
+from posts.models import Post, Tag
+from posts.serializers import PostListReadSerializer, PostSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Time PostSerializer against PostListReadSerializer on list pages. "
+        "Fixture rows are created in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", nargs="+", type=int, default=[5, 50, 500])
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        sizes, repeat = options["sizes"], options["repeat"]
+        context = {
+            "request": Request(
+                APIRequestFactory().get("/api/posts/entries/", HTTP_HOST="localhost")
+            )
+        }
+        renderer = JSONRenderer()
+
+        with transaction.atomic():
+            queryset = self.create_fixtures(max(sizes))
+
+            def slow(size):
+                page = list(queryset.prefetch_related("tags")[:size])
+                return PostSerializer(page, many=True, context=context).data
+
+            def fast(size):
+                rows = PostListReadSerializer.get_rows(queryset)[:size]
+                return PostListReadSerializer(rows, context=context).data
+
+            for size in sizes:
+                if renderer.render(slow(size)) != renderer.render(fast(size)):
+                    self.stderr.write(f"Outputs differ at page size {size}")
+                slow_ms = self.time(slow, size, repeat)
+                fast_ms = self.time(fast, size, repeat)
+                self.stdout.write(
+                    f"page={size:<4} PostSerializer={slow_ms:8.2f}ms "
+                    f"PostListReadSerializer={fast_ms:8.2f}ms "
+                    f"speedup={slow_ms / fast_ms:5.1f}x"
+                )
+            transaction.set_rollback(True)
+
+    def create_fixtures(self, count: int):
+        marker = uuid.uuid4().hex[:8]
+        author = User.objects.create(
+            username=f"bench-{marker}", email=f"bench-{marker}@example.com"
+        )
+        tags = Tag.objects.get_or_create_many(
+            [f"bench-{marker}-{i}" for i in range(10)]
+        )
+        posts = Post.objects.bulk_create(
+            Post(
+                author=author,
+                content=f"benchmark post {i} " * 20,
+                slug=f"bench-{marker}-{i}",
+                image=f"posts/bench-{i}.jpg" if i % 2 else None,
+                likes_count=i,
+            )
+            for i in range(count)
+        )
+        Post.tags.through.objects.bulk_create(
+            Post.tags.through(post_id=post.id, tag_id=tags[(i + j) % 10].id)
+            for i, post in enumerate(posts)
+            for j in range(3)
+        )
+        return Post.objects.filter(author=author).order_by("-created_at", "-id")
+
+    def time(self, func, size: int, repeat: int) -> float:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(size)
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
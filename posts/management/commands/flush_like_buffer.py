@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.like_buffer import FLUSH_BATCH_SIZE, flush_likes
+
+
+class Command(BaseCommand):
+    help = "Write buffered likes and unlikes to the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=FLUSH_BATCH_SIZE,
+            help=f"Buffered states applied per transaction (default: {FLUSH_BATCH_SIZE}).",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            help="Keep running, flushing every this many seconds.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            flushed = flush_likes(options["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"Flushed {flushed} like(s)."))
+            if options["interval"] is None:
+                return
+            time.sleep(options["interval"])
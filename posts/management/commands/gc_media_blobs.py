@@ -0,0 +1,65 @@
+import os
+import time
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from accounts.models import Profile
+from common.renditions import get_specs, rendition_name
+from posts.models import Post
+
+# Models whose file field is backed by the content-addressed blob storage.
+BLOB_FIELDS = ((Post, "image"), (Profile, "avatar"))
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete content-addressed media blobs no Post.image or Profile.avatar "
+        "references anymore, along with their renditions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-hours",
+            type=float,
+            default=24,
+            help="Keep blobs written or reused within this many hours (default: 24).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report what would be deleted.",
+        )
+
+    def handle(self, *args, **options):
+        # Blobs of uploads whose row isn't committed yet look unreferenced,
+        # the grace period keeps them.
+        cutoff = time.time() - options["grace_hours"] * 3600
+        dry_run = options["dry_run"]
+        deleted = 0
+        for model, field_name in BLOB_FIELDS:
+            field = model._meta.get_field(field_name)
+            storage = field.storage  # type: ignore
+            referenced = set(
+                model.objects.exclude(**{field_name: ""})
+                .exclude(**{f"{field_name}__isnull": True})
+                .values_list(field_name, flat=True)
+                .distinct()
+            )
+            for name, modified in storage.iter_blobs(field.upload_to):  # type: ignore
+                if name in referenced or modified > cutoff:
+                    continue
+                deleted += 1
+                if dry_run:
+                    self.stdout.write(f"Would delete {name}")
+                    continue
+                storage.delete(name)
+                for spec_name in get_specs():
+                    default_storage.delete(rendition_name(name, spec_name))
+            if not dry_run:
+                for path, modified in storage.iter_staged():
+                    if modified <= cutoff:
+                        os.unlink(path)
+
+        verb = "Would delete" if dry_run else "Deleted"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {deleted} unreferenced blob(s)."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from posts.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index of posts from scratch."
+
+    def handle(self, *args, **options):
+        indexed = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} post(s)."))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = "Recompute Post.likes_count from the Like table for drifted posts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "post_ids",
+            nargs="*",
+            type=int,
+            help="Only reconcile these posts (default: all posts).",
+        )
+
+    def handle(self, *args, **options):
+        post_ids = options["post_ids"] or None
+        fixed = Post.objects.sync_likes_count(post_ids)
+        self.stdout.write(
+            self.style.SUCCESS(f"Reconciled likes_count on {fixed} post(s).")
+        )
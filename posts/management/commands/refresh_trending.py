@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from posts.trending import refresh_trending
+
+
+class Command(BaseCommand):
+    help = "Fold new likes into the trending posts ranking."
+
+    def handle(self, *args, **options):
+        ranking = refresh_trending()
+        self.stdout.write(self.style.SUCCESS(f"Ranked {len(ranking)} post(s)."))
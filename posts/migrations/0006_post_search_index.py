@@ -0,0 +1,40 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:12
+
+from django.db import migrations
+
+CREATE_INDEX = """
+CREATE VIRTUAL TABLE IF NOT EXISTS posts_post_fts
+USING fts5(content, slug, author, tokenize = 'unicode61 remove_diacritics 2')
+"""
+
+POPULATE_INDEX = """
+INSERT INTO posts_post_fts (rowid, content, slug, author)
+SELECT p.id, p.content, p.slug, u.username
+FROM posts_post p JOIN accounts_user u ON u.id = p.author_id
+"""
+
+
+def create_search_index(apps, schema_editor):
+    # FTS5 is SQLite specific; other backends fall back to SearchFilter.
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(CREATE_INDEX)
+    schema_editor.execute(POPULATE_INDEX)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS posts_post_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_follow'),
+        ('posts', '0005_post_likes_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-18 07:17
+
+import common.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_tag_ordering'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(
+                blank=True,
+                null=True,
+                storage=common.storage.blob_storage,
+                upload_to='posts',
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-18 07:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_alter_post_image'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='report',
+            index=models.Index(
+                fields=['status', 'post'], name='report_status_post_idx'
+            ),
+        ),
+    ]
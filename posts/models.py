@@ -3,16 +3,61 @@ from typing import TYPE_CHECKING, Iterable, Self
 
 from django.conf import settings
 from django.db import models
+from django.db.models import Count, Exists, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.db.models.signals import m2m_changed
 from django.utils import timezone
 
 from accounts.models import User
+from common.storage import blob_storage
 from common.utils import unique_slug
 
 
-class PostManager(models.Manager):
+class PostQuerySet(models.QuerySet):
+    def with_liked_by_me(self, user) -> Self:
+        """
+        Annotate `liked_by_me`: whether `user` liked each post, as one
+        EXISTS subquery for the whole queryset.
+        """
+        if not user.is_authenticated:
+            return self.annotate(liked_by_me=Value(False))
+        return self.annotate(
+            liked_by_me=Exists(
+                Like.objects.filter(post=OuterRef("pk"), user_id=user.id)
+            )
+        )
+
+
+class PostManager(models.Manager.from_queryset(PostQuerySet)):
     def get_queryset(self) -> models.QuerySet:
         return super().get_queryset().select_related("author")
 
+    def sync_likes_count(self, post_ids: Iterable[int] | None = None) -> int:
+        """
+        Rewrite the denormalized `likes_count` of every drifted post from the
+        `Like` table in a single UPDATE. Returns the number of fixed rows.
+        """
+        actual = Coalesce(
+            Subquery(
+                Like.objects.filter(post=OuterRef("pk"))
+                .order_by()
+                .values("post")
+                .annotate(total=Count("id"))
+                .values("total")
+            ),
+            0,
+        )
+        qs = super().get_queryset().annotate(actual_likes=actual)
+        if post_ids is not None:
+            qs = qs.filter(pk__in=post_ids)
+        drifted = qs.exclude(likes_count=F("actual_likes")).values("pk")
+        return (
+            super()
+            .get_queryset()
+            .filter(pk__in=Subquery(drifted))
+            .update(likes_count=actual)
+        )
+
 
 class Post(models.Model):
     id: int
@@ -20,11 +65,14 @@ class Post(models.Model):
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="posts"
     )
     content = models.TextField()
-    image = models.ImageField(upload_to="posts", blank=True, null=True)
+    image = models.ImageField(
+        upload_to="posts", storage=blob_storage, blank=True, null=True
+    )
     slug = models.SlugField(max_length=255, unique=True, blank=True)
     published = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
+    likes_count = models.PositiveIntegerField(default=0)
     objects = PostManager()
     raw = models.Manager()
     tags = models.ManyToManyField("Tag", related_name="posts", blank=True)
@@ -32,6 +80,39 @@ class Post(models.Model):
     class Meta:
         ordering = ("-created_at",)
 
+    def set_tags(self, tags: Iterable["Tag"]) -> None:
+        """
+        Make `tags` the post's tag set, touching only the through rows that
+        actually change.
+        """
+        through = Post.tags.through
+        wanted = {tag.id for tag in tags}
+        current = set(
+            through.objects.filter(post_id=self.id).values_list("tag_id", flat=True)
+        )
+        if stale := current - wanted:
+            through.objects.filter(post_id=self.id, tag_id__in=stale).delete()
+            self._send_tags_changed("post_remove", stale)
+        if added := wanted - current:
+            through.objects.bulk_create(
+                [through(post_id=self.id, tag_id=tag_id) for tag_id in added],
+                ignore_conflicts=True,
+            )
+            self._send_tags_changed("post_add", added)
+        getattr(self, "_prefetched_objects_cache", {}).pop("tags", None)
+
+    def _send_tags_changed(self, action: str, pk_set: set[int]) -> None:
+        # Bulk through-table writes skip m2m_changed; keep receivers informed.
+        m2m_changed.send(
+            sender=Post.tags.through,
+            instance=self,
+            action=action,
+            reverse=False,
+            model=Tag,
+            pk_set=pk_set,
+            using=self._state.db,
+        )
+
     def save(self, *args, **kwargs) -> None:
         if not self.slug:
             self.slug = unique_slug(
@@ -43,11 +124,33 @@ class Post(models.Model):
         return f"post {self.id} by {self.author.username}"
 
 
+class TagQuerySet(models.QuerySet):
+    def get_or_create_many(self, names: Iterable[str]) -> list["Tag"]:
+        """
+        Resolve tag names to tags, creating the missing ones in one INSERT.
+        """
+        names = list(dict.fromkeys(names))
+        if not names:
+            return []
+        tags = {tag.name: tag for tag in self.filter(name__in=names)}
+        missing = [name for name in names if name not in tags]
+        if missing:
+            self.bulk_create(
+                [Tag(name=name) for name in missing], ignore_conflicts=True
+            )
+            tags.update((tag.name, tag) for tag in self.filter(name__in=missing))
+        return [tags[name] for name in names]
+
+
 class Tag(models.Model):
     id: int
     name = models.CharField(max_length=100, unique=True, null=False)
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
+    objects = TagQuerySet.as_manager()
+
+    class Meta:
+        ordering = ("name",)
 
     def __str__(self) -> str:
         return self.name
@@ -98,6 +201,10 @@ class Report(models.Model):
                 fields=["reporter", "post"], name="unique_report_per_user_per_post"
             )
         ]
+        indexes = [
+            # The moderation queue: pending reports grouped by post.
+            models.Index(fields=["status", "post"], name="report_status_post_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"Report by {self.reporter_id} on post {self.post_id}"  # type: ignore
@@ -0,0 +1,99 @@
+from django.db import transaction
+from django.db.models import Count, Max, Q, QuerySet
+
+from common.cache import invalidate_tags
+from common.cache_keys import CacheKeys
+from posts.models import Post, Report
+from posts.types import ReportSummaryInput
+
+
+def get_report_summary(post_id: int) -> ReportSummaryInput | None:
+    """
+    Summarize the pending reports of a post: one aggregate query over the
+    post and its reports, plus one fetch of the pending reasons. Returns
+    None if the post doesn't exist.
+    """
+    row = summary_row(post_id).first()
+    if row is None:
+        return None
+    return build_summary(row, list(pending_reasons(post_id)))
+
+
+async def aget_report_summary(post_id: int) -> ReportSummaryInput | None:
+    row = await summary_row(post_id).afirst()
+    if row is None:
+        return None
+    return build_summary(row, [reason async for reason in pending_reasons(post_id)])
+
+
+def summary_row(post_id: int) -> QuerySet:
+    pending = Q(reports__status=Report.Status.PENDING)
+    return (
+        Post.raw.filter(pk=post_id)
+        .values("id", "author__username", "content")
+        .annotate(
+            reports_count=Count("reports", filter=pending),
+            last_reported_at=Max("reports__created_at", filter=pending),
+            action_taken_count=Count(
+                "reports", filter=Q(reports__status=Report.Status.ACTION_TAKEN)
+            ),
+        )
+    )
+
+
+def pending_reasons(post_id: int) -> QuerySet:
+    return (
+        Report.objects.filter(post_id=post_id, status=Report.Status.PENDING)
+        .values_list("reason", flat=True)
+        .order_by("id")
+    )
+
+
+def build_summary(row: dict, reasons: list[str]) -> ReportSummaryInput:
+    return {
+        "post_id": row["id"],
+        "post_author": row["author__username"],
+        "post_content": row["content"],
+        "reports_count": row["reports_count"],
+        "report_reasons": reasons,
+        "last_reported_at": row["last_reported_at"],
+        "is_action_taken": row["action_taken_count"] > 0,
+    }
+
+
+def moderation_queue() -> QuerySet:
+    """
+    Pending reports grouped by post, one row per post with its report
+    count. Served by the `(status, post)` index.
+    """
+    return (
+        Report.objects.filter(status=Report.Status.PENDING)
+        .values("post")
+        .annotate(reports_count=Count("id"), last_reported_at=Max("created_at"))
+        .order_by()
+    )
+
+
+def moderate_reports(
+    status: str,
+    ids: list[int] | None = None,
+    post_id: int | None = None,
+    current_status: str | None = None,
+) -> int:
+    """
+    Set `status` on every report matching all the given selectors with a
+    single UPDATE. Returns the number of changed reports.
+    """
+    reports = Report.objects.exclude(status=status)
+    if ids is not None:
+        reports = reports.filter(pk__in=ids)
+    if post_id is not None:
+        reports = reports.filter(post_id=post_id)
+    if current_status is not None:
+        reports = reports.filter(status=current_status)
+    with transaction.atomic():
+        # `update()` sends no signals, so summaries are invalidated here.
+        post_ids = list(reports.values_list("post_id", flat=True).distinct())
+        updated = reports.update(status=status)
+        invalidate_tags(*(CacheKeys.reports_tag(pk) for pk in post_ids))
+    return updated
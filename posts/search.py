@@ -0,0 +1,126 @@
+import re
+
+from django.db import connections, router
+from django.db.models import FloatField, QuerySet
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+
+from posts.models import Post
+
+SEARCH_TABLE = "posts_post_fts"
+
+# Per-database memo of whether the FTS5 index exists.
+_index_available: dict[str, bool] = {}
+
+
+def search_index_available(using: str | None = None) -> bool:
+    using = using or router.db_for_read(Post)
+    if using not in _index_available:
+        connection = connections[using]
+        _index_available[using] = (
+            connection.vendor == "sqlite"
+            and SEARCH_TABLE in connection.introspection.table_names()
+        )
+    return _index_available[using]
+
+
+def build_match_query(text: str) -> str | None:
+    """
+    Turn free text into an FTS5 query: every word must match, as a prefix.
+    Words are quoted so user input can't inject FTS5 syntax.
+    """
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def index_post(post: Post) -> None:
+    using = router.db_for_write(Post)
+    if not search_index_available(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [post.id])
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, content, slug, author)"
+            " VALUES (%s, %s, %s, %s)",
+            [post.id, post.content, post.slug, post.author.username],
+        )
+
+
+def unindex_post(post_id: int) -> None:
+    using = router.db_for_write(Post)
+    if not search_index_available(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [post_id])
+
+
+def reindex_author(user_id: int, username: str) -> None:
+    """
+    Rewrite the author column of every post by `user_id` after a rename.
+    """
+    using = router.db_for_write(Post)
+    if not search_index_available(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {SEARCH_TABLE} SET author = %s WHERE rowid IN"
+            f" (SELECT id FROM {Post._meta.db_table} WHERE author_id = %s)",
+            [username, user_id],
+        )
+
+
+def rebuild_index() -> int:
+    using = router.db_for_write(Post)
+    if not search_index_available(using):
+        return 0
+    post_table = Post._meta.db_table
+    user_table = Post._meta.get_field("author").related_model._meta.db_table  # type: ignore
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, content, slug, author)"
+            f" SELECT p.id, p.content, p.slug, u.username FROM {post_table} p"
+            f" JOIN {user_table} u ON u.id = p.author_id"
+        )
+        return cursor.rowcount
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    `?search=` backed by the FTS5 index instead of `icontains` scans.
+
+    Matches are annotated with `search_rank` (bm25, lower is better) and,
+    unless the client asked for an explicit `?ordering=`, returned best
+    match first. Put it after `OrderingFilter` in `filter_backends`. Falls
+    back to the regular `SearchFilter` over `search_fields` when the index
+    is not available (e.g. on a non-SQLite database).
+    """
+
+    rank_field = "search_rank"
+
+    def filter_queryset(self, request, queryset: QuerySet, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        match = build_match_query(" ".join(terms))
+        if match is None or not search_index_available(queryset.db):
+            return super().filter_queryset(request, queryset, view)
+
+        rowid = f'{queryset.model._meta.db_table}."id"'
+        matches = RawSQL(
+            f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s",
+            (match,),
+        )
+        rank = RawSQL(
+            f"SELECT bm25({SEARCH_TABLE}) FROM {SEARCH_TABLE}"
+            f" WHERE {SEARCH_TABLE} MATCH %s AND rowid = {rowid}",
+            (match,),
+            output_field=FloatField(),
+        )
+        queryset = queryset.filter(pk__in=matches).annotate(**{self.rank_field: rank})
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            queryset = queryset.order_by(self.rank_field, "id")
+        return queryset
@@ -1,16 +1,20 @@
-from datetime import datetime
-from typing import Optional, Required
+from collections import defaultdict
+from functools import cached_property
+from typing import Any, Required
 
+from django.db import transaction
+from django.db.models import QuerySet
 from rest_framework import serializers
 
+from common.renditions import rendition_urls
+from common.serializers import SparseFieldsetsMixin
 from posts.models import Like, Post, Report, Tag
-from posts.types import ReportSummaryInput
 
 MAX_IMAGE_SIZE = 5 * 1024 * 1024  # 5 MB
 ALLOWED_CONTENT_TYPES = ("image/jpeg", "image/png", "image/webp")
 
 
-class PostSerializer(serializers.ModelSerializer):
+class PostSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     author = serializers.StringRelatedField(read_only=True)
     tags = serializers.SlugRelatedField(
         read_only=True,
@@ -27,24 +31,29 @@ class PostSerializer(serializers.ModelSerializer):
         allow_null=True,
         allow_empty_file=True,
     )
-    likes_count = serializers.IntegerField(source="likes.count", read_only=True)
+    image_renditions = serializers.SerializerMethodField()
+    likes_count = serializers.IntegerField(read_only=True)
+    # Annotated by `Post.objects.with_liked_by_me()`.
+    liked_by_me = serializers.BooleanField(read_only=True, default=False)
+
+    def get_image_renditions(self, obj: Post) -> dict[str, str] | None:
+        return rendition_urls(obj.image.name, self.context.get("request"))
 
     def create(self, validated_data):
         tags_data = validated_data.pop("tags_input", [])
-        post = Post.objects.create(**validated_data)
-        for tag_name in tags_data:
-            tag, _ = Tag.objects.get_or_create(name=tag_name)
-            post.tags.add(tag)
+        with transaction.atomic():
+            post = Post.objects.create(**validated_data)
+            if tags_data:
+                post.set_tags(Tag.objects.get_or_create_many(tags_data))
         return post
 
     def update(self, instance: Post, validated_data):
-        tags_data = validated_data.pop("tags_input", [])
-        instance = super().update(instance, validated_data)
-        if tags_data is not None:
-            instance.tags.clear()
-            for tag_name in tags_data:
-                tag, _ = Tag.objects.get_or_create(name=tag_name)
-                instance.tags.add(tag)
+        # Tags are only touched when `tags_input` is sent.
+        tags_data = validated_data.pop("tags_input", None)
+        with transaction.atomic():
+            instance = super().update(instance, validated_data)
+            if tags_data is not None:
+                instance.set_tags(Tag.objects.get_or_create_many(tags_data))
         return instance
 
     class Meta:
@@ -56,12 +65,20 @@ class PostSerializer(serializers.ModelSerializer):
             "author",
             "content",
             "image",
+            "image_renditions",
             "slug",
             "likes_count",
+            "liked_by_me",
             "created_at",
             "updated_at",
         )
         read_only_fields = ("id", "slug", "created_at", "updated_at", "tags")
+        sparse_sources = {
+            "author": ("author__username", "author__email"),
+            "tags": (),
+            "image_renditions": ("image",),
+            "liked_by_me": (),
+        }
 
     def validate_image(self, value):
         if not value:
@@ -73,6 +90,120 @@ class PostSerializer(serializers.ModelSerializer):
         return value
 
 
+class PostListReadSerializer:
+    """
+    Read-only fast path for `PostSerializer(many=True)` on list pages.
+
+    Builds the same payload from `values()` rows plus one query for the tags
+    of the whole page, skipping per-object DRF field machinery. The output
+    must stay byte-identical to `PostSerializer`.
+    """
+
+    # Output field -> columns it is rendered from, in output order.
+    columns = {
+        "id": ("id",),
+        "tags": (),
+        "author": ("author__username", "author__email"),
+        "content": ("content",),
+        "image": ("image",),
+        "image_renditions": ("image",),
+        "slug": ("slug",),
+        "likes_count": ("likes_count",),
+        # An annotation when present, kept by `get_rows` like all others.
+        "liked_by_me": (),
+        "created_at": ("created_at",),
+        "updated_at": ("updated_at",),
+    }
+    datetime_field = serializers.DateTimeField()
+
+    def __init__(
+        self,
+        rows,
+        context: dict[str, Any] | None = None,
+        fields: list[str] | None = None,
+    ) -> None:
+        self.rows = list(rows)
+        self.context = context or {}
+        self.fields = self.select(fields)
+
+    @classmethod
+    def select(cls, fields: list[str] | None) -> list[str]:
+        return [name for name in cls.columns if fields is None or name in fields]
+
+    @classmethod
+    def get_rows(cls, queryset: QuerySet, fields: list[str] | None = None) -> QuerySet:
+        """
+        Narrow `queryset` to the columns of `fields`. The id, the ordering
+        columns and annotations (e.g. search_rank) are always kept for the
+        paginator.
+        """
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        paths = ["id"]
+        paths += [path for name in cls.select(fields) for path in cls.columns[name]]
+        paths += [name.lstrip("-") for name in ordering if isinstance(name, str)]
+        paths += queryset.query.annotations
+        return queryset.prefetch_related(None).values(*dict.fromkeys(paths))
+
+    def tags_query(self) -> QuerySet:
+        return (
+            Post.tags.through.objects.filter(post_id__in=[r["id"] for r in self.rows])
+            .order_by("tag__name")
+            .values_list("post_id", "tag__name")
+        )
+
+    @staticmethod
+    def group_tags(rows) -> dict[int, list[str]]:
+        tags = defaultdict(list)
+        for post_id, name in rows:
+            tags[post_id].append(name)
+        return tags
+
+    @cached_property
+    def tags(self) -> dict[int, list[str]]:
+        return self.group_tags(self.tags_query())
+
+    async def aload_tags(self) -> None:
+        """
+        Load `tags` with an async query, for async views.
+        """
+        if "tags" in self.fields:
+            self.tags = self.group_tags([row async for row in self.tags_query()])
+
+    @property
+    def signature(self):
+        """
+        Everything the payload is built from, minus building it.
+        """
+        return (self.rows, self.tags if "tags" in self.fields else None)
+
+    def image_url(self, name: str | None) -> str | None:
+        if not name:
+            return None
+        url = Post._meta.get_field("image").storage.url(name)  # type: ignore
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request is not None else url
+
+    @property
+    def data(self) -> list[dict[str, Any]]:
+        to_datetime = self.datetime_field.to_representation
+        render = {
+            "id": lambda row: row["id"],
+            "tags": lambda row: self.tags.get(row["id"], []),
+            "author": lambda row: row["author__username"] or row["author__email"],
+            "content": lambda row: row["content"],
+            "image": lambda row: self.image_url(row["image"]),
+            "image_renditions": lambda row: rendition_urls(
+                row["image"], self.context.get("request")
+            ),
+            "slug": lambda row: row["slug"],
+            "likes_count": lambda row: row["likes_count"],
+            "liked_by_me": lambda row: row.get("liked_by_me", False),
+            "created_at": lambda row: to_datetime(row["created_at"]),
+            "updated_at": lambda row: to_datetime(row["updated_at"]),
+        }
+        return [{name: render[name](row) for name in self.fields} for row in self.rows]
+
+
 class LikeSerializer(serializers.ModelSerializer):
     class Meta:
         model = Like
@@ -90,29 +221,10 @@ class ReportSummarySerializer(serializers.Serializer):
     post_id = serializers.IntegerField()
     post_author = serializers.CharField()
     post_content = serializers.CharField()
-    reports_count = serializers.SerializerMethodField()
-    report_reasons = serializers.SerializerMethodField()
-    last_reported_at = serializers.SerializerMethodField()
-    is_action_taken = serializers.SerializerMethodField()
-
-    def get_is_action_taken(self, obj: ReportSummaryInput) -> bool:
-        return obj["reports"].filter(status=Report.Status.ACTION_TAKEN).exists()
-
-    def get_reports_count(self, obj: ReportSummaryInput) -> int:
-        return obj["reports"].count()
-
-    def get_report_reasons(self, obj: ReportSummaryInput) -> list[str]:
-        # return [report.reason for report in obj["reports"]]
-        return list(obj["reports"].values_list("reason", flat=True))
-
-    def get_last_reported_at(self, obj: ReportSummaryInput) -> Optional[datetime]:
-        latest = obj["reports"].order_by("-created_at").first()
-        return latest.created_at if latest else None
-
-    def to_representation(self, instance: ReportSummaryInput):
-        data = super().to_representation(instance)
-        data["reports_count"] = len(data["report_reasons"])
-        return data
+    reports_count = serializers.IntegerField()
+    report_reasons = serializers.ListField(child=serializers.CharField())
+    last_reported_at = serializers.DateTimeField(allow_null=True)
+    is_action_taken = serializers.BooleanField()
 
 
 class ReportModerationSerializer(serializers.Serializer):
@@ -123,3 +235,28 @@ class ReportModerationSerializer(serializers.Serializer):
         instance.status = status
         instance.save(update_fields=["status"])
         return instance
+
+
+class ReportBulkModerationSerializer(serializers.Serializer):
+    status = serializers.ChoiceField(Report.Status.choices)
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        allow_empty=False,
+        max_length=10000,
+    )
+    post = serializers.IntegerField(required=False)
+    current_status = serializers.ChoiceField(Report.Status.choices, required=False)
+
+    def validate(self, attrs):
+        if not {"ids", "post", "current_status"} & set(attrs):
+            raise serializers.ValidationError(
+                "Select reports by ids, post or current_status."
+            )
+        return attrs
+
+
+class ModerationQueueSerializer(serializers.Serializer):
+    post = serializers.IntegerField()
+    reports_count = serializers.IntegerField()
+    last_reported_at = serializers.DateTimeField()
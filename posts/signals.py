@@ -0,0 +1,152 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+
+from accounts.models import Follow, User
+from common.cache import invalidate_tags
+from common.cache_keys import CacheKeys
+from common.renditions import schedule_renditions
+from posts import search, timeline
+from posts.models import Like, Post, Report, Tag
+
+
+@receiver(post_save, sender=Post)
+def fan_out_new_post(sender, instance: Post, created, **kwargs):
+    if created:
+        transaction.on_commit(
+            partial(
+                timeline.fan_out_post,
+                instance.id,
+                instance.author_id,  # type: ignore
+                instance.created_at.timestamp(),
+            )
+        )
+
+
+@receiver(post_save, sender=Post)
+def index_saved_post(sender, instance: Post, **kwargs):
+    search.index_post(instance)
+
+
+@receiver(post_save, sender=User)
+def reindex_renamed_author(sender, instance: User, created, update_fields, **kwargs):
+    if not created and instance.username_changed(update_fields):
+        search.reindex_author(instance.id, instance.username)
+
+
+@receiver(post_save, sender=Post)
+def render_post_image(sender, instance: Post, **kwargs):
+    schedule_renditions(instance.image.name)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_deleted_post(sender, instance: Post, **kwargs):
+    search.unindex_post(instance.id)
+
+
+@receiver(post_migrate)
+def reset_search_index_state(sender, **kwargs):
+    search._index_available.clear()
+
+
+@receiver(post_delete, sender=Post)
+def retract_deleted_post(sender, instance: Post, **kwargs):
+    transaction.on_commit(
+        partial(timeline.retract_post, instance.id, instance.author_id)  # type: ignore
+    )
+
+
+@receiver(post_save, sender=Follow)
+def backfill_timeline(sender, instance: Follow, created, **kwargs):
+    if created:
+        transaction.on_commit(
+            partial(
+                timeline.backfill_follow,
+                instance.follower_id,  # type: ignore
+                instance.following_id,  # type: ignore
+            )
+        )
+
+
+@receiver(post_delete, sender=Follow)
+def prune_timeline(sender, instance: Follow, **kwargs):
+    transaction.on_commit(
+        partial(
+            timeline.prune_follow,
+            instance.follower_id,  # type: ignore
+            instance.following_id,  # type: ignore
+        )
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_cached_post(sender, instance: Post, **kwargs):
+    invalidate_tags(CacheKeys.post_tag(instance.id))
+
+
+@receiver(post_save, sender=Report)
+@receiver(post_delete, sender=Report)
+def invalidate_report_summary_on_report_change(sender, instance: Report, **kwargs):
+    invalidate_tags(CacheKeys.reports_tag(instance.post_id))  # type: ignore
+
+
+@receiver(post_save, sender=Like)
+@receiver(post_delete, sender=Like)
+def invalidate_liked_post(sender, instance: Like, **kwargs):
+    invalidate_tags(CacheKeys.post_tag(instance.post_id))  # type: ignore
+
+
+def invalidate_posts(post_ids) -> None:
+    invalidate_tags(*(CacheKeys.post_tag(post_id) for post_id in post_ids))
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def invalidate_retagged_post(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == "pre_clear":
+        # tag.posts.clear() provides no pk_set and the rows are gone by
+        # post_clear, so remember the posts before they are unlinked.
+        instance._cleared_post_ids = list(instance.posts.values_list("id", flat=True))
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        invalidate_posts([instance.id])
+    elif action == "post_clear":
+        invalidate_posts(instance.__dict__.pop("_cleared_post_ids", []))
+    else:
+        invalidate_posts(pk_set or [])
+
+
+@receiver(post_save, sender=Tag)
+def invalidate_renamed_tag(sender, instance: Tag, created, **kwargs):
+    if not created:
+        invalidate_posts(instance.posts.values_list("id", flat=True))
+
+
+@receiver(pre_delete, sender=Tag)
+def remember_deleted_tag_posts(sender, instance: Tag, **kwargs):
+    # The through rows are cascaded away without an m2m_changed signal.
+    instance._deleted_post_ids = list(instance.posts.values_list("id", flat=True))
+
+
+@receiver(post_delete, sender=Tag)
+def invalidate_deleted_tag(sender, instance: Tag, **kwargs):
+    invalidate_posts(instance.__dict__.pop("_deleted_post_ids", []))
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_posts(sender, instance: User, created, update_fields, **kwargs):
+    # Post payloads and report summaries embed the author's name, and
+    # nothing else of the user.
+    if created or not instance.username_changed(update_fields):
+        return
+    invalidate_posts(Post.raw.filter(author=instance).values_list("id", flat=True))
@@ -0,0 +1,169 @@
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework.throttling import UserRateThrottle
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import Follow, User
+from posts.models import Like, Post, Report, Tag
+
+
+class AsyncViewTests(APITestCase):
+    """
+    The async views answer like the sync ones they mirror.
+    """
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="user1", email="user1@test.com", password="password123"
+        )
+        self.other_user = User.objects.create_user(
+            username="user2", email="user2@test.com", password="password123"
+        )
+        self.posts = [
+            Post.objects.create(author=self.other_user, content=f"post {i}")
+            for i in range(7)
+        ]
+        self.posts[0].set_tags(Tag.objects.get_or_create_many(["django", "async"]))
+        Like.objects.create(user=self.user, post=self.posts[0])
+        Follow.objects.create(follower=self.user, following=self.other_user)
+        self.auth = f"Bearer {AccessToken.for_user(self.user)}"
+        self.client.credentials(HTTP_AUTHORIZATION=self.auth)  # type: ignore
+        return super().setUp()
+
+    async def get_both(self, sync_url: str, async_url: str, **headers):
+        sync_res = await sync_to_async(self.client.get)(sync_url)
+        async_res = await self.async_client.get(
+            async_url, headers={"Authorization": self.auth, **headers}
+        )
+        return sync_res, async_res
+
+    async def test_post_list_matches_sync_view(self):
+        for query in ["", "?fields=id,tags", "?tags__name=django", "?ordering=id"]:
+            sync_res, async_res = await self.get_both(
+                reverse("post-list") + query, reverse("async-post-list") + query
+            )
+            self.assertEqual(async_res.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                async_res.json()["results"], sync_res.json()["results"]  # type: ignore
+            )
+
+    async def test_post_list_follows_cursor(self):
+        url = reverse("async-post-list")
+        first = (await self.async_client.get(url)).json()
+        second = (await self.async_client.get(first["next"])).json()
+        ids = [post["id"] for post in first["results"] + second["results"]]
+        self.assertEqual(ids, [post.id for post in reversed(self.posts)])
+
+    async def test_post_detail_matches_sync_view(self):
+        post = self.posts[0]
+        sync_res, async_res = await self.get_both(
+            reverse("post-detail", args=[post.id]),
+            reverse("async-post-detail", args=[post.id]),
+        )
+        self.assertEqual(async_res.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_res.json(), sync_res.json())  # type: ignore
+        self.assertTrue(async_res.json()["liked_by_me"])
+
+    async def test_post_detail_is_cached(self):
+        url = reverse("async-post-detail", args=[self.posts[1].id])
+        await self.async_client.get(url)
+        # A queryset update sends no signal, so the entry stays valid.
+        await Post.objects.filter(pk=self.posts[1].id).aupdate(content="changed")
+        res = await self.async_client.get(url)
+        self.assertEqual(res.json()["content"], "post 1")
+
+    async def test_post_detail_not_found(self):
+        res = await self.async_client.get(reverse("async-post-detail", args=[0]))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_post_detail_answers_not_modified(self):
+        url = reverse("async-post-detail", args=[self.posts[0].id])
+        headers = {"Authorization": self.auth}
+        etag = (await self.async_client.get(url, headers=headers))["ETag"]
+        res = await self.async_client.get(
+            url, headers={**headers, "If-None-Match": etag}
+        )
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_follow_lists_match_sync_views(self):
+        for name, user in [("followers", self.other_user), ("following", self.user)]:
+            sync_res, async_res = await self.get_both(
+                reverse(f"users-{name}", args=[user.id]),
+                reverse(f"async-users-{name}", args=[user.id]),
+            )
+            self.assertEqual(async_res.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                async_res.json()["results"], sync_res.json()["results"]  # type: ignore
+            )
+
+    async def test_follow_lists_sparse_fields_across_pages(self):
+        for i in range(6):
+            follower = await User.objects.acreate(
+                username=f"follower{i}", email=f"follower{i}@test.com"
+            )
+            await Follow.objects.acreate(follower=follower, following=self.other_user)
+        url = reverse("async-users-followers", args=[self.other_user.id])
+        headers = {"Authorization": self.auth}
+        for fields in ["id", "follower_username"]:
+            first = await self.async_client.get(
+                f"{url}?fields={fields}", headers=headers
+            )
+            self.assertEqual(first.status_code, status.HTTP_200_OK)
+            second = await self.async_client.get(first.json()["next"], headers=headers)
+            results = first.json()["results"] + second.json()["results"]
+            self.assertEqual(len(results), 7)
+            self.assertEqual(list(results[0]), [fields])
+
+    async def test_follow_lists_require_authentication(self):
+        url = reverse("async-users-followers", args=[self.other_user.id])
+        res = await self.async_client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("WWW-Authenticate", res)
+
+    async def test_follow_lists_unknown_user(self):
+        res = await self.async_client.get(
+            reverse("async-users-followers", args=[0]),
+            headers={"Authorization": self.auth},
+        )
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_report_summary_matches_sync_view(self):
+        post = self.posts[2]
+        await Report.objects.acreate(post=post, reporter=self.user, reason="spam")
+        sync_res, async_res = await self.get_both(
+            f"/api/posts/admin-reports/posts/{post.id}/summary",
+            reverse("async-report-summary", args=[post.id]),
+        )
+        self.assertEqual(async_res.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_res.json(), sync_res.json())  # type: ignore
+        self.assertEqual(async_res.json()["report_reasons"], ["spam"])
+
+    async def test_report_summary_not_found(self):
+        res = await self.async_client.get(
+            reverse("async-report-summary", args=[0]),
+            headers={"Authorization": self.auth},
+        )
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    @mock.patch.object(UserRateThrottle, "THROTTLE_RATES", {"user": "2/minute"})
+    async def test_requests_are_throttled(self):
+        url = reverse("async-post-list")
+        headers = {"Authorization": self.auth}
+        for _ in range(2):
+            res = await self.async_client.get(url, headers=headers)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+        res = await self.async_client.get(url, headers=headers)
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", res)
+
+    async def test_unsupported_method(self):
+        res = await self.async_client.post(
+            reverse("async-post-list"), headers={"Authorization": self.auth}
+        )
+        self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
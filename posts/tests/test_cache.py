@@ -0,0 +1,145 @@
+import threading
+import time
+
+from asgiref.sync import async_to_sync
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+
+from common.cache import CacheEntry, invalidate_tags, resolve_key, should_recompute
+from common.cache_keys import CacheKeys
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "common.cache.TwoTierCache",
+            "OPTIONS": {"L2": "shared", "MAX_ENTRIES": 2, "L1_TIMEOUT": 60},
+        },
+        "shared": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }
+)
+class TwoTierCacheTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.cache = caches["default"]
+        self.shared = caches["shared"]
+        self.cache.clear()
+        return super().setUp()
+
+    def test_reads_fill_the_l1(self):
+        before = self.cache.get_stats()
+        self.shared.set("a", 1)
+        self.assertEqual(self.cache.get("a"), 1)
+        # Served from the L1 even though the L2 changed.
+        self.shared.set("a", 2)
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertIsNone(self.cache.get("missing"))
+        stats = self.cache.get_stats()
+        self.assertEqual(
+            {name: stats[name] - before[name] for name in stats},
+            {"l1_hits": 1, "l2_hits": 1, "misses": 1, "recomputes": 0},
+        )
+
+    def test_l1_is_bounded_lru(self):
+        for key in "abc":
+            self.cache.set(key, key)
+        self.shared.clear()
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.get("c"), "c")
+
+    def test_version_keys_bypass_l1(self):
+        key = CacheKeys.tag_version(CacheKeys.post_tag(1))
+        self.cache.set(key, 1)
+        self.cache.incr(key)
+        self.shared.set(key, 5)
+        self.assertEqual(self.cache.get(key), 5)
+
+    def test_get_or_set_waits_for_the_recomputing_caller(self):
+        self.shared.add(CacheKeys.single_flight("summary"), True)
+        threading.Timer(0.1, self.shared.set, ["summary", "theirs"]).start()
+        value = self.cache.get_or_set("summary", lambda: "ours")
+        self.assertEqual(value, "theirs")
+
+    def run_holding_lock(self, key: str, default) -> threading.Thread:
+        """
+        Run `get_or_set(key, default)` in a thread, returning once it holds
+        the single-flight lock.
+        """
+        started = threading.Event()
+
+        def hold():
+            started.set()
+            time.sleep(0.1)
+            return default()
+
+        def run():
+            try:
+                self.cache.get_or_set(key, hold)
+            except RuntimeError:
+                pass
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        started.wait()
+        return thread
+
+    def test_waiters_take_over_when_nothing_is_cached(self):
+        def fail():
+            raise RuntimeError
+
+        for default in [lambda: None, fail]:
+            thread = self.run_holding_lock("summary", default)
+            start = time.monotonic()
+            value = self.cache.get_or_set("summary", lambda: "ours")
+            thread.join()
+            self.assertEqual(value, "ours")
+            self.assertLess(time.monotonic() - start, 1)
+            self.cache.delete("summary")
+
+    def test_async_waiters_take_over_when_the_lock_is_released(self):
+        lock = CacheKeys.single_flight("summary")
+        self.shared.add(lock, True)
+        threading.Timer(0.1, self.shared.delete, [lock]).start()
+        start = time.monotonic()
+        value = async_to_sync(self.cache.aget_or_set)("summary", lambda: "ours")
+        self.assertEqual(value, "ours")
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_get_or_set_recomputes_once(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return "value"
+
+        self.assertEqual(self.cache.get_or_set("key", build, timeout=3600), "value")
+        self.assertEqual(self.cache.get_or_set("key", build, timeout=3600), "value")
+        self.assertEqual(self.cache.get("key"), "value")
+        self.assertEqual(len(calls), 1)
+        self.assertIsNone(self.cache.get_or_set("none", lambda: None))
+        self.assertFalse(self.cache.has_key("none"))
+
+    def test_early_expiry(self):
+        now = time.time()
+        self.assertTrue(should_recompute(CacheEntry("v", 0.1, now - 1)))
+        self.assertFalse(should_recompute(CacheEntry("v", 0.1, now + 3600)))
+        self.assertFalse(should_recompute(CacheEntry("v", 0.1, None)))
+
+
+class TagTests(SimpleTestCase):
+    def test_invalidating_a_tag_changes_every_dependent_key(self):
+        detail = CacheKeys.post_detail(1)
+        summary = CacheKeys.report_summary(1)
+        other = CacheKeys.post_detail(2)
+        before = [resolve_key(key) for key in (detail, summary, other)]
+        invalidate_tags(CacheKeys.post_tag(1))
+        after = [resolve_key(key) for key in (detail, summary, other)]
+        self.assertNotEqual(after[0], before[0])
+        self.assertNotEqual(after[1], before[1])
+        self.assertEqual(after[2], before[2])
+
+    def test_reports_tag_leaves_post_detail_alone(self):
+        detail = resolve_key(CacheKeys.post_detail(1))
+        summary = resolve_key(CacheKeys.report_summary(1))
+        invalidate_tags(CacheKeys.reports_tag(1))
+        self.assertEqual(resolve_key(CacheKeys.post_detail(1)), detail)
+        self.assertNotEqual(resolve_key(CacheKeys.report_summary(1)), summary)
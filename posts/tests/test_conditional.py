@@ -0,0 +1,48 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from posts.models import Post
+
+
+class PostConditionalGetTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="user1", email="user1@test.com", password="password123"
+        )
+        self.other_user = User.objects.create_user(
+            username="user2", email="user2@test.com", password="password123"
+        )
+        self.post = Post.objects.create(author=self.other_user, content="polled")
+        self.list_url = reverse("post-list")
+        self.detail_url = reverse("post-detail", args=[self.post.id])
+        self.like_url = reverse("post-like", args=[self.post.id])
+        self.client.force_authenticate(self.user)  # type: ignore
+        return super().setUp()
+
+    def test_list_returns_304_for_matching_etag(self):
+        etag = self.client.get(self.list_url)["ETag"]
+        res = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
+
+    def test_list_etag_changes_after_like(self):
+        etag = self.client.get(self.list_url)["ETag"]
+        self.client.post(self.like_url)
+        res = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()["results"][0]["likes_count"], 1)
+
+    def test_detail_returns_304_for_matching_etag(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+        res = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_etag_changes_after_like(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+        self.client.post(self.like_url)
+        res = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
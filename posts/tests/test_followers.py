@@ -1,8 +1,11 @@
+import io
+
+from django.core.management import call_command
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from accounts.models import Follow, User
+from accounts.models import Follow, Profile, User
 from posts.models import Like, Post
 
 
@@ -45,16 +48,64 @@ class TestFollower(APITestCase):
         self.client.post(self.follow_url)
         res = self.client.get(self.followers_url)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.json()), 1)
-        self.assertEqual(res.json()[0]["follower_username"], "user1")
+        self.assertEqual(len(res.json()["results"]), 1)
+        self.assertEqual(res.json()["results"][0]["follower_username"], "user1")
 
     def test_following_list(self):
         self.client.force_authenticate(self.user1)  # type: ignore
         self.client.post(self.follow_url)
         res = self.client.get(self.following_url)
-        self.assertEqual(len(res.json()), 1)
-        self.assertEqual(res.json()[0]["following_username"], "user2")
+        self.assertEqual(len(res.json()["results"]), 1)
+        self.assertEqual(res.json()["results"][0]["following_username"], "user2")
+
+    def test_follower_list_etag_changes_after_rename(self):
+        self.client.force_authenticate(self.user1)  # type: ignore
+        self.client.post(self.follow_url)
+        etag = self.client.get(self.followers_url)["ETag"]
+        self.user1.username = "renamed"
+        self.user1.save()
+        res = self.client.get(self.followers_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()["results"][0]["follower_username"], "renamed")
 
     def test_anonymous_cannot_follow(self):
         res = self.client.post(self.follow_url)
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_follower_list_is_paginated_newest_first(self):
+        followers = [
+            User.objects.create_user(
+                username=f"fan{i}", email=f"fan{i}@test.com", password="password123"
+            )
+            for i in range(7)
+        ]
+        for follower in followers:
+            Follow.objects.create(follower=follower, following=self.user2)
+        self.client.force_authenticate(self.user1)  # type: ignore
+        page1 = self.client.get(self.followers_url).json()
+        page2 = self.client.get(page1["next"]).json()
+        usernames = [
+            row["follower_username"] for row in page1["results"] + page2["results"]
+        ]
+        self.assertEqual(usernames, [f"fan{i}" for i in reversed(range(7))])
+        self.assertIsNone(page2["next"])
+
+    def test_follow_and_unfollow_update_counts(self):
+        self.client.force_authenticate(self.user1)  # type: ignore
+        self.client.post(self.follow_url)
+        self.assertEqual(Profile.objects.get(user=self.user1).following_count, 1)
+        self.assertEqual(Profile.objects.get(user=self.user2).followers_count, 1)
+        self.client.post(self.unfollow_url)
+        self.assertEqual(Profile.objects.get(user=self.user2).followers_count, 0)
+        profile = self.client.get(reverse("my-profile")).json()
+        self.assertEqual(
+            (profile["followers_count"], profile["following_count"]), (0, 0)
+        )
+
+    def test_reconcile_follow_counts_fixes_drift(self):
+        Follow.objects.create(follower=self.user1, following=self.user2)
+        Profile.objects.update(followers_count=9)
+        call_command("reconcile_follow_counts", stdout=io.StringIO())
+        counts = dict(Profile.objects.values_list("user__username", "followers_count"))
+        self.assertEqual(counts, {"user1": 0, "user2": 1})
+        self.assertEqual(Profile.objects.get(user=self.user1).following_count, 1)
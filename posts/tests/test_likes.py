@@ -1,3 +1,6 @@
+import io
+
+from django.core.management import call_command
 from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
@@ -49,3 +52,112 @@ class LikeBaseTest(APITestCase):
         self.client.force_authenticate(self.user)  # type: ignore
         res = self.client.post(self.unlike_url)
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_like_and_unlike_update_likes_count(self):
+        self.client.force_authenticate(self.user)  # type: ignore
+        self.client.post(self.like_url)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+        self.client.post(self.unlike_url)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 0)
+
+    def test_reconcile_likes_count_fixes_drift(self):
+        Like.objects.create(user=self.user, post=self.post)
+        Post.objects.filter(pk=self.post.pk).update(likes_count=7)
+        call_command("reconcile_likes_count", stdout=io.StringIO())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+
+    def test_list_exposes_liked_by_me(self):
+        Post.objects.create(author=self.other_user, content="Not liked")
+        Like.objects.create(user=self.user, post=self.post)
+        list_url = reverse("post-list")
+
+        self.client.force_authenticate(self.user)  # type: ignore
+        results = self.client.get(list_url).json()["results"]
+        liked = {post["id"]: post["liked_by_me"] for post in results}
+        self.assertEqual(len(liked), 2)
+        self.assertTrue(liked[self.post.id])
+        self.assertEqual(sum(liked.values()), 1)
+
+        self.client.force_authenticate(None)  # type: ignore
+        results = self.client.get(list_url).json()["results"]
+        self.assertFalse(any(post["liked_by_me"] for post in results))
+
+    def test_liked_by_me_does_not_add_queries_per_post(self):
+        self.client.force_authenticate(self.user)  # type: ignore
+        list_url = reverse("post-list")
+        with self.assertNumQueries(2):
+            self.client.get(list_url)
+        for i in range(4):
+            Like.objects.create(
+                user=self.user,
+                post=Post.objects.create(author=self.other_user, content=f"{i}"),
+            )
+        with self.assertNumQueries(2):
+            self.client.get(list_url)
+
+
+@override_settings(
+    LIKES_WRITE_BEHIND=True,
+    LIKE_BUFFER={"BACKEND": "posts.like_buffer.LocMemLikeBuffer"},
+)
+class WriteBehindLikeTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="user1", email="user1@test.com", password="password123"
+        )
+        author = User.objects.create_user(
+            username="user2", email="user2@test.com", password="password123"
+        )
+        self.post = Post.objects.create(author=author, content="Test post")
+        self.like_url = reverse("post-like", args=[self.post.id])
+        self.unlike_url = reverse("post-unlike", args=[self.post.id])
+        return super().setUp()
+
+    def flush(self):
+        call_command("flush_like_buffer", stdout=io.StringIO())
+        self.post.refresh_from_db()
+
+    def test_like_is_buffered_until_flushed(self):
+        self.client.force_authenticate(self.user)  # type: ignore
+        res = self.client.post(self.like_url)
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Like.objects.count(), 0)
+        self.flush()
+        self.assertTrue(Like.objects.filter(user=self.user, post=self.post).exists())
+        self.assertEqual(self.post.likes_count, 1)
+
+    def test_buffered_state_answers_repeated_calls(self):
+        self.client.force_authenticate(self.user)  # type: ignore
+        self.client.post(self.like_url)
+        res = self.client.post(self.like_url)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            self.client.post(self.unlike_url).status_code, status.HTTP_200_OK
+        )
+        self.assertEqual(
+            self.client.post(self.unlike_url).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+        self.flush()
+        self.assertEqual(Like.objects.count(), 0)
+        self.assertEqual(self.post.likes_count, 0)
+
+    def test_unlike_of_persisted_like_is_flushed(self):
+        Like.objects.create(user=self.user, post=self.post)
+        Post.objects.sync_likes_count()
+        self.client.force_authenticate(self.user)  # type: ignore
+        res = self.client.post(self.unlike_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.flush()
+        self.assertEqual(Like.objects.count(), 0)
+        self.assertEqual(self.post.likes_count, 0)
+
+    def test_flush_skips_deleted_posts(self):
+        self.client.force_authenticate(self.user)  # type: ignore
+        self.client.post(self.like_url)
+        self.post.delete()
+        call_command("flush_like_buffer", stdout=io.StringIO())
+        self.assertEqual(Like.objects.count(), 0)
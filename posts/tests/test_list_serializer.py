@@ -0,0 +1,50 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from accounts.models import User
+from posts.models import Like, Post, Tag
+from posts.serializers import PostListReadSerializer, PostSerializer
+
+
+class PostListReadSerializerTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="user1", email="user1@test.com", password="password123"
+        )
+        self.nameless = User.objects.create(username="", email="nameless@test.com")
+        tagged = Post.objects.create(author=self.user, content="tagged")
+        tagged.set_tags(Tag.objects.get_or_create_many(["zeta", "alpha", "mid"]))
+        Post.objects.create(author=self.nameless, content="image", image="posts/a.jpg")
+        Post.objects.create(author=self.user, content="plain", likes_count=3)
+        self.request = Request(APIRequestFactory().get("/api/posts/entries/"))
+        return super().setUp()
+
+    def render_both(self, context, queryset=None):
+        if queryset is None:
+            queryset = Post.objects.prefetch_related("tags")
+        slow = PostSerializer(queryset, many=True, context=context).data
+        fast = PostListReadSerializer(
+            PostListReadSerializer.get_rows(queryset), context=context
+        ).data
+        return JSONRenderer().render(slow), JSONRenderer().render(fast)
+
+    def test_output_is_byte_identical_with_request(self):
+        slow, fast = self.render_both({"request": self.request})
+        self.assertEqual(slow, fast)
+
+    def test_output_is_byte_identical_without_request(self):
+        slow, fast = self.render_both({})
+        self.assertEqual(slow, fast)
+
+    def test_output_is_byte_identical_with_liked_by_me(self):
+        Like.objects.create(user=self.user, post=Post.objects.get(content="plain"))
+        queryset = Post.objects.prefetch_related("tags").with_liked_by_me(self.user)
+        slow, fast = self.render_both({}, queryset)
+        self.assertEqual(slow, fast)
+        self.assertIn(b'"liked_by_me":true', fast)
+
+    def test_tags_are_fetched_in_one_query(self):
+        rows = PostListReadSerializer.get_rows(Post.objects.all())
+        with self.assertNumQueries(2):
+            PostListReadSerializer(rows).data
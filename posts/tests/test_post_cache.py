@@ -0,0 +1,105 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from common.cache import get_tag_versions
+from common.cache_keys import CacheKeys
+from posts.models import Post, Tag
+
+
+class PostDetailCacheTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="user1", email="user1@test.com", password="password123"
+        )
+        self.other_user = User.objects.create_user(
+            username="user2", email="user2@test.com", password="password123"
+        )
+        self.post = Post.objects.create(author=self.user, content="cached post")
+        self.detail_url = reverse("post-detail", args=[self.post.id])
+        self.client.force_authenticate(self.other_user)  # type: ignore
+        return super().setUp()
+
+    def test_second_read_is_served_from_cache(self):
+        self.client.force_authenticate(None)  # type: ignore
+        self.client.get(self.detail_url)
+        with self.assertNumQueries(0):
+            res = self.client.get(self.detail_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()["content"], "cached post")
+
+    def test_cached_read_only_looks_up_liked_by_me(self):
+        self.client.get(self.detail_url)
+        with self.assertNumQueries(1):
+            res = self.client.get(self.detail_url)
+        self.assertFalse(res.json()["liked_by_me"])
+
+    def test_liked_by_me_is_not_shared_through_the_cache(self):
+        self.client.post(reverse("post-like", args=[self.post.id]))
+        self.assertTrue(self.client.get(self.detail_url).json()["liked_by_me"])
+        self.client.force_authenticate(self.user)  # type: ignore
+        self.assertFalse(self.client.get(self.detail_url).json()["liked_by_me"])
+
+    def test_like_invalidates_cached_detail(self):
+        self.client.get(self.detail_url)
+        self.client.post(reverse("post-like", args=[self.post.id]))
+        res = self.client.get(self.detail_url)
+        self.assertEqual(res.json()["likes_count"], 1)
+
+    def test_update_invalidates_cached_detail(self):
+        self.client.get(self.detail_url)
+        self.client.force_authenticate(self.user)  # type: ignore
+        self.client.patch(self.detail_url, {"content": "edited"})
+        res = self.client.get(self.detail_url)
+        self.assertEqual(res.json()["content"], "edited")
+
+    def test_tag_change_invalidates_cached_detail(self):
+        self.client.get(self.detail_url)
+        self.post.set_tags(Tag.objects.get_or_create_many(["django"]))
+        res = self.client.get(self.detail_url)
+        self.assertEqual(res.json()["tags"], ["django"])
+
+    def test_tag_rename_invalidates_cached_detail(self):
+        (tag,) = Tag.objects.get_or_create_many(["django"])
+        self.post.set_tags([tag])
+        self.client.get(self.detail_url)
+        tag.name = "flask"
+        tag.save()
+        res = self.client.get(self.detail_url)
+        self.assertEqual(res.json()["tags"], ["flask"])
+
+    def test_tag_delete_invalidates_cached_detail(self):
+        self.post.set_tags(Tag.objects.get_or_create_many(["django", "flask"]))
+        self.client.get(self.detail_url)
+        Tag.objects.get(name="flask").delete()
+        res = self.client.get(self.detail_url)
+        self.assertEqual(res.json()["tags"], ["django"])
+
+    def test_reverse_tag_clear_invalidates_cached_detail(self):
+        (tag,) = Tag.objects.get_or_create_many(["django"])
+        self.post.set_tags([tag])
+        self.client.get(self.detail_url)
+        tag.posts.clear()
+        res = self.client.get(self.detail_url)
+        self.assertEqual(res.json()["tags"], [])
+
+    def test_only_author_renames_invalidate_cached_detail(self):
+        tag = CacheKeys.post_tag(self.post.id)
+        version = get_tag_versions([tag])
+        self.user.email = "new@test.com"
+        self.user.set_password("password456")
+        self.user.save()
+        self.assertEqual(get_tag_versions([tag]), version)
+        self.user.username = "renamed"
+        self.user.save()
+        res = self.client.get(self.detail_url)
+        self.assertEqual(res.json()["author"], "renamed")
+
+    def test_deleted_post_is_not_served_from_cache(self):
+        self.client.get(self.detail_url)
+        self.post.delete()
+        res = self.client.get(self.detail_url)
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -57,6 +57,30 @@ class PostImageUploadTest(PostBaseTest):
         self.assertEqual(Post.objects.count(), 1)
         self.assertEqual(Post.objects.all().first().author, self.user)  # type: ignore
 
+    def test_oversized_image_is_rejected(self):
+        self.client.force_authenticate(user=self.user)  # type: ignore
+        image = SimpleUploadedFile(
+            "post.jpg", b"\xff\xd8\xff" + bytes(6 * 1024 * 1024), "image/jpeg"
+        )
+        data = {"content": "test post", "image": image}
+        response = self.client.post(self.list_url, data=data, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        self.assertEqual(Post.objects.count(), 0)
+
+    def test_image_format_is_sniffed_from_content(self):
+        self.client.force_authenticate(user=self.user)  # type: ignore
+        fake = SimpleUploadedFile("post.jpg", b"<?php echo 'hi'; ?>", "image/jpeg")
+        data = {"content": "test post", "image": fake}
+        response = self.client.post(self.list_url, data=data, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("image", response.json())
+
+    def test_unexpected_file_field_is_rejected(self):
+        self.client.force_authenticate(user=self.user)  # type: ignore
+        data = {"content": "test post", "attachment": self.generate_test_image()}
+        response = self.client.post(self.list_url, data=data, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
 
 class PostPermissionTests(PostBaseTest):
     def setUp(self) -> None:
@@ -112,6 +136,30 @@ class PostTagTests(PostBaseTest):
         self.assertEqual(post.tags.count(), 2)
         self.assertTrue(Tag.objects.filter(name="api").exists())
 
+    def test_update_applies_only_the_tag_difference(self):
+        post = Post.objects.create(content="diff tags", author=self.user)
+        post.set_tags(Tag.objects.get_or_create_many(["api", "rest"]))
+        kept = Post.tags.through.objects.get(post=post, tag__name="api")
+        url = reverse("post-detail", args=[post.id])
+        res = self.client.patch(url, {"tags_input": ["api", "django"]})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(res.json()["tags"]), ["api", "django"])
+        self.assertTrue(Post.tags.through.objects.filter(pk=kept.pk).exists())
+
+    def test_update_without_tags_input_keeps_tags(self):
+        post = Post.objects.create(content="keep tags", author=self.user)
+        post.set_tags(Tag.objects.get_or_create_many(["api"]))
+        url = reverse("post-detail", args=[post.id])
+        self.client.patch(url, {"content": "new content"})
+        self.assertEqual(post.tags.count(), 1)
+
+    def test_tag_writes_are_batched(self):
+        names = [f"tag-{i}" for i in range(10)]
+        post = Post.objects.create(content="many tags", author=self.user)
+        with self.assertNumQueries(5):
+            post.set_tags(Tag.objects.get_or_create_many(names))
+        self.assertEqual(post.tags.count(), 10)
+
 
 class PostFilteringTests(PostBaseTest):
     def setUp(self) -> None:
@@ -143,6 +191,40 @@ class PostSearchTest(PostBaseTest):
         self.assertEqual(len(res.json()["results"]), 1)
         self.assertIn("django", res.json()["results"][0]["content"])
 
+    def test_search_matches_prefixes(self):
+        res = self.client.get(f"{self.list_url}?search=filt")
+        self.assertEqual(len(res.json()["results"]), 1)
+
+    def test_search_by_author_username(self):
+        res = self.client.get(f"{self.list_url}?search=user1")
+        self.assertEqual(len(res.json()["results"]), 2)
+
+    def test_search_follows_author_renames(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.username = "renamed"
+        user.save()
+        res = self.client.get(f"{self.list_url}?search=renamed")
+        self.assertEqual(len(res.json()["results"]), 2)
+        res = self.client.get(f"{self.list_url}?search=user1")
+        self.assertEqual(len(res.json()["results"]), 0)
+
+    def test_search_ranks_best_match_first(self):
+        best = Post.objects.create(
+            author=self.other_user, content="django django django tips"
+        )
+        res = self.client.get(f"{self.list_url}?search=django")
+        self.assertEqual(res.json()["results"][0]["id"], best.id)
+
+    def test_search_index_follows_updates_and_deletes(self):
+        post = Post.objects.get(content="Just a random post")
+        post.content = "Now about django too"
+        post.save()
+        res = self.client.get(f"{self.list_url}?search=django")
+        self.assertEqual(len(res.json()["results"]), 2)
+        post.delete()
+        res = self.client.get(f"{self.list_url}?search=django")
+        self.assertEqual(len(res.json()["results"]), 1)
+
 
 class PostPaginationTests(PostBaseTest):
     def setUp(self) -> None:
@@ -155,9 +237,23 @@ class PostPaginationTests(PostBaseTest):
         Post.objects.bulk_create(posts)
 
     def test_pagination(self):
-        res_page1 = self.client.get(f"{self.list_url}?page=1")
-        res_page2 = self.client.get(f"{self.list_url}?page=2")
-        self.assertEqual(len(res_page1.json()["results"]), 5)
-        self.assertEqual(len(res_page2.json()["results"]), 5)
+        res_page1 = self.client.get(self.list_url)
+        res_page2 = self.client.get(res_page1.json()["next"])
         self.assertEqual(res_page1.status_code, status.HTTP_200_OK)
         self.assertEqual(res_page2.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res_page1.json()["results"]), 5)
+        self.assertEqual(len(res_page2.json()["results"]), 5)
+        self.assertIsNone(res_page2.json()["next"])
+        ids = [post["id"] for post in res_page1.json()["results"]]
+        ids += [post["id"] for post in res_page2.json()["results"]]
+        self.assertEqual(len(set(ids)), 10)
+
+    def test_pagination_previous_link(self):
+        res_page1 = self.client.get(self.list_url)
+        res_page2 = self.client.get(res_page1.json()["next"])
+        res_back = self.client.get(res_page2.json()["previous"])
+        self.assertEqual(res_back.json()["results"], res_page1.json()["results"])
+
+    def test_page_size_param(self):
+        res = self.client.get(f"{self.list_url}?page_size=3")
+        self.assertEqual(len(res.json()["results"]), 3)
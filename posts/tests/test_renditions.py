@@ -0,0 +1,163 @@
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from common.renditions import (
+    generate_renditions,
+    render,
+    rendition_name,
+    save_renditions,
+)
+from common.views import rendition_redirect
+from posts.models import Post
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class RenditionTests(APITestCase):
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        return super().tearDownClass()
+
+    def setUp(self) -> None:
+        # Uploads are deduplicated, so renditions would outlive a test.
+        shutil.rmtree(os.path.join(MEDIA_ROOT, "renditions"), ignore_errors=True)
+        self.user = User.objects.create(
+            username="user1", email="user1@test.com", password="strongpassword123"
+        )
+        return super().setUp()
+
+    def generate_test_image(self, size=(1200, 800)) -> bytes:
+        file = io.BytesIO()
+        Image.new("RGB", size, color="red").save(file, format="PNG")
+        return file.getvalue()
+
+    def create_post(self) -> Post:
+        image = SimpleUploadedFile(
+            "post.png", self.generate_test_image(), content_type="image/png"
+        )
+        with mock.patch("common.renditions.submit_renditions") as submit:
+            with self.captureOnCommitCallbacks(execute=True):
+                post = Post.objects.create(author=self.user, content="hi", image=image)
+        submit.assert_called_once_with(post.image.name)
+        return post
+
+    def test_render_resizes_and_reencodes(self):
+        specs = {
+            "thumb": {"size": (160, 160), "crop": True, "format": "JPEG"},
+            "medium": {"size": (720, 720), "format": "WEBP"},
+        }
+        rendered = render(self.generate_test_image(), specs)
+        with Image.open(io.BytesIO(rendered["thumb"])) as thumb:
+            self.assertEqual((thumb.format, thumb.size), ("JPEG", (160, 160)))
+        with Image.open(io.BytesIO(rendered["medium"])) as medium:
+            self.assertEqual((medium.format, medium.size), ("WEBP", (720, 480)))
+
+    def test_post_payload_links_renditions(self):
+        post = self.create_post()
+        res = self.client.get(reverse("post-detail", args=[post.id]))
+        renditions = res.json()["image_renditions"]
+        self.assertEqual(
+            renditions["thumb"],
+            "http://testserver"
+            + reverse("image-rendition", args=["thumb", post.image.name]),
+        )
+        list_res = self.client.get(reverse("post-list"))
+        self.assertEqual(list_res.json()["results"][0]["image_renditions"], renditions)
+
+    def test_cached_detail_urls_follow_the_request(self):
+        post = self.create_post()
+        url = reverse("post-detail", args=[post.id])
+        self.client.get(url)
+        res = self.client.get(url, secure=True)
+        self.assertTrue(res.json()["image"].startswith("https://testserver/"))
+        self.assertTrue(
+            res.json()["image_renditions"]["thumb"].startswith("https://testserver/")
+        )
+
+    def test_missing_rendition_is_rendered_on_access(self):
+        post = self.create_post()
+        name = rendition_name(post.image.name, "thumb")
+        self.assertFalse(default_storage.exists(name))
+        res = self.client.get(
+            reverse("image-rendition", args=["thumb", post.image.name])
+        )
+        self.assertEqual(res.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(res["Location"], default_storage.url(name))
+        self.assertTrue(default_storage.exists(name))
+
+    def test_existing_rendition_is_not_rendered_again(self):
+        post = self.create_post()
+        generate_renditions(post.image.name)
+        with mock.patch("common.views.generate_renditions") as generate:
+            res = self.client.get(
+                reverse("image-rendition", args=["medium", post.image.name])
+            )
+        self.assertEqual(res.status_code, status.HTTP_302_FOUND)
+        generate.assert_not_called()
+
+    def test_concurrent_first_requests_render_once(self):
+        post = self.create_post()
+        url = reverse("image-rendition", args=["thumb", post.image.name])
+        calls = []
+
+        def slow_render(*args):
+            calls.append(args)
+            time.sleep(0.2)
+            generate_renditions(*args)
+
+        responses = []
+
+        def request():
+            responses.append(
+                rendition_redirect(RequestFactory().get(url), "thumb", post.image.name)
+            )
+
+        with mock.patch("common.views.generate_renditions", slow_render):
+            threads = [threading.Thread(target=request) for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([r.status_code for r in responses], [302] * 3)
+
+    def test_duplicate_renders_leave_no_orphans(self):
+        post = self.create_post()
+        generate_renditions(post.image.name, ["thumb"])
+        exists = default_storage.exists
+        # The render started before the other one stored the rendition.
+        checks = iter([False])
+        with mock.patch.object(
+            default_storage, "exists", lambda name: next(checks, None) or exists(name)
+        ):
+            save_renditions(post.image.name, {"thumb": b"again"})
+        directory = os.path.dirname(
+            default_storage.path(rendition_name(post.image.name, "thumb"))
+        )
+        self.assertEqual(len(os.listdir(directory)), 1)
+
+    def test_unknown_spec_or_source_is_404(self):
+        post = self.create_post()
+        for spec, name in [
+            ("huge", post.image.name),
+            ("thumb", "posts/missing.png"),
+            ("thumb", "renditions/thumb/x.jpg"),
+        ]:
+            res = self.client.get(reverse("image-rendition", args=[spec, name]))
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
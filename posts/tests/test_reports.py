@@ -1,9 +1,11 @@
+from django.core.cache import cache
 from django.urls import reverse
+from django.utils.dateparse import parse_datetime
 from rest_framework import status
 from rest_framework.test import APITestCase
 
 from accounts.models import User
-from posts.models import Post
+from posts.models import Post, Report
 
 
 class ReportPermissionsTest(APITestCase):
@@ -45,3 +47,156 @@ class ReportPermissionsTest(APITestCase):
             self.reports_url, {"post": post.id, "reason": "staff reporting"}
         )
         self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ReportSummaryTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.author = User.objects.create_user(
+            username="author", email="author@test.com", password="pass12345"
+        )
+        self.reporters = [
+            User.objects.create_user(
+                username=f"reporter{i}", email=f"r{i}@test.com", password="pass12345"
+            )
+            for i in range(3)
+        ]
+        self.moderator = User.objects.create_user(
+            username="mod", email="mod@test.com", password="pass12345", is_staff=True
+        )
+        self.post = Post.objects.create(author=self.author, content="Spam post")
+        self.summary_url = f"/api/posts/admin-reports/posts/{self.post.id}/summary"
+        self.client.force_authenticate(self.moderator)  # type: ignore
+        return super().setUp()
+
+    def report(self, reporter: User, reason: str) -> Report:
+        return Report.objects.create(reporter=reporter, post=self.post, reason=reason)
+
+    def test_summary_is_built_with_two_queries(self):
+        self.report(self.reporters[0], "spam")
+        latest = self.report(self.reporters[1], "scam")
+        with self.assertNumQueries(2):
+            res = self.client.get(self.summary_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        body = res.json()
+        self.assertEqual(body["post_author"], "author")
+        self.assertEqual(body["reports_count"], 2)
+        self.assertEqual(body["report_reasons"], ["spam", "scam"])
+        self.assertEqual(parse_datetime(body["last_reported_at"]), latest.created_at)
+        self.assertFalse(body["is_action_taken"])
+
+    def test_summary_of_unreported_post(self):
+        body = self.client.get(self.summary_url).json()
+        self.assertEqual(body["reports_count"], 0)
+        self.assertIsNone(body["last_reported_at"])
+
+    def test_summary_of_missing_post_is_404(self):
+        res = self.client.get("/api/posts/admin-reports/posts/999/summary")
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_new_report_invalidates_summary(self):
+        self.report(self.reporters[0], "spam")
+        self.client.get(self.summary_url)
+        self.report(self.reporters[1], "scam")
+        self.assertEqual(self.client.get(self.summary_url).json()["reports_count"], 2)
+
+    def test_moderation_invalidates_summary(self):
+        report = self.report(self.reporters[0], "spam")
+        self.report(self.reporters[1], "scam")
+        self.client.get(self.summary_url)
+        self.client.patch(
+            f"/api/posts/admin-report/posts/{report.id}/moderate",
+            {"status": Report.Status.ACTION_TAKEN},
+        )
+        body = self.client.get(self.summary_url).json()
+        self.assertEqual(body["reports_count"], 1)
+        self.assertTrue(body["is_action_taken"])
+
+
+class BulkModerationTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.author = User.objects.create_user(
+            username="author", email="author@test.com", password="pass12345"
+        )
+        self.moderator = User.objects.create_user(
+            username="mod", email="mod@test.com", password="pass12345", is_staff=True
+        )
+        self.reporters = [
+            User.objects.create_user(
+                username=f"reporter{i}", email=f"r{i}@test.com", password="pass12345"
+            )
+            for i in range(3)
+        ]
+        self.posts = [
+            Post.objects.create(author=self.author, content=f"post {i}")
+            for i in range(3)
+        ]
+        for post in self.posts:
+            for reporter in self.reporters[: post.id % 3 + 1]:
+                Report.objects.create(reporter=reporter, post=post, reason="spam")
+        self.bulk_url = reverse("report-bulk-moderate")
+        self.queue_url = reverse("report-moderation-queue")
+        self.client.force_authenticate(self.moderator)  # type: ignore
+        return super().setUp()
+
+    def test_non_staff_cannot_moderate(self):
+        self.client.force_authenticate(self.author)  # type: ignore
+        res = self.client.post(
+            self.bulk_url, {"status": "reviewed", "post": self.posts[0].id}
+        )
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_selector_is_required(self):
+        res = self.client.post(self.bulk_url, {"status": "reviewed"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_moderate_by_ids_in_one_update(self):
+        ids = list(Report.objects.values_list("id", flat=True)[:2])
+        with self.assertNumQueries(4):
+            res = self.client.post(
+                self.bulk_url, {"status": "reviewed", "ids": ids}, format="json"
+            )
+        self.assertEqual(res.json(), {"updated": 2})
+        self.assertEqual(
+            set(Report.objects.filter(status="reviewed").values_list("id", flat=True)),
+            set(ids),
+        )
+
+    def test_moderate_by_post_and_status(self):
+        post = self.posts[0]
+        res = self.client.post(
+            self.bulk_url,
+            {"status": "action_taken", "post": post.id, "current_status": "pending"},
+        )
+        expected = Report.objects.filter(post=post).count()
+        self.assertEqual(res.json(), {"updated": expected})
+        self.assertFalse(Report.objects.filter(post=post, status="pending").exists())
+        self.assertEqual(
+            Report.objects.exclude(post=post).filter(status="pending").count(),
+            Report.objects.count() - expected,
+        )
+
+    def test_moderation_invalidates_summaries(self):
+        post = self.posts[0]
+        summary_url = f"/api/posts/admin-reports/posts/{post.id}/summary"
+        self.client.get(summary_url)
+        self.client.post(self.bulk_url, {"status": "reviewed", "post": post.id})
+        self.assertEqual(self.client.get(summary_url).json()["reports_count"], 0)
+
+    def test_queue_groups_pending_reports_by_post(self):
+        Report.objects.filter(post=self.posts[2]).update(status="reviewed")
+        res = self.client.get(self.queue_url, {"page_size": 1})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        first = res.json()
+        self.assertEqual(len(first["results"]), 1)
+        second = self.client.get(first["next"]).json()
+        rows = first["results"] + second["results"]
+        self.assertIsNone(second["next"])
+        self.assertEqual(
+            [(row["post"], row["reports_count"]) for row in rows],
+            [
+                (post.id, Report.objects.filter(post=post).count())
+                for post in reversed(self.posts[:2])
+            ],
+        )
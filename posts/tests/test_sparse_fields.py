@@ -0,0 +1,75 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.models import Follow, User
+from posts.models import Post, Tag
+
+
+class SparseFieldsetTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="user1", email="user1@test.com", password="password123"
+        )
+        self.other_user = User.objects.create_user(
+            username="user2", email="user2@test.com", password="password123"
+        )
+        self.post = Post.objects.create(author=self.user, content="long " * 100)
+        self.post.set_tags(Tag.objects.get_or_create_many(["django"]))
+        self.list_url = reverse("post-list")
+        self.detail_url = reverse("post-detail", args=[self.post.id])
+        self.client.force_authenticate(self.user)  # type: ignore
+        return super().setUp()
+
+    def test_list_returns_only_requested_fields(self):
+        res = self.client.get(f"{self.list_url}?fields=id,slug,author,likes_count")
+        post = res.json()["results"][0]
+        self.assertEqual(list(post), ["id", "author", "slug", "likes_count"])
+
+    def test_list_skips_unrequested_columns_and_tags(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(f"{self.list_url}?fields=id,slug")
+        sql = " ".join(query["sql"] for query in queries.captured_queries)
+        self.assertNotIn('"posts_post"."content"', sql)
+        self.assertNotIn("posts_post_tags", sql)
+
+    def test_list_omit(self):
+        res = self.client.get(f"{self.list_url}?omit=content,image")
+        post = res.json()["results"][0]
+        self.assertNotIn("content", post)
+        self.assertNotIn("image", post)
+        self.assertEqual(post["tags"], ["django"])
+
+    def test_detail_fields_do_not_leak_into_cache(self):
+        res = self.client.get(f"{self.detail_url}?fields=id,slug")
+        self.assertEqual(list(res.json()), ["id", "slug"])
+        res = self.client.get(self.detail_url)
+        self.assertIn("content", res.json())
+
+    def test_followers_fields(self):
+        follow = Follow.objects.create(follower=self.other_user, following=self.user)
+        url = reverse("users-followers", args=[self.user.id])
+        res = self.client.get(f"{url}?fields=id,follower_username")
+        self.assertEqual(
+            res.json()["results"][0], {"id": follow.id, "follower_username": "user2"}
+        )
+
+    def test_follower_pages_keep_the_ordering_columns(self):
+        for i in range(6):
+            follower = User.objects.create_user(
+                username=f"follower{i}", email=f"follower{i}@test.com"
+            )
+            Follow.objects.create(follower=follower, following=self.user)
+        url = reverse("users-followers", args=[self.user.id])
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(f"{url}?fields=id")
+        self.assertIsNotNone(res.json()["next"])
+        follow_queries = [
+            query
+            for query in queries.captured_queries
+            if "accounts_follow" in query["sql"]
+        ]
+        self.assertEqual(len(follow_queries), 1)
@@ -0,0 +1,83 @@
+import io
+import os
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from common.renditions import generate_renditions, rendition_name
+from common.storage import blob_storage
+from posts.models import Post
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ContentAddressedStorageTests(APITestCase):
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        return super().tearDownClass()
+
+    def setUp(self) -> None:
+        self.user = User.objects.create(
+            username="user1", email="user1@test.com", password="strongpassword123"
+        )
+        self.client.force_authenticate(user=self.user)  # type: ignore
+        return super().setUp()
+
+    def generate_test_image(self, color="red", name="post.jpg"):
+        file = io.BytesIO()
+        Image.new("RGB", (100, 100), color=color).save(file, format="JPEG")
+        return SimpleUploadedFile(name, file.getvalue(), content_type="image/jpeg")
+
+    def upload(self, image) -> Post:
+        data = {"content": "test post", "image": image}
+        res = self.client.post(reverse("post-list"), data=data, format="multipart")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        return Post.objects.get(id=res.json()["id"])
+
+    def test_same_content_is_stored_once(self):
+        first = self.upload(self.generate_test_image(name="a.jpg"))
+        second = self.upload(self.generate_test_image(name="b.JPG"))
+        other = self.upload(self.generate_test_image(color="blue"))
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertNotEqual(first.image.name, other.image.name)
+        self.assertRegex(first.image.name, r"^posts/[0-9a-f]{2}/[0-9a-f]{64}\.jpg$")
+        blobs = [name for name, _ in blob_storage().iter_blobs("posts")]
+        self.assertEqual(len(blobs), 2)
+        self.assertEqual(
+            [p for p in os.listdir(MEDIA_ROOT) if p.startswith(".upload-")], []
+        )
+
+    def test_gc_deletes_unreferenced_blobs_and_renditions(self):
+        kept = self.upload(self.generate_test_image())
+        dropped = self.upload(self.generate_test_image(color="blue"))
+        generate_renditions(dropped.image.name)
+        dropped_name = dropped.image.name
+        dropped.delete()
+        default_storage.save("avatars/default-avatar.png", ContentFile(b"png"))
+
+        call_command("gc_media_blobs", grace_hours=0, stdout=io.StringIO())
+
+        storage = blob_storage()
+        self.assertTrue(storage.exists(kept.image.name))
+        self.assertFalse(storage.exists(dropped_name))
+        self.assertFalse(default_storage.exists(rendition_name(dropped_name, "thumb")))
+        self.assertTrue(default_storage.exists("avatars/default-avatar.png"))
+
+    def test_gc_keeps_recent_blobs(self):
+        post = self.upload(self.generate_test_image())
+        name = post.image.name
+        post.delete()
+        call_command("gc_media_blobs", stdout=io.StringIO())
+        self.assertTrue(blob_storage().exists(name))
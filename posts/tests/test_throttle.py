@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from common.throttle import LocMemRateLimiter, get_rate_limiter
+from posts.models import Post
+
+RATES = {**settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"], "like": "2/minute"}
+
+
+@override_settings(
+    REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": RATES},
+    RATE_LIMITER={"BACKEND": "common.throttle.LocMemRateLimiter"},
+)
+class TokenBucketThrottleTests(APITestCase):
+    def setUp(self) -> None:
+        get_rate_limiter().clear()  # type: ignore
+        self.author = User.objects.create_user(
+            username="author", email="author@test.com", password="password123"
+        )
+        self.users = [
+            User.objects.create_user(
+                username=f"user{i}", email=f"user{i}@test.com", password="password123"
+            )
+            for i in range(2)
+        ]
+        self.posts = [
+            Post.objects.create(author=self.author, content=f"post {i}")
+            for i in range(3)
+        ]
+        return super().setUp()
+
+    def like(self, user: User, post: Post):
+        self.client.force_authenticate(user)  # type: ignore
+        return self.client.post(reverse("post-like", args=[post.id]))
+
+    def test_burst_then_retry_after(self):
+        first, second, third = self.posts
+        self.assertEqual(
+            self.like(self.users[0], first).status_code, status.HTTP_201_CREATED
+        )
+        self.assertEqual(
+            self.like(self.users[0], second).status_code, status.HTTP_201_CREATED
+        )
+        res = self.like(self.users[0], third)
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        # One token every 30 seconds.
+        self.assertEqual(res["Retry-After"], "30")
+
+    def test_users_on_the_same_address_have_their_own_quota(self):
+        for post in self.posts[:2]:
+            self.like(self.users[0], post)
+        res = self.like(self.users[1], self.posts[0])
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_least_recently_used_buckets_are_evicted(self):
+        limiter = LocMemRateLimiter(max_entries=2)
+        for key in ["a", "b", "a", "c"]:
+            limiter.consume(key, 1, 1.0)
+        self.assertEqual(list(limiter._buckets), ["a", "c"])
@@ -0,0 +1,79 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import Follow, User
+from posts.models import Post
+from posts.timeline import get_timeline_store
+
+
+@override_settings(
+    TIMELINE_STORE={"BACKEND": "posts.timeline.LocMemTimelineStore"},
+)
+class TimelineTests(APITestCase):
+    def setUp(self) -> None:
+        self.reader = User.objects.create_user(
+            username="reader", email="reader@test.com", password="password123"
+        )
+        self.author = User.objects.create_user(
+            username="author", email="author@test.com", password="password123"
+        )
+        self.stranger = User.objects.create_user(
+            username="stranger", email="stranger@test.com", password="password123"
+        )
+        self.timeline_url = reverse("post-timeline")
+        get_timeline_store().clear()  # type: ignore
+        self.client.force_authenticate(self.reader)  # type: ignore
+        return super().setUp()
+
+    def create_post(self, author: User, content: str) -> Post:
+        with self.captureOnCommitCallbacks(execute=True):
+            return Post.objects.create(author=author, content=content)
+
+    def follow(self, follower: User, following: User) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            Follow.objects.create(follower=follower, following=following)
+
+    def test_new_posts_are_fanned_out_to_followers(self):
+        self.follow(self.reader, self.author)
+        post = self.create_post(self.author, "hello followers")
+        self.create_post(self.stranger, "nobody follows me")
+        res = self.client.get(self.timeline_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([p["id"] for p in res.json()["results"]], [post.id])
+
+    def test_follow_backfills_recent_posts(self):
+        old_post = self.create_post(self.author, "posted before the follow")
+        self.follow(self.reader, self.author)
+        self.assertIn(old_post.id, get_timeline_store().post_ids(self.reader.id))
+
+    def test_unfollow_prunes_timeline(self):
+        self.follow(self.reader, self.author)
+        self.create_post(self.author, "soon gone")
+        with self.captureOnCommitCallbacks(execute=True):
+            Follow.objects.filter(follower=self.reader, following=self.author).delete()
+        res = self.client.get(self.timeline_url)
+        self.assertEqual(res.json()["results"], [])
+
+    def test_timeline_is_paginated(self):
+        self.follow(self.reader, self.author)
+        for i in range(7):
+            self.create_post(self.author, f"post {i}")
+        page1 = self.client.get(self.timeline_url).json()
+        page2 = self.client.get(page1["next"]).json()
+        self.assertEqual(len(page1["results"]), 5)
+        self.assertEqual(len(page2["results"]), 2)
+        self.assertIsNone(page2["next"])
+
+    def test_timeline_with_access_token(self):
+        # Served statelessly: the user comes from the token claims.
+        self.follow(self.reader, self.author)
+        post = self.create_post(self.author, "hello followers")
+        self.client.force_authenticate(None)  # type: ignore
+        self.client.credentials(  # type: ignore
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.reader)}"
+        )
+        res = self.client.get(self.timeline_url)
+        self.assertEqual([p["id"] for p in res.json()["results"]], [post.id])
@@ -0,0 +1,110 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from common.cache_keys import CacheKeys
+from posts.models import Like, Post
+from posts.trending import refresh_trending
+
+
+class TrendingTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.author = User.objects.create_user(
+            username="author", email="author@test.com", password="password123"
+        )
+        self.fans = [
+            User.objects.create_user(
+                username=f"fan{i}", email=f"fan{i}@test.com", password="password123"
+            )
+            for i in range(4)
+        ]
+        self.url = reverse("post-trending")
+        return super().setUp()
+
+    def create_post(self, content: str, age: timedelta = timedelta()) -> Post:
+        post = Post.objects.create(author=self.author, content=content)
+        Post.objects.filter(pk=post.pk).update(created_at=timezone.now() - age)
+        return post
+
+    def like(self, post: Post, fans: int, age: timedelta = timedelta()) -> None:
+        for user in self.fans[:fans]:
+            like = Like.objects.create(user=user, post=post)
+            Like.objects.filter(pk=like.pk).update(created_at=timezone.now() - age)
+
+    def test_recent_likes_outrank_old_ones(self):
+        old = self.create_post("old hit", age=timedelta(days=2))
+        self.like(old, 4, age=timedelta(days=1))
+        fresh = self.create_post("fresh", age=timedelta(hours=1))
+        self.like(fresh, 2)
+        quiet = self.create_post("quiet", age=timedelta(days=3))
+        self.like(quiet, 1, age=timedelta(days=3))
+        self.assertEqual(refresh_trending(), [fresh.id, old.id, quiet.id])
+
+    def test_refresh_only_reads_new_likes(self):
+        first = self.create_post("first")
+        second = self.create_post("second")
+        self.like(first, 1)
+        self.assertEqual(refresh_trending(), [first.id])
+        self.like(second, 3)
+        with self.assertNumQueries(1):
+            ranking = refresh_trending()
+        self.assertEqual(ranking, [second.id, first.id])
+
+    def test_scores_outlive_the_ranking(self):
+        leader = self.create_post("leader")
+        runner_up = self.create_post("runner-up")
+        self.like(leader, 3)
+        self.like(runner_up, 2)
+        with mock.patch("posts.trending.RANKING_SIZE", 1):
+            self.assertEqual(refresh_trending(), [leader.id])
+            for user in self.fans[2:]:
+                Like.objects.create(user=user, post=runner_up)
+            self.assertEqual(refresh_trending(), [runner_up.id])
+
+    def test_late_commits_are_read_once(self):
+        post = self.create_post("post")
+        self.like(post, 1)
+        refresh_trending()
+        state = cache.get(CacheKeys.trending_state())
+        # A like committed after the refresh with an id below its watermark.
+        Like.objects.create(user=self.fans[1], post=post)
+        cache.set(
+            CacheKeys.trending_state(),
+            {**state, "watermark": state["watermark"] + 100},
+            timeout=None,
+        )
+
+        def score():
+            refresh_trending()
+            return cache.get(CacheKeys.trending_state())["scores"][post.id]
+
+        once = score()
+        self.assertGreater(once, state["scores"][post.id])
+        self.assertEqual(score(), once)
+
+    def test_endpoint_pages_over_ranking(self):
+        posts = [self.create_post(f"post {i}") for i in range(3)]
+        for fans, post in enumerate(posts, start=1):
+            self.like(post, fans)
+        res = self.client.get(self.url, {"limit": 2})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        body = res.json()
+        self.assertEqual(body["count"], 3)
+        self.assertEqual([p["id"] for p in body["results"]], [posts[2].id, posts[1].id])
+        res = self.client.get(body["next"])
+        self.assertEqual([p["id"] for p in res.json()["results"]], [posts[0].id])
+
+    def test_deleted_posts_are_skipped(self):
+        post = self.create_post("gone")
+        self.like(post, 1)
+        refresh_trending()
+        post.delete()
+        res = self.client.get(self.url)
+        self.assertEqual(res.json()["results"], [])
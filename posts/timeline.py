@@ -0,0 +1,246 @@
+import threading
+from functools import cache
+from typing import Iterable
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db.models import QuerySet
+from django.dispatch import receiver
+
+from accounts.models import Follow
+from common.backends import load_backend
+from common.cache_keys import CacheKeys
+from posts.models import Post
+
+# A timeline entry: (post id, score). The score is the post's creation
+# timestamp, so a timeline is a sorted set ordered newest first.
+Entry = tuple[int, float]
+
+FAN_OUT_BATCH_SIZE = 1000
+
+
+class BaseTimelineStore:
+    """
+    Per-user sorted timelines of post ids. Subclasses hold the actual data;
+    every method is a batch operation so fan-out costs one round trip per
+    chunk of followers rather than one per follower.
+    """
+
+    def __init__(self, max_length: int = 800) -> None:
+        self.max_length = max_length
+
+    def add(self, user_ids: Iterable[int], entries: Iterable[Entry]) -> None:
+        raise NotImplementedError
+
+    def remove(self, user_ids: Iterable[int], post_ids: Iterable[int]) -> None:
+        raise NotImplementedError
+
+    def range(
+        self, user_id: int, max_score: float | None = None, limit: int = 20
+    ) -> list[Entry]:
+        """
+        Return up to `limit` entries with `score <= max_score`, newest first.
+        """
+        raise NotImplementedError
+
+    def post_ids(self, user_id: int) -> list[int]:
+        raise NotImplementedError
+
+
+class LocMemTimelineStore(BaseTimelineStore):
+    """
+    In-process stand-in for tests and local development. Timelines are not
+    shared between workers.
+    """
+
+    def __init__(self, max_length: int = 800) -> None:
+        super().__init__(max_length)
+        self._timelines: dict[int, dict[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, user_ids, entries):
+        entries = list(entries)
+        with self._lock:
+            for user_id in user_ids:
+                timeline = self._timelines.setdefault(user_id, {})
+                timeline.update(entries)
+                if len(timeline) > self.max_length:
+                    newest = sorted(timeline.items(), key=_newest_first)
+                    self._timelines[user_id] = dict(newest[: self.max_length])
+
+    def remove(self, user_ids, post_ids):
+        post_ids = list(post_ids)
+        with self._lock:
+            for user_id in user_ids:
+                timeline = self._timelines.get(user_id, {})
+                for post_id in post_ids:
+                    timeline.pop(post_id, None)
+
+    def range(self, user_id, max_score=None, limit=20):
+        with self._lock:
+            entries = list(self._timelines.get(user_id, {}).items())
+        if max_score is not None:
+            entries = [entry for entry in entries if entry[1] <= max_score]
+        return sorted(entries, key=_newest_first)[:limit]
+
+    def post_ids(self, user_id):
+        with self._lock:
+            return list(self._timelines.get(user_id, {}))
+
+    def clear(self):
+        with self._lock:
+            self._timelines.clear()
+
+
+class RedisTimelineStore(BaseTimelineStore):
+    """
+    One Redis sorted set per user, trimmed to `max_length` entries on write.
+    """
+
+    def __init__(self, url: str, max_length: int = 800) -> None:
+        import redis
+
+        super().__init__(max_length)
+        self.client = redis.Redis.from_url(url)
+
+    def add(self, user_ids, entries):
+        mapping = {str(post_id): score for post_id, score in entries}
+        if not mapping:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for user_id in user_ids:
+            key = CacheKeys.timeline(user_id)
+            pipe.zadd(key, mapping)
+            pipe.zremrangebyrank(key, 0, -(self.max_length + 1))
+        pipe.execute()
+
+    def remove(self, user_ids, post_ids):
+        members = [str(post_id) for post_id in post_ids]
+        if not members:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for user_id in user_ids:
+            pipe.zrem(CacheKeys.timeline(user_id), *members)
+        pipe.execute()
+
+    def range(self, user_id, max_score=None, limit=20):
+        rows = self.client.zrevrangebyscore(
+            CacheKeys.timeline(user_id),
+            "+inf" if max_score is None else max_score,
+            "-inf",
+            start=0,
+            num=limit,
+            withscores=True,
+        )
+        return sorted(
+            ((int(member), score) for member, score in rows), key=_newest_first
+        )
+
+    def post_ids(self, user_id):
+        members = self.client.zrange(CacheKeys.timeline(user_id), 0, -1)
+        return [int(member) for member in members]
+
+
+def _newest_first(entry: Entry) -> tuple[float, int]:
+    post_id, score = entry
+    return (-score, -post_id)
+
+
+@cache
+def get_timeline_store() -> BaseTimelineStore:
+    return load_backend(settings.TIMELINE_STORE)
+
+
+@receiver(setting_changed)
+def _reset_timeline_store(*, setting, **kwargs):
+    if setting == "TIMELINE_STORE":
+        get_timeline_store.cache_clear()
+
+
+def _follower_ids(author_id: int) -> Iterable[list[int]]:
+    """
+    Yield the followers of `author_id` in chunks, author included, so that
+    one's own posts show up on one's home timeline.
+    """
+    chunk = [author_id]
+    followers = (
+        Follow.objects.filter(following_id=author_id)
+        .order_by()
+        .values_list("follower_id", flat=True)
+    )
+    for follower_id in followers.iterator(chunk_size=FAN_OUT_BATCH_SIZE):
+        chunk.append(follower_id)
+        if len(chunk) == FAN_OUT_BATCH_SIZE:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def fan_out_post(post_id: int, author_id: int, score: float) -> None:
+    store = get_timeline_store()
+    for user_ids in _follower_ids(author_id):
+        store.add(user_ids, [(post_id, score)])
+
+
+def retract_post(post_id: int, author_id: int) -> None:
+    store = get_timeline_store()
+    for user_ids in _follower_ids(author_id):
+        store.remove(user_ids, [post_id])
+
+
+def backfill_follow(follower_id: int, following_id: int) -> None:
+    """
+    Copy the most recent posts of a newly followed user into the follower's
+    timeline.
+    """
+    store = get_timeline_store()
+    recent = (
+        Post.raw.filter(author_id=following_id)
+        .order_by("-created_at")
+        .values_list("id", "created_at")[: store.max_length]
+    )
+    store.add([follower_id], [(pk, created.timestamp()) for pk, created in recent])
+
+
+def prune_follow(follower_id: int, following_id: int) -> None:
+    """
+    Drop the posts of an unfollowed user from the follower's timeline.
+    """
+    store = get_timeline_store()
+    post_ids = Post.raw.filter(
+        pk__in=store.post_ids(follower_id), author_id=following_id
+    ).values_list("id", flat=True)
+    store.remove([follower_id], list(post_ids))
+
+
+def read_timeline(
+    user_id: int,
+    limit: int,
+    before: Entry | None = None,
+    queryset: QuerySet[Post] | None = None,
+) -> tuple[list[Post], Entry | None]:
+    """
+    Read one page of a home timeline: a single range read on the store plus
+    one batched post fetch. Returns the posts and the cursor entry of the
+    next page, if any.
+    """
+    store = get_timeline_store()
+    if before is None:
+        entries = store.range(user_id, None, limit + 1)
+    else:
+        # Entries sharing the cursor's score are disambiguated by post id.
+        candidates = store.range(user_id, before[1], limit * 2 + 1)
+        entries = [
+            entry
+            for entry in candidates
+            if _newest_first(entry) > _newest_first(before)
+        ]
+    page, has_more = entries[:limit], len(entries) > limit
+    if queryset is None:
+        queryset = Post.objects.prefetch_related("tags")
+    posts = queryset.in_bulk([pk for pk, _ in page])
+    return (
+        [posts[pk] for pk, _ in page if pk in posts],
+        page[-1] if has_more else None,
+    )
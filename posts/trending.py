@@ -0,0 +1,123 @@
+"""
+Trending posts: a ranking by exponentially decayed like activity.
+
+Every like adds `2 ** ((liked_at - t0) / HALF_LIFE)` to its post's score
+and every post starts at `POST_WEIGHT` likes' worth at its creation time,
+so fresh posts and recent likes weigh the most. The decay factor is the
+same for every post, so it never has to be applied: ranking by the
+undecayed sums gives the same order at any moment. The sums are kept as
+logarithms, where they don't overflow.
+
+A refresh reads likes above the last processed `Like.id`, plus the likes
+created in the `LIKE_COMMIT_SLACK` before the previous refresh: a like can
+commit after one with a higher id. Those are deduplicated by id; a like
+committing more than `LIKE_COMMIT_SLACK` after its creation is missed.
+The ranking it caches is served a page at a time.
+"""
+
+import math
+import time
+from datetime import datetime, timedelta
+
+from django.core.cache import cache
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from common.cache_keys import CacheKeys
+from posts.models import Like
+
+HALF_LIFE = 60 * 60 * 6
+DECAY = math.log(2) / HALF_LIFE
+POST_WEIGHT = 3
+RANKING_SIZE = 1000
+REFRESH_INTERVAL = 60
+# A cold start only scans likes this recent, older ones have decayed away.
+BOOTSTRAP_WINDOW = timedelta(days=7)
+BATCH_SIZE = 5000
+LIKE_COMMIT_SLACK = timedelta(minutes=5)
+
+
+def log_add(a: float, b: float) -> float:
+    """
+    `log(exp(a) + exp(b))` without leaving log space.
+    """
+    high, low = max(a, b), min(a, b)
+    return high + math.log1p(math.exp(low - high))
+
+
+def refresh_trending() -> list[int]:
+    """
+    Fold the likes created since the last refresh into the scores, cache
+    the new ranking and return it.
+    """
+    state = cache.get(CacheKeys.trending_state())
+    now = timezone.now()
+    likes = Like.objects.order_by("id").values_list(
+        "id", "post_id", "created_at", "post__created_at"
+    )
+    if state is None:
+        watermark = Like.objects.aggregate(last=Max("id"))["last"] or 0
+        scores: dict[int, float] = {}
+        seen: dict[int, datetime] = {}
+        likes = likes.filter(id__lte=watermark, created_at__gte=now - BOOTSTRAP_WINDOW)
+    else:
+        watermark, scores, seen = state["watermark"], state["scores"], state["seen"]
+        overlap = state["refreshed_at"] - LIKE_COMMIT_SLACK
+        likes = likes.filter(Q(id__gt=watermark) | Q(created_at__gte=overlap))
+
+    for like_id, post_id, liked_at, posted_at in likes.iterator(chunk_size=BATCH_SIZE):
+        if like_id in seen:
+            continue
+        if post_id not in scores:
+            scores[post_id] = DECAY * posted_at.timestamp() + math.log(POST_WEIGHT)
+        scores[post_id] = log_add(scores[post_id], DECAY * liked_at.timestamp())
+        seen[like_id] = liked_at
+        watermark = max(watermark, like_id)
+
+    ranking = sorted(scores, key=lambda pk: (-scores[pk], -pk))[:RANKING_SIZE]
+    # Scores outside the ranking are kept until they weigh less than one
+    # like from BOOTSTRAP_WINDOW ago, which a cold start ignores too.
+    # Dropping them sooner would restart a post's sum on its next like.
+    floor = DECAY * (now - BOOTSTRAP_WINDOW).timestamp()
+    top = set(ranking)
+    cache.set(
+        CacheKeys.trending_state(),
+        {
+            "watermark": watermark,
+            "scores": {
+                pk: score for pk, score in scores.items() if pk in top or score >= floor
+            },
+            # Likes the next refresh reads again.
+            "seen": {
+                pk: at for pk, at in seen.items() if at >= now - LIKE_COMMIT_SLACK
+            },
+            "refreshed_at": now,
+        },
+        timeout=None,
+    )
+    # Kept apart from the scores so reads only load the post ids.
+    cache.set(
+        CacheKeys.trending_ranking(),
+        {"ranking": ranking, "refreshed_at": time.time()},
+        timeout=None,
+    )
+    return ranking
+
+
+def get_trending_ranking() -> list[int]:
+    """
+    Post ids, most trending first. A stale ranking is refreshed by the
+    first reader to notice; the others keep serving it meanwhile.
+    """
+    cached = cache.get(CacheKeys.trending_ranking())
+    if cached is not None and time.time() - cached["refreshed_at"] < REFRESH_INTERVAL:
+        return cached["ranking"]
+    lock = CacheKeys.trending_refresh_lock()
+    locked = cache.add(lock, True, timeout=REFRESH_INTERVAL)
+    if not locked and cached is not None:
+        return cached["ranking"]
+    try:
+        return refresh_trending()
+    finally:
+        if locked:
+            cache.delete(lock)
@@ -3,7 +3,7 @@ from rest_framework.routers import DefaultRouter
 
 from posts.views_reports import ReportViewSet
 
-from . import views
+from . import views, views_async
 
 post_router = DefaultRouter()
 post_router.register("entries", views.PostViewSet, basename="post")
@@ -11,14 +11,40 @@ report_router = DefaultRouter()
 report_router.register("reports", ReportViewSet, basename="reports")
 urlpatterns: list[URLPattern] = (
     [
+        path("trending/", views.TrendingPostsView.as_view(), name="post-trending"),
         path(
             "admin-reports/posts/<int:post_id>/summary",
             views.ReportSummaryView.as_view(),
         ),
+        path(
+            "admin-reports/moderate",
+            views.ReportBulkModerationView.as_view(),
+            name="report-bulk-moderate",
+        ),
+        path(
+            "admin-reports/queue",
+            views.ModerationQueueView.as_view(),
+            name="report-moderation-queue",
+        ),
         path(
             "admin-report/posts/<int:report_id>/moderate",
             views.ReportModerationView.as_view(),
         ),
+        path(
+            "async/entries/",
+            views_async.AsyncPostListView.as_view(),
+            name="async-post-list",
+        ),
+        path(
+            "async/entries/<int:pk>/",
+            views_async.AsyncPostDetailView.as_view(),
+            name="async-post-detail",
+        ),
+        path(
+            "async/admin-reports/posts/<int:post_id>/summary",
+            views_async.AsyncReportSummaryView.as_view(),
+            name="async-report-summary",
+        ),
     ]
     + report_router.urls
     + post_router.urls
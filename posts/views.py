@@ -1,41 +1,135 @@
+from django.conf import settings
 from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
 from django.shortcuts import get_object_or_404, render
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status
 from rest_framework.decorators import action
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
 from rest_framework.generics import GenericAPIView
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 
+from common.cache import resolve_key
 from common.cache_keys import CacheKeys
+from common.conditional import ConditionalGetMixin
+from common.pagination import KeysetPagination
+from common.serializers import SparseFieldsetsViewMixin
 from common.throttle import LikeThrottle
+from common.uploadhandlers import UploadLimitsMixin
+from posts.cache import REPORT_SUMMARY_TIMEOUT, CachedPostDetailMixin
+from posts.like_buffer import buffer_like
 from posts.models import Like, Post, Report
 from posts.permissions import IsAuthenticatedForUnsafeMethods, IsOwnerOrReadonly
+from posts.reports import get_report_summary, moderate_reports, moderation_queue
+from posts.search import FullTextSearchFilter
 from posts.serializers import (
+    MAX_IMAGE_SIZE,
+    ModerationQueueSerializer,
+    PostListReadSerializer,
     PostSerializer,
+    ReportBulkModerationSerializer,
     ReportModerationSerializer,
     ReportSummarySerializer,
 )
-from posts.types import ReportSummaryInput
+from posts.timeline import read_timeline
+from posts.trending import get_trending_ranking
 
 
-class PostViewSet(ModelViewSet):
+class PostViewSet(
+    UploadLimitsMixin,
+    SparseFieldsetsViewMixin,
+    ConditionalGetMixin,
+    CachedPostDetailMixin,
+    ModelViewSet,
+):
     queryset = Post.objects.all().prefetch_related("tags")
     serializer_class = PostSerializer
     permission_classes = [IsAuthenticatedForUnsafeMethods, IsOwnerOrReadonly]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    upload_limits = {"image": MAX_IMAGE_SIZE}
+    stateless_authentication = True
+    filter_backends = [DjangoFilterBackend, OrderingFilter, FullTextSearchFilter]
     filterset_fields = ["tags__name"]
     search_fields = ["content", "slug", "author__username"]
     ordering_fields = ["created_at", "updated_at"]
     ordering = ["-created_at"]
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.get_sparse_fields()
+        if fields is not None and "tags" not in fields:
+            queryset = queryset.prefetch_related(None)
+        if fields is None or "liked_by_me" in fields:
+            queryset = queryset.with_liked_by_me(self.request.user)  # type: ignore
+        return queryset
+
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
+    def list(self, request: Request, *args, **kwargs):
+        fields = self.get_sparse_fields()
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = PostListReadSerializer.get_rows(queryset, fields)
+        page = self.paginate_queryset(rows)
+        serializer = PostListReadSerializer(
+            page if page is not None else rows,
+            context=self.get_serializer_context(),
+            fields=fields,
+        )
+        signature = serializer.signature
+
+        def build_response():
+            if page is None:
+                return Response(serializer.data)
+            return self.get_paginated_response(serializer.data)
+
+        return self.conditional_get(request, build_response, signature=signature)
+
+    def retrieve(self, request: Request, *args, **kwargs):
+        pk = kwargs["pk"]
+        version = self.get_post_version(pk)
+        return self.conditional_get(
+            request,
+            lambda: self.cached_retrieve(
+                request, pk, version, fields=self.get_sparse_fields()
+            ),
+            signature=version,
+        )
+
+    @action(detail=False, methods=["GET"], permission_classes=[IsAuthenticated])
+    def timeline(self, request: Request):
+        # Posts from the people I follow, newest first.
+        limit = self.paginator.get_page_size(request) or 20  # type: ignore
+        before = None
+        if cursor := request.query_params.get("cursor"):
+            try:
+                post_id, score = cursor.split(":")
+                before = (int(post_id), float(score))
+            except ValueError:
+                raise NotFound("Invalid cursor")
+        queryset = self.apply_sparse_fieldsets(self.get_queryset())
+        # A stateless request's `TokenUser` carries the id claim as a string.
+        user_id = int(request.user.id)  # type: ignore
+        posts, next_entry = read_timeline(user_id, limit, before, queryset)
+        next_url = None
+        if next_entry is not None:
+            next_url = replace_query_param(
+                request.build_absolute_uri(),
+                "cursor",
+                f"{next_entry[0]}:{next_entry[1]}",
+            )
+        serializer = self.get_serializer(posts, many=True)
+        return Response(
+            {"next": next_url, "previous": None, "results": serializer.data}
+        )
+
     @action(
         detail=True,
         permission_classes=[IsAuthenticated],
@@ -45,7 +139,15 @@ class PostViewSet(ModelViewSet):
     def like(self, request: Request, pk=None):
         post: Post = self.get_object()
         user = request.user
-        like_object, created = Like.objects.get_or_create(user=user, post=post)
+        if settings.LIKES_WRITE_BEHIND:
+            created = buffer_like(user.id, post.id, True, post.liked_by_me)  # type: ignore
+        else:
+            with transaction.atomic():
+                _, created = Like.objects.get_or_create(user=user, post=post)
+                if created:
+                    Post.objects.filter(pk=post.pk).update(
+                        likes_count=F("likes_count") + 1
+                    )
         if not created:
             return Response(
                 {"detail": "Already liked"}, status=status.HTTP_400_BAD_REQUEST
@@ -61,18 +163,53 @@ class PostViewSet(ModelViewSet):
     def unlike(self, request: Request, pk=None):
         post: Post = self.get_object()
         user = request.user
-        deleted, _ = Like.objects.filter(user=user, post=post).delete()
-        if deleted == 0:
+        if settings.LIKES_WRITE_BEHIND:
+            deleted = buffer_like(user.id, post.id, False, post.liked_by_me)  # type: ignore
+        else:
+            with transaction.atomic():
+                deleted, _ = Like.objects.filter(user=user, post=post).delete()
+                if deleted:
+                    Post.objects.filter(pk=post.pk, likes_count__gt=0).update(
+                        likes_count=F("likes_count") - 1
+                    )
+        if not deleted:
             return Response(
                 {"detail": "Not liked yet"}, status=status.HTTP_400_BAD_REQUEST
             )
         return Response({"detail": "Unliked"}, status=status.HTTP_200_OK)
 
 
-class PostListCreateApiView(GenericAPIView):
+class TrendingPagination(LimitOffsetPagination):
+    default_limit = 20
+    max_limit = 100
+
+
+class TrendingPostsView(GenericAPIView):
+    """
+    Posts ranked by recent like activity, paged over the cached ranking.
+    """
+
+    serializer_class = PostSerializer
+    pagination_class = TrendingPagination
+    stateless_authentication = True
+
+    def get_queryset(self):
+        return Post.objects.prefetch_related("tags").with_liked_by_me(self.request.user)
+
+    def get(self, request: Request):
+        page = self.paginate_queryset(get_trending_ranking())
+        posts = self.get_queryset().in_bulk(page)  # type: ignore
+        serializer = self.get_serializer(
+            [posts[pk] for pk in page if pk in posts], many=True  # type: ignore
+        )
+        return self.get_paginated_response(serializer.data)
+
+
+class PostListCreateApiView(UploadLimitsMixin, GenericAPIView):
     queryset = Post.objects.all()
     serializer_class = PostSerializer
     permission_classes = [IsAuthenticated]
+    upload_limits = {"image": MAX_IMAGE_SIZE}
 
     def get(self, request: Request):
         posts = self.get_queryset()
@@ -86,20 +223,21 @@ class PostListCreateApiView(GenericAPIView):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
-class PostRetrieveUpdateDestroyApiView(GenericAPIView):
+class PostRetrieveUpdateDestroyApiView(
+    UploadLimitsMixin, CachedPostDetailMixin, GenericAPIView
+):
     queryset = Post.objects.all()
     serializer_class = PostSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrReadonly]
+    upload_limits = {"image": MAX_IMAGE_SIZE}
 
     def get_object(self):
         obj = super().get_object()
         self.check_object_permissions(self.request, obj)
         return obj
 
-    def get(self, *args, **kwargs):
-        post = self.get_object()
-        serializer = self.get_serializer(post)
-        return Response(serializer.data)
+    def get(self, request: Request, *args, **kwargs):
+        return self.cached_retrieve(request, kwargs["pk"])
 
     def put(self, request: Request, *args, **kwargs):
         post = self.get_object()
@@ -125,22 +263,18 @@ class ReportSummaryView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request: Request, post_id: int):
-        cache_key = CacheKeys.pending_report_summary(post_id)
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return Response(cached)
-        post = get_object_or_404(Post, pk=post_id)
-        reports = Report.objects.filter(post=post, status=Report.Status.PENDING)
-        data: ReportSummaryInput = {
-            "post": post,
-            "post_id": post.id,
-            "post_author": post.author.username,
-            "post_content": post.content,
-            "reports": reports,
-        }
-        serializer = ReportSummarySerializer(data)
-        cache.set(key=cache_key, value=serializer.data, timeout=60)
-        return Response(serializer.data)
+        def build():
+            summary = get_report_summary(post_id)
+            return None if summary is None else ReportSummarySerializer(summary).data
+
+        data = cache.get_or_set(
+            resolve_key(CacheKeys.report_summary(post_id)),
+            build,
+            timeout=REPORT_SUMMARY_TIMEOUT,
+        )
+        if data is None:
+            raise NotFound()
+        return Response(data)
 
 
 class ReportModerationView(GenericAPIView):
@@ -155,3 +289,41 @@ class ReportModerationView(GenericAPIView):
         serializer.is_valid(raise_exception=True)
         serializer.save()
         return Response(serializer.data)
+
+
+class ReportBulkModerationView(GenericAPIView):
+    permission_classes = [IsAdminUser]
+    serializer_class = ReportBulkModerationSerializer
+
+    def post(self, request: Request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        updated = moderate_reports(
+            data["status"],  # type: ignore
+            ids=data.get("ids"),  # type: ignore
+            post_id=data.get("post"),  # type: ignore
+            current_status=data.get("current_status"),  # type: ignore
+        )
+        return Response({"updated": updated})
+
+
+class ModerationQueuePagination(KeysetPagination):
+    # Rows are grouped by post, so the post id alone orders them.
+    ordering = "-post"
+    tiebreak_field = "post"
+
+
+class ModerationQueueView(GenericAPIView):
+    """
+    Posts with pending reports, newest post first, with their counts.
+    """
+
+    permission_classes = [IsAdminUser]
+    serializer_class = ModerationQueueSerializer
+    pagination_class = ModerationQueuePagination
+
+    def get(self, request: Request):
+        page = self.paginate_queryset(moderation_queue())
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
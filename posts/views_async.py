@@ -0,0 +1,117 @@
+"""
+Async variants of the hottest post read paths, mounted under `async/`.
+
+They answer like their sync counterparts in `posts.views` (same payloads,
+caching and ETags) but run on the event loop under ASGI. Full-text search
+is not supported on the async list.
+"""
+
+from django.core.cache import cache
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from common.async_views import AsyncAPIView
+from common.cache import aget_tag_versions, aresolve_key
+from common.cache_keys import CacheKeys
+from common.conditional import ConditionalGetMixin
+from common.pagination import KeysetPagination
+from common.serializers import SparseFieldsetsViewMixin
+from posts.cache import REPORT_SUMMARY_TIMEOUT, CachedPostDetailMixin
+from posts.models import Post
+from posts.permissions import IsAuthenticatedForUnsafeMethods
+from posts.reports import aget_report_summary
+from posts.serializers import (
+    PostListReadSerializer,
+    PostSerializer,
+    ReportSummarySerializer,
+)
+
+
+class AsyncPostListView(SparseFieldsetsViewMixin, ConditionalGetMixin, AsyncAPIView):
+    serializer_class = PostSerializer
+    pagination_class = KeysetPagination
+    permission_classes = [IsAuthenticatedForUnsafeMethods]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_fields = ["tags__name"]
+    ordering_fields = ["created_at", "updated_at"]
+    ordering = ["-created_at"]
+
+    def get_queryset(self):
+        queryset = Post.objects.all()
+        fields = self.get_sparse_fields()
+        if fields is None or "liked_by_me" in fields:
+            queryset = queryset.with_liked_by_me(self.request.user)  # type: ignore
+        return queryset
+
+    async def get(self, request: Request):
+        fields = self.get_sparse_fields()
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = PostListReadSerializer.get_rows(queryset, fields)
+        page = await self.paginator.apaginate_queryset(rows, request, self)  # type: ignore
+        serializer = PostListReadSerializer(
+            page if page is not None else [row async for row in rows],
+            context=self.get_serializer_context(),
+            fields=fields,
+        )
+        await serializer.aload_tags()
+
+        async def build_response():
+            if page is None:
+                return Response(serializer.data)
+            return self.get_paginated_response(serializer.data)
+
+        return await self.aconditional_get(
+            request, build_response, signature=serializer.signature
+        )
+
+
+class AsyncPostDetailView(
+    SparseFieldsetsViewMixin,
+    ConditionalGetMixin,
+    CachedPostDetailMixin,
+    AsyncAPIView,
+):
+    serializer_class = PostSerializer
+    permission_classes = [IsAuthenticatedForUnsafeMethods]
+
+    async def aget_object(self) -> Post:
+        try:
+            return await (
+                Post.objects.prefetch_related("tags")
+                .with_liked_by_me(self.request.user)
+                .aget(pk=self.kwargs["pk"])
+            )
+        except Post.DoesNotExist:
+            raise NotFound()
+
+    async def get(self, request: Request, pk: int):
+        version = await aget_tag_versions(CacheKeys.post_detail(pk).tags)
+
+        async def build_response():
+            return await self.acached_retrieve(
+                request, pk, version, fields=self.get_sparse_fields()
+            )
+
+        return await self.aconditional_get(request, build_response, signature=version)
+
+
+class AsyncReportSummaryView(AsyncAPIView):
+    permission_classes = [IsAuthenticated]
+
+    async def get(self, request: Request, post_id: int):
+        async def build():
+            summary = await aget_report_summary(post_id)
+            return None if summary is None else ReportSummarySerializer(summary).data
+
+        data = await cache.aget_or_set(
+            await aresolve_key(CacheKeys.report_summary(post_id)),
+            build,
+            timeout=REPORT_SUMMARY_TIMEOUT,
+        )
+        if data is None:
+            raise NotFound()
+        return Response(data)